@@ -23,11 +23,17 @@ CHART_METADATA = {
     'description': 'Neural network visualization chart'
 }
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.patches import Circle, FancyArrowPatch
+from matplotlib.patches import FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.network import draw_network
+
 # Set up the figure
 fig, ax = plt.subplots(1, 1, figsize=(14, 8))
 ax.set_xlim(0, 14)
@@ -45,61 +51,44 @@ n_inputs = 5
 n_hidden = 6
 n_output = 1
 
-# Input layer
+# Neuron positions
 input_y_positions = np.linspace(2, 8, n_inputs)
-input_neurons = []
+hidden_y_positions = np.linspace(1.5, 8.5, n_hidden)
+output_y = 5
 input_labels = ['Yesterday\nPrice', 'Trading\nVolume', 'Market\nSentiment', 'Volatility\nIndex', 'Interest\nRate']
 
+# Draw all connections but with varying alpha: every third one emphasised
+emphasis = np.add.outer(np.arange(n_inputs), np.arange(n_hidden)) % 3 == 0
+network = draw_network(
+    ax, [n_inputs, n_hidden, n_output], [input_x, hidden_x, output_x],
+    [input_y_positions, hidden_y_positions, [output_y]], radius=[0.35, 0.35, 0.4],
+    node_facecolor=['lightblue', 'lightgreen', 'orange'],
+    node_edgecolor=['blue', 'green', 'darkorange'], node_linewidth=[2, 2, 3],
+    edge_color='gray', edge_alpha=[np.where(emphasis, 0.3, 0.15), 0.3],
+    edge_linewidth=[np.where(emphasis, 1.5, 0.5), 1])
+input_neurons, hidden_neurons, _ = network.positions
+
+# Input layer
 ax.text(input_x, 9.5, 'INPUT LAYER', fontsize=12, ha='center', fontweight='bold', color='blue')
 ax.text(input_x, 9, '(Market Features)', fontsize=9, ha='center', style='italic', color='blue')
 
-for i, (y_pos, label) in enumerate(zip(input_y_positions, input_labels)):
-    circle = Circle((input_x, y_pos), 0.35, facecolor='lightblue', edgecolor='blue', linewidth=2)
-    ax.add_patch(circle)
-    input_neurons.append((input_x, y_pos))
+for y_pos, label in zip(input_y_positions, input_labels):
     ax.text(input_x - 1.3, y_pos, label, fontsize=8, ha='right', va='center')
 
 # Hidden layer
-hidden_y_positions = np.linspace(1.5, 8.5, n_hidden)
-hidden_neurons = []
-
 ax.text(hidden_x, 9.5, 'HIDDEN LAYER', fontsize=12, ha='center', fontweight='bold', color='green')
 ax.text(hidden_x, 9, '(Pattern Detection)', fontsize=9, ha='center', style='italic', color='green')
 
-for i, y_pos in enumerate(hidden_y_positions):
-    circle = Circle((hidden_x, y_pos), 0.35, facecolor='lightgreen', edgecolor='green', linewidth=2)
-    ax.add_patch(circle)
-    hidden_neurons.append((hidden_x, y_pos))
-
 # Output layer
-output_y = 5
 ax.text(output_x, 9.5, 'OUTPUT LAYER', fontsize=12, ha='center', fontweight='bold', color='darkorange')
 ax.text(output_x, 9, '(Prediction)', fontsize=9, ha='center', style='italic', color='darkorange')
-
-output_circle = Circle((output_x, output_y), 0.4, facecolor='orange', edgecolor='darkorange', linewidth=3)
-ax.add_patch(output_circle)
 ax.text(output_x + 1.3, output_y, 'Price\nDirection', fontsize=9, ha='left', va='center', fontweight='bold')
 
-# Draw connections (sample, not all to avoid clutter)
-# Input to Hidden (show a subset)
-for i, (in_x, in_y) in enumerate(input_neurons):
-    for j, (h_x, h_y) in enumerate(hidden_neurons):
-        # Draw all connections but with varying alpha
-        alpha = 0.15 if (i + j) % 3 != 0 else 0.3
-        linewidth = 0.5 if (i + j) % 3 != 0 else 1.5
-        ax.plot([in_x + 0.35, h_x - 0.35], [in_y, h_y], 'gray', alpha=alpha, linewidth=linewidth, zorder=1)
-
 # Highlight a few connections
 ax.plot([input_neurons[0][0] + 0.35, hidden_neurons[2][0] - 0.35],
         [input_neurons[0][1], hidden_neurons[2][1]], 'blue', alpha=0.6, linewidth=2, zorder=2)
 ax.plot([input_neurons[2][0] + 0.35, hidden_neurons[4][0] - 0.35],
         [input_neurons[2][1], hidden_neurons[4][1]], 'blue', alpha=0.6, linewidth=2, zorder=2)
-
-# Hidden to Output (draw all)
-for h_x, h_y in hidden_neurons:
-    ax.plot([h_x + 0.35, output_x - 0.4], [h_y, output_y], 'gray', alpha=0.3, linewidth=1, zorder=1)
-
-# Highlight a few
 ax.plot([hidden_neurons[1][0] + 0.35, output_x - 0.4],
         [hidden_neurons[1][1], output_y], 'green', alpha=0.6, linewidth=2, zorder=2)
 ax.plot([hidden_neurons[4][0] + 0.35, output_x - 0.4],
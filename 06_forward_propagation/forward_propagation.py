@@ -23,10 +23,15 @@ CHART_METADATA = {
     'description': 'Neural network visualization chart'
 }
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.patches import Circle, FancyBboxPatch, FancyArrowPatch
-import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.forward import example_network
 
 # Set up the figure
 fig, ax = plt.subplots(1, 1, figsize=(14, 8))
@@ -53,15 +58,12 @@ for i, (y_pos, value, label) in enumerate(zip(input_y, inputs, input_labels)):
     ax.text(layer_x[0], y_pos, f'{value}', fontsize=9, ha='center', va='center', fontweight='bold')
     ax.text(layer_x[0] - 1, y_pos, label, fontsize=8, ha='right', va='center')
 
-# Simulated weights for input->hidden
-W1 = np.array([[0.5, 0.3, -0.2],
-               [0.2, 0.4, 0.6],
-               [-0.3, 0.5, 0.4]])
-b1 = np.array([0.1, -0.1, 0.2])
-
-# Calculate hidden layer activations
-z1 = np.dot(W1, inputs) + b1
-a1 = 1 / (1 + np.exp(-z1))  # Sigmoid activation
+# Simulated weights (input->hidden W1, hidden->output W2), evaluated by the batched engine
+network = example_network()
+W1 = network.layers[0].weights
+W2 = network.layers[1].weights[0]
+output = network.forward(inputs)[0]
+a1 = network.activations[0][0]  # hidden layer (sigmoid) activations
 
 # Step 2: Hidden Layer
 ax.text(layer_x[1], 9, 'HIDDEN', fontsize=11, ha='center', fontweight='bold', color='green')
@@ -92,14 +94,6 @@ for i, in_y in enumerate(input_y):
             ax.plot([layer_x[0] + 0.4, layer_x[1] - 0.4], [in_y, hid_y],
                     'gray', linewidth=0.5, alpha=0.3)
 
-# Simulated weights for hidden->output
-W2 = np.array([0.7, -0.3, 0.5])
-b2 = 0.15
-
-# Calculate output
-z2 = np.dot(W2, a1) + b2
-output = 1 / (1 + np.exp(-z2))  # Sigmoid activation
-
 # Step 3: Output Layer
 ax.text(layer_x[2], 9, 'OUTPUT', fontsize=11, ha='center', fontweight='bold', color='darkorange')
 output_circle = Circle((layer_x[2], output_y), 0.5, facecolor='orange', edgecolor='darkorange', linewidth=3)
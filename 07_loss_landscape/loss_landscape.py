@@ -27,6 +27,11 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 import numpy as np
 
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
+
 # Set up the figure
 fig = plt.figure(figsize=(14, 6))
 
@@ -34,8 +39,8 @@ fig = plt.figure(figsize=(14, 6))
 ax1 = fig.add_subplot(121, projection='3d')
 
 # Create a loss landscape (simplified for visualization)
-w1 = np.linspace(-3, 3, 100)
-w2 = np.linspace(-3, 3, 100)
+w1 = np.linspace(-3, 3, grid_points(100))
+w2 = np.linspace(-3, 3, grid_points(100))
 W1, W2 = np.meshgrid(w1, w2)
 
 # Create a complex loss surface with a global minimum
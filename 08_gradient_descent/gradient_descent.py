@@ -23,9 +23,15 @@ CHART_METADATA = {
     'description': 'Neural network visualization chart'
 }
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.optimizers import optimize, quadratic
+
 # Set up the figure with two subplots
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 fig.suptitle('Gradient Descent: Learning by Stepping Downhill', fontsize=16, fontweight='bold')
@@ -45,12 +51,8 @@ learning_rate = 0.3
 start_point = 4.5
 steps = 8
 
-positions = [start_point]
-current = start_point
-for i in range(steps):
-    gradient = 2 * current  # Derivative of x^2
-    current = current - learning_rate * gradient
-    positions.append(current)
+# Derivative of x^2 is 2x
+positions = optimize(quadratic([2.0]), [[start_point]], steps, learning_rate=learning_rate)[:, 0, 0]
 
 # Plot the path
 for i in range(len(positions) - 1):
@@ -28,9 +28,15 @@ Chart 12: Decision Boundary Concept
 Shows linear vs non-linear boundaries - what a learning system must achieve.
 """
 
+import sys
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.scatter import class_scatter
+
 np.random.seed(42)
 
 # Colors
@@ -53,8 +59,8 @@ up_y1 = np.random.normal(2, 0.4, n)
 down_x1 = np.random.normal(0, 0.4, n)
 down_y1 = np.random.normal(0, 0.4, n)
 
-ax1.scatter(up_x1, up_y1, c=mlgreen, s=60, alpha=0.7, label='Buy')
-ax1.scatter(down_x1, down_y1, c=mlred, s=60, alpha=0.7, label='Sell')
+class_scatter(ax1, up_x1, up_y1, mlgreen, s=60, alpha=0.7, label='Buy')
+class_scatter(ax1, down_x1, down_y1, mlred, s=60, alpha=0.7, label='Sell')
 
 # Linear boundary
 x_line = np.linspace(-1, 3, 100)
@@ -78,8 +84,8 @@ up_y2 = np.concatenate([np.random.normal(2, 0.3, n//2), np.random.normal(0, 0.3,
 down_x2 = np.concatenate([np.random.normal(0, 0.3, n//2), np.random.normal(2, 0.3, n//2)])
 down_y2 = np.concatenate([np.random.normal(0, 0.3, n//2), np.random.normal(2, 0.3, n//2)])
 
-ax2.scatter(up_x2, up_y2, c=mlgreen, s=60, alpha=0.7, label='Buy')
-ax2.scatter(down_x2, down_y2, c=mlred, s=60, alpha=0.7, label='Sell')
+class_scatter(ax2, up_x2, up_y2, mlgreen, s=60, alpha=0.7, label='Buy')
+class_scatter(ax2, down_x2, down_y2, mlred, s=60, alpha=0.7, label='Sell')
 
 # Failed linear attempts
 ax2.plot([-0.5, 2.5], [1, 1], color=mlpurple, linewidth=2, linestyle='--', alpha=0.5)
@@ -95,8 +101,8 @@ ax2.grid(True, alpha=0.3)
 
 # Plot 3: Non-linear boundary solution
 ax3 = axes[2]
-ax3.scatter(up_x2, up_y2, c=mlgreen, s=60, alpha=0.7, label='Buy')
-ax3.scatter(down_x2, down_y2, c=mlred, s=60, alpha=0.7, label='Sell')
+class_scatter(ax3, up_x2, up_y2, mlgreen, s=60, alpha=0.7, label='Buy')
+class_scatter(ax3, down_x2, down_y2, mlred, s=60, alpha=0.7, label='Sell')
 
 # Draw curved boundaries
 theta1 = np.linspace(0, 2*np.pi, 100)
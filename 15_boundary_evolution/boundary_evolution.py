@@ -26,14 +26,30 @@ CHART_METADATA = {
 """
 Chart 15: Decision Boundary Evolution - REAL NEURAL NETWORKS
 Actually trains neural networks with different architectures and plots their learned boundaries.
+The animation (boundary_evolution.gif) trains the four models side by side, one frame per
+batch of optimiser steps.
 """
 
+import sys
+import warnings
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
+from sklearn.exceptions import ConvergenceWarning
 from sklearn.neural_network import MLPClassifier
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.preprocessing import StandardScaler
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.animation import animate
+
+try:
+    from chartbuild.profiles import grid_step, output_path
+except ImportError:  # run standalone: final profile
+    grid_step = lambda value: value
+    output_path = lambda name: name
+
 np.random.seed(42)
 
 # Colors
@@ -68,7 +84,7 @@ scaler = StandardScaler()
 X_scaled = scaler.fit_transform(X)
 
 # Create meshgrid for decision boundary visualization
-h = 0.01  # step size
+h = grid_step(0.01)  # step size
 x_min, x_max = X[:, 0].min() - 0.1, X[:, 0].max() + 0.1
 y_min, y_max = X[:, 1].min() - 0.1, X[:, 1].max() + 0.1
 xx, yy = np.meshgrid(np.arange(x_min, x_max, h), np.arange(y_min, y_max, h))
@@ -191,4 +207,84 @@ print(f"  2 Neurons: {acc2:.1f}%")
 print(f"  4 Neurons: {acc3:.1f}%")
 print(f"  10 Neurons: {acc4:.1f}%")
 
+# ============================================================================
+# Animation: the same four models learning, streamed frame by frame
+# ============================================================================
+# warm_start makes each fit() continue from the previous weights for steps_per_frame
+# epochs (one optimiser step each: the 100 samples fit in one batch)
+steps_per_frame = 5
+n_frames = 100
+mlp_options = dict(activation='relu', random_state=42, learning_rate_init=0.01,
+                   warm_start=True, max_iter=steps_per_frame, tol=0, n_iter_no_change=n_frames)
+anim_models = [
+    ('1 Neuron\n(Logistic)', mlpurple,
+     SGDClassifier(loss='log_loss', learning_rate='constant', eta0=0.05, random_state=42,
+                   warm_start=True, max_iter=steps_per_frame, tol=None)),
+    ('2 Neurons\n(Hidden Layer)', mlpurple, MLPClassifier(hidden_layer_sizes=(2,), **mlp_options)),
+    ('4 Neurons\n(Hidden Layer)', mlblue, MLPClassifier(hidden_layer_sizes=(4,), **mlp_options)),
+    ('10 Neurons\n(Curved)', mlgreen, MLPClassifier(hidden_layer_sizes=(10,), **mlp_options)),
+]
+
+
+def training_history():
+    """Yield (step, [(probabilities on the mesh, accuracy) per model]) as training runs."""
+    for frame in range(1, n_frames + 1):
+        states = []
+        for _, _, model in anim_models:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', ConvergenceWarning)  # stopped on purpose
+                model.fit(X_scaled, y)
+            proba = model.predict_proba(mesh_data_scaled)[:, 1].reshape(xx.shape)
+            states.append((proba, model.score(X_scaled, y) * 100))
+        yield frame * steps_per_frame, states
+
+
+fig, axes = plt.subplots(1, 4, figsize=(14, 4))
+region_colors = np.array([plt.matplotlib.colors.to_rgba(mlred, 0.2),
+                          plt.matplotlib.colors.to_rgba(mlgreen, 0.2)])
+panels = []
+for ax, (title, _, _) in zip(axes, anim_models):
+    region = ax.imshow(np.zeros(xx.shape + (4,)), extent=(xx.min(), xx.max(), yy.min(), yy.max()),
+                       origin='lower', interpolation='nearest', aspect='auto')
+    points = [ax.scatter(X[y==1, 0], X[y==1, 1], c=mlgreen, s=40, alpha=0.7, edgecolors='k',
+                         linewidths=0.5),
+              ax.scatter(X[y==0, 0], X[y==0, 1], c=mlred, s=40, alpha=0.7, edgecolors='k',
+                         linewidths=0.5)]
+    accuracy = ax.text(0.5, 0.05, '', fontsize=10, ha='center', fontweight='bold')
+    ax.set_title(title, fontsize=11, fontweight='bold')
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_aspect('equal')
+    panels.append({'ax': ax, 'region': region, 'points': points, 'accuracy': accuracy,
+                   'boundary': None})
+step_text = fig.text(0.5, 0.03, '', fontsize=11, ha='center', color=mlpurple)
+# Fixed margins: frames have no tight bounding box to grow into
+plt.subplots_adjust(left=0.02, right=0.98, top=0.84, bottom=0.1, wspace=0.1)
+
+
+def update(state):
+    step, states = state
+    artists = []
+    for panel, (_, color, _), (proba, acc) in zip(panels, anim_models, states):
+        panel['region'].set_data(region_colors[(proba >= 0.5).astype(int)])
+        if panel['boundary'] is not None:
+            panel['boundary'].remove()
+        panel['boundary'] = None
+        if proba.min() < 0.5 < proba.max():
+            panel['boundary'] = panel['ax'].contour(xx, yy, proba, levels=[0.5], colors=[color],
+                                                    linewidths=3)
+        panel['accuracy'].set_text(f'Accuracy: {acc:.0f}%')
+        panel['accuracy'].set_color(mlred if acc < 60 else mlorange if acc < 90 else mlgreen)
+        artists += [panel['region'], *filter(None, [panel['boundary']]), *panel['points'],
+                    panel['accuracy']]
+    step_text.set_text(f'Training step {step}')
+    return artists + [step_text]
+
+
+frames, seconds = animate(fig, training_history(), update, output_path('boundary_evolution.gif'))
+plt.close(fig)
+print(f"Saved: 15_boundary_evolution/boundary_evolution.gif ({frames} frames, {frames / seconds:.0f} frames/s)")
+
 # Source: https://github.com/Digital-AI-Finance/neural-networks/tree/main/15_boundary_evolution/
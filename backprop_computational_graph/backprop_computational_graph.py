@@ -3,10 +3,22 @@ Backpropagation Computational Graph
 Module 3: Training Neural Networks
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import FancyBboxPatch, Circle, FancyArrowPatch
 
+try:
+    from chartbuild.profiles import reproducible
+except ImportError:  # run standalone: reproducible outputs
+    reproducible = lambda: True
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.autodiff import mean, sigmoid, square
+from chartlib.graph import Executor, Graph, layout
+
 CHART_METADATA = {
     'title': 'Backprop Computational Graph',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/backprop_computational_graph'
@@ -29,49 +41,74 @@ ax.axis('off')
 ax.text(7, 9.5, 'Computational Graph: Forward and Backward Pass',
         fontsize=16, fontweight='bold', ha='center', color=mlpurple)
 
-# ==================== NODES ====================
-# Node positions
-nodes = {
-    'x': (1, 5),
-    'w': (1, 7.5),
-    'b': (4, 7.5),
-    'z': (4, 5),
-    'a': (7, 5),
-    'y': (10, 7.5),
-    'L': (10, 5),
-}
+# ==================== LIVE GRAPH ====================
+# One neuron trained with MSE on ten years of daily returns: the graph is
+# planned (and, outside reproducible builds, run and timed), and everything
+# below is drawn from it.
+DAYS = 2520
+rng = np.random.default_rng(42)
+graph = Graph()
+x = graph.input('x', (DAYS,))
+w = graph.parameter('w', 0.5)
+wx = w * x
+wx.name = 'wx'
+b = graph.parameter('b', 0.1)
+z = wx + b
+z.name = 'z'
+a = sigmoid(z, name='a')
+y = graph.input('y', (DAYS,))
+e = a - y
+e.name = 'e'
+L = mean(square(e, name='e2'), name='L')
+executor = Executor(graph, L)
+TIMED = not reproducible()
+feeds = {'x': rng.normal(0, 0.01, DAYS) * 100, 'y': rng.uniform(0, 1, DAYS)}
+stats = {s.node: s for s in (executor.profile(feeds, repeat=200) if TIMED else executor.costs())}
+positions = {node: (1 + 1.5 * column, 5.5 + 2.3 * row)
+             for node, (column, row) in layout(executor).items()}
+
+labels = {'wx': 'wx', 'e2': 'e^2'}
+
+
+def node_style(node):
+    if node.op is None:
+        return (mlorange, 'parameter') if node.requires_grad else (mlblue, 'input')
+    if node is executor.output:
+        return mlred, node.op
+    return (mlgreen if node.op == 'sigmoid' else mlpurple), node.op
+
+
+def kilobytes(nbytes):
+    return f'{nbytes / 1e3:.1f} kB' if nbytes >= 100 else f'{nbytes} B'
+
+
+def cost(stat):
+    if TIMED:
+        return f'{stat.forward * 1e6:.0f} / {stat.backward * 1e6:.0f} $\\mu$s'
+    flops = (stat.forward_flops, stat.backward_flops)
+    return ' / '.join(f'{n / 1e3:.1f}k' if n >= 1000 else str(n) for n in flops) + ' FLOP'
 
-# Draw nodes
-node_styles = {
-    'x': (mlblue, 'Input'),
-    'w': (mlorange, 'Weight'),
-    'b': (mlorange, 'Bias'),
-    'z': (mlpurple, 'Linear'),
-    'a': (mlgreen, 'Activation'),
-    'y': (mlgray, 'Target'),
-    'L': (mlred, 'Loss'),
-}
 
-for name, (x, y) in nodes.items():
-    color, label = node_styles[name]
-    circle = Circle((x, y), 0.5, fill=True, facecolor=f'{color}22', edgecolor=color, linewidth=2)
+# ==================== NODES ====================
+for node, (px, py) in positions.items():
+    color, kind = node_style(node)
+    circle = Circle((px, py), 0.5, fill=True, facecolor=f'{color}22', edgecolor=color, linewidth=2)
     ax.add_patch(circle)
-    ax.text(x, y, f'${name}$', ha='center', va='center', fontsize=12, fontweight='bold')
-    ax.text(x, y - 0.8, label, ha='center', fontsize=8, color=mlgray)
-
-# ==================== FORWARD PASS (Blue arrows) ====================
-forward_edges = [
-    ('x', 'z', '$w \\cdot x$'),
-    ('w', 'z', ''),
-    ('b', 'z', '$+ b$'),
-    ('z', 'a', '$\\sigma(z)$'),
-    ('a', 'L', ''),
-    ('y', 'L', 'MSE'),
-]
-
-for start, end, label in forward_edges:
-    x1, y1 = nodes[start]
-    x2, y2 = nodes[end]
+    ax.text(px, py, f'${labels.get(node.name, node.name)}$', ha='center', va='center',
+            fontsize=12, fontweight='bold')
+    ax.text(px, py - 0.75, kind, ha='center', fontsize=8, color=mlgray)
+    if node in stats:
+        stat = stats[node]
+        ax.text(px, py - 1.05, f"{kilobytes(stat.nbytes)}, {'kept' if stat.kept else 'freed'}",
+                ha='center', fontsize=7, color=mlpurple if stat.kept else mlgreen)
+        ax.text(px, py - 1.35, cost(stat), ha='center', fontsize=7, color=mlgray)
+    else:
+        ax.text(px, py - 1.05, kilobytes(node.nbytes), ha='center', fontsize=7, color=mlgray)
+
+# ==================== FORWARD PASS (Blue arrows, one per tensor) ====================
+for source, target in graph.edges(executor.ops):
+    x1, y1 = positions[source]
+    x2, y2 = positions[target]
 
     # Adjust for circle radius
     dx, dy = x2 - x1, y2 - y1
@@ -84,32 +121,29 @@ for start, end, label in forward_edges:
     ax.annotate('', xy=(x2_adj, y2_adj), xytext=(x1_adj, y1_adj),
                 arrowprops=dict(arrowstyle='->', color=mlblue, lw=2))
 
-    if label:
-        mx, my = (x1 + x2) / 2, (y1 + y2) / 2 + 0.3
-        ax.text(mx, my, label, fontsize=8, ha='center', color=mlblue)
+    if source.op is not None and dy == 0:
+        shape = f'({source.shape[0]},)' if source.shape else 'scalar'
+        ax.text((x1 + x2) / 2, y1 + 0.15, shape, fontsize=7, ha='center', color=mlblue)
 
 # Forward label
-ax.text(5.5, 3.5, 'FORWARD PASS', fontsize=12, fontweight='bold', color=mlblue,
+ax.text(5.5, 3.3, 'FORWARD PASS', fontsize=12, fontweight='bold', color=mlblue,
         bbox=dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=mlblue))
-ax.annotate('', xy=(9, 3.5), xytext=(2, 3.5),
+ax.annotate('', xy=(9, 3.3), xytext=(2, 3.3),
             arrowprops=dict(arrowstyle='->', color=mlblue, lw=3, alpha=0.5))
 
 # ==================== BACKWARD PASS (Red arrows below) ====================
-ax.text(5.5, 1.5, 'BACKWARD PASS', fontsize=12, fontweight='bold', color=mlred,
+ax.text(5.5, 1.2, 'BACKWARD PASS', fontsize=12, fontweight='bold', color=mlred,
         bbox=dict(boxstyle='round,pad=0.3', facecolor='white', edgecolor=mlred))
-ax.annotate('', xy=(2, 1.5), xytext=(9, 1.5),
+ax.annotate('', xy=(2, 1.2), xytext=(9, 1.2),
             arrowprops=dict(arrowstyle='->', color=mlred, lw=3, alpha=0.5))
 
-# Gradient flow
-gradient_labels = [
-    (10, 2.3, '$\\frac{\\partial L}{\\partial L} = 1$'),
-    (8.5, 2.3, '$\\frac{\\partial L}{\\partial a}$'),
-    (5.5, 2.3, '$\\frac{\\partial L}{\\partial z}$'),
-    (2.5, 2.3, '$\\frac{\\partial L}{\\partial w}$'),
-]
-
-for x, y, label in gradient_labels:
-    ax.text(x, y, label, fontsize=9, ha='center', color=mlred)
+# Gradient flow: one gradient per node on the loss's path to the parameters
+for node, (px, py) in positions.items():
+    if node.requires_grad and py == 5.5:
+        name = labels.get(node.name, node.name)
+        label = '$\\frac{\\partial L}{\\partial L} = 1$' if node is L else \
+            f'$\\frac{{\\partial L}}{{\\partial {name}}}$'
+        ax.text(px, 2.3, label, fontsize=9, ha='center', color=mlred)
 
 # Key equations box
 equations = """Chain Rule:
@@ -123,6 +157,16 @@ Gradient computation:
 ax.text(12.5, 6.5, equations, ha='center', va='center', fontsize=9,
         bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor=mlpurple, linewidth=2))
 
+# Memory plan of the executor
+memory = (f'{DAYS:,} samples, {len(executor.lifetimes)} tensors\n'
+          f'One buffer each: {kilobytes(executor.unshared_bytes)}\n'
+          f'Liveness reuse: {kilobytes(executor.peak_bytes)} '
+          f'in {len(executor.buffers)} buffers\n'
+          f'Annotations: bytes, kept for backward or freed,\n'
+          f"forward / backward {'time' if TIMED else 'FLOPs'}")
+ax.text(12.5, 3.2, memory, ha='center', va='center', fontsize=8, color=mlgray,
+        bbox=dict(boxstyle='round,pad=0.4', facecolor='white', edgecolor=mlgray))
+
 plt.tight_layout()
 plt.savefig('backprop_computational_graph.pdf', format='pdf', bbox_inches='tight', dpi=300)
 plt.savefig('backprop_computational_graph.png', format='png', bbox_inches='tight', dpi=300)
@@ -3,10 +3,21 @@ CHART_METADATA = {
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/backprop_flow_diagram'
 }
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
+try:
+    from chartbuild.profiles import reproducible
+except ImportError:  # run standalone: reproducible outputs
+    reproducible = lambda: True
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.graph import Executor, mlp
+
 # Color palette
 mlpurple = '#3333B2'
 mlblue = '#0066CC'
@@ -20,33 +31,76 @@ ax.set_xlim(0, 12)
 ax.set_ylim(0, 6)
 ax.axis('off')
 
+# Live graph: an 8-64-32-1 MLP trained on ten years of daily features,
+# planned with liveness-based buffer reuse and costed per layer (in FLOPs,
+# or in measured time outside reproducible builds)
+DAYS = 2520
+rng = np.random.default_rng(42)
+graph, loss = mlp((8, 64, 32, 1), DAYS)
+executor = Executor(graph, loss)
+TIMED = not reproducible()
+feeds = {'x': rng.normal(size=(DAYS, 8)), 'y': rng.uniform(size=(DAYS, 1))}
+stats = executor.profile(feeds, repeat=50) if TIMED else executor.costs()
+groups = list(dict.fromkeys(node.group for node in executor.nodes))
+layers = {group: {'forward': 0, 'backward': 0, 'kept': 0, 'freed': 0} for group in groups}
+for stat in stats:
+    layer = layers[stat.node.group]
+    layer['forward'] += stat.forward if TIMED else stat.forward_flops
+    layer['backward'] += stat.backward if TIMED else stat.backward_flops
+    layer['kept' if stat.kept else 'freed'] += stat.nbytes
+for node in executor.nodes:
+    if node.op is None and not node.requires_grad:
+        layers[node.group]['kept'] += node.nbytes  # fed inputs stay for the whole run
+
 # Draw layers
-layer_positions = [1.5, 4, 6.5, 9, 10.5]
-layer_names = ['Input\n$x$', 'Hidden 1\n$h_1$', 'Hidden 2\n$h_2$', 'Output\n$\\hat{y}$', 'Loss\n$L$']
-layer_colors = [mlblue, mlpurple, mlpurple, mlgreen, mlred]
+layer_positions = np.linspace(1.5, 10.5, len(groups))
+symbols = {'x': 'x', 'y_hat': '\\hat{y}', 'L': 'L'}
+titles = {'x': 'Input', 'y_hat': 'Output', 'L': 'Loss'}
+layer_names = [f"{titles.get(group, f'Hidden {group[1:]}')}\n${symbols.get(group, f'h_{group[1:]}')}$"
+               for group in groups]
+layer_colors = [mlblue] + [mlpurple] * (len(groups) - 3) + [mlgreen, mlred]
 
 for i, (pos, name, color) in enumerate(zip(layer_positions, layer_names, layer_colors)):
     circle = plt.Circle((pos, 3), 0.6, color=color, alpha=0.7)
     ax.add_patch(circle)
     ax.text(pos, 3, name, ha='center', va='center', fontsize=9, color='white', fontweight='bold')
 
-# Forward pass arrows (top)
-for i in range(len(layer_positions)-1):
-    ax.annotate('', xy=(layer_positions[i+1]-0.7, 3.8), xytext=(layer_positions[i]+0.7, 3.8),
+# Per-layer work (or time) and memory from the plan
+for pos, group in zip(layer_positions, groups):
+    layer = layers[group]
+    lines = [f"keeps {layer['kept'] / 1e3:.0f} kB", f"frees {layer['freed'] / 1e3:.0f} kB"]
+    if layer['forward'] and TIMED:
+        lines.insert(0, f"{layer['forward'] * 1e3:.2f} / {layer['backward'] * 1e3:.2f} ms")
+    elif layer['forward']:
+        lines.insert(0, f"{layer['forward'] / 1e6:.2f} / {layer['backward'] / 1e6:.2f} MFLOP")
+    ax.text(pos, 2.25, '\n'.join(lines), ha='center', va='top', fontsize=7, color=mlgray)
+
+# Forward pass arrows (top), one per tensor crossing a layer boundary
+position = dict(zip(groups, layer_positions))
+crossings = sorted({(position[source.group], position[target.group])
+                    for source, target in graph.edges(executor.ops) if source.group != target.group})
+for start, end in crossings:
+    ax.annotate('', xy=(end-0.7, 3.8), xytext=(start+0.7, 3.8),
                 arrowprops=dict(arrowstyle='->', color=mlblue, lw=2))
 ax.text(6, 4.5, 'Forward Pass', ha='center', fontsize=11, color=mlblue, fontweight='bold')
 
 # Backward pass arrows (bottom)
-for i in range(len(layer_positions)-1, 0, -1):
-    ax.annotate('', xy=(layer_positions[i-1]+0.7, 2.2), xytext=(layer_positions[i]-0.7, 2.2),
+for start, end in crossings:
+    ax.annotate('', xy=(start+0.7, 2.2), xytext=(end-0.7, 2.2),
                 arrowprops=dict(arrowstyle='->', color=mlred, lw=2))
-ax.text(6, 1.3, 'Backward Pass (Gradients)', ha='center', fontsize=11, color=mlred, fontweight='bold')
+ax.text(6, 0.9, 'Backward Pass (Gradients)', ha='center', fontsize=11, color=mlred, fontweight='bold')
 
 # Gradient labels
-grad_labels = ['$\\frac{\\partial L}{\\partial x}$', '$\\frac{\\partial L}{\\partial h_1}$',
-               '$\\frac{\\partial L}{\\partial h_2}$', '$\\frac{\\partial L}{\\partial \\hat{y}}$']
-for i, label in enumerate(grad_labels):
-    ax.text(layer_positions[i]+1.25, 1.8, label, ha='center', fontsize=9, color=mlred)
+for start, end in crossings:
+    group = groups[list(layer_positions).index(start)]
+    symbol = symbols.get(group, f'h_{group[1:]}')
+    ax.text((start + end) / 2, 1.8, f'$\\frac{{\\partial L}}{{\\partial {symbol}}}$',
+            ha='center', fontsize=9, color=mlred)
+
+ax.text(6, 0.35, f'{DAYS:,} samples: peak {executor.peak_bytes / 1e6:.2f} MB with liveness-based '
+        f'buffer reuse, {executor.unshared_bytes / 1e6:.2f} MB with one buffer per tensor '
+        f"({'time' if TIMED else 'work'}: forward / backward)", ha='center', fontsize=8,
+        color=mlgray)
 
 ax.set_title('Backpropagation: Forward and Backward Pass', fontsize=14, fontweight='bold', pad=20)
 
@@ -3,9 +3,20 @@ Batch vs Stochastic Gradient Descent
 Module 3: Training Neural Networks
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.batches import BatchLoader, sgd_path
+
 CHART_METADATA = {
     'title': 'Batch Vs Stochastic',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/batch_vs_stochastic'
@@ -20,29 +31,42 @@ mlgray = '#7F7F7F'
 
 fig, axes = plt.subplots(1, 3, figsize=(14, 5))
 
-np.random.seed(42)
+# Linear regression of returns on two standardised features: the loss is the
+# mean squared error over all samples, and each panel descends it for real.
+rng = np.random.default_rng(42)
+SAMPLES = 100_000
+features = rng.normal(size=(SAMPLES, 2))
+returns = features @ np.array([0.3, -0.2]) + rng.normal(0, 1.2, SAMPLES)
+A = features.T @ features / SAMPLES
+b = features.T @ returns / SAMPLES
+w_star = np.linalg.solve(A, b)
+start = [1.8, 1.5]
+
+
+def gradient(x_batch, y_batch, w):
+    """Gradient of the batch's mean squared error at ``w``."""
+    return 2 * x_batch.T @ (x_batch @ w - y_batch) / len(y_batch)
+
 
 # ==================== LEFT: Full Batch GD ====================
 ax = axes[0]
 
-# Contour plot
-x = np.linspace(-2, 2, 100)
-y = np.linspace(-2, 2, 100)
+# Contour plot of the full-data loss
+x = np.linspace(-2, 2, grid_points(100))
+y = np.linspace(-2, 2, grid_points(100))
 X, Y = np.meshgrid(x, y)
-Z = X**2 + Y**2
+W = np.stack([X, Y], axis=-1) - w_star
+Z = np.einsum('...i,ij,...j->...', W, A, W)  # loss above its minimum
 
 ax.contour(X, Y, Z, levels=15, colors=mlgray, alpha=0.5)
 ax.contourf(X, Y, Z, levels=15, cmap='Blues', alpha=0.3)
 
-# Smooth path
-path_x = [1.8]
-path_y = [1.5]
-for _ in range(15):
-    path_x.append(path_x[-1] * 0.8)
-    path_y.append(path_y[-1] * 0.8)
+# Smooth path: every step uses all samples
+path_x, path_y = sgd_path(BatchLoader(features, returns, batch_size=SAMPLES, shuffle=False),
+                          gradient, start, 15, learning_rate=0.1).T
 
 ax.plot(path_x, path_y, 'o-', color=mlblue, linewidth=2, markersize=4)
-ax.scatter([0], [0], c=mlgreen, s=150, marker='*', zorder=10)
+ax.scatter(*w_star, c=mlgreen, s=150, marker='*', zorder=10)
 
 ax.set_xlabel('$w_1$', fontsize=11)
 ax.set_ylabel('$w_2$', fontsize=11)
@@ -58,15 +82,12 @@ ax = axes[1]
 ax.contour(X, Y, Z, levels=15, colors=mlgray, alpha=0.5)
 ax.contourf(X, Y, Z, levels=15, cmap='Oranges', alpha=0.3)
 
-# Slightly noisy path
-path_x = [1.8]
-path_y = [1.5]
-for _ in range(20):
-    path_x.append(path_x[-1] * 0.85 + np.random.randn() * 0.1)
-    path_y.append(path_y[-1] * 0.85 + np.random.randn() * 0.1)
+# Slightly noisy path: shuffled batches of 32 samples
+path_x, path_y = sgd_path(BatchLoader(features, returns, batch_size=32, seed=1),
+                          gradient, start, 20, learning_rate=0.075).T
 
 ax.plot(path_x, path_y, 'o-', color=mlorange, linewidth=2, markersize=4)
-ax.scatter([0], [0], c=mlgreen, s=150, marker='*', zorder=10)
+ax.scatter(*w_star, c=mlgreen, s=150, marker='*', zorder=10)
 
 ax.set_xlabel('$w_1$', fontsize=11)
 ax.set_ylabel('$w_2$', fontsize=11)
@@ -74,7 +95,7 @@ ax.set_title('Mini-Batch GD', fontsize=12, fontweight='bold', color=mlorange)
 ax.set_xlim(-2, 2)
 ax.set_ylim(-2, 2)
 
-ax.text(0, -1.7, 'Best of both worlds\n(batch size 32-256)', fontsize=9, ha='center', color=mlorange)
+ax.text(0, -1.7, 'Best of both worlds\n(shuffled batches of 32)', fontsize=9, ha='center', color=mlorange)
 
 # ==================== RIGHT: Stochastic GD ====================
 ax = axes[2]
@@ -82,15 +103,12 @@ ax = axes[2]
 ax.contour(X, Y, Z, levels=15, colors=mlgray, alpha=0.5)
 ax.contourf(X, Y, Z, levels=15, cmap='Greens', alpha=0.3)
 
-# Very noisy path
-path_x = [1.8]
-path_y = [1.5]
-for _ in range(30):
-    path_x.append(path_x[-1] * 0.9 + np.random.randn() * 0.25)
-    path_y.append(path_y[-1] * 0.9 + np.random.randn() * 0.25)
+# Very noisy path: one shuffled sample per step
+path_x, path_y = sgd_path(BatchLoader(features, returns, batch_size=1, seed=2),
+                          gradient, start, 30, learning_rate=0.05).T
 
 ax.plot(path_x, path_y, 'o-', color=mlgreen, linewidth=1.5, markersize=3)
-ax.scatter([0], [0], c='red', s=150, marker='*', zorder=10)
+ax.scatter(*w_star, c='red', s=150, marker='*', zorder=10)
 
 ax.set_xlabel('$w_1$', fontsize=11)
 ax.set_ylabel('$w_2$', fontsize=11)
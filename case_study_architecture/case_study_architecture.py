@@ -3,8 +3,15 @@ CHART_METADATA = {
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/case_study_architecture'
 }
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.network import draw_arrows
 
 mlpurple = '#3333B2'
 mlblue = '#0066CC'
@@ -48,9 +55,9 @@ ax.text(10.5, 5.2, '1 neuron', fontsize=9, ha='center')
 ax.text(10.5, 4.8, '(return pred)', fontsize=8, ha='center')
 
 # Arrows
-arrow_x = [2.5, 5, 7, 9]
-for x in arrow_x:
-    ax.annotate('', xy=(x+0.4, 5.5), xytext=(x, 5.5), arrowprops=dict(arrowstyle='->', color=mlgray, lw=1.5))
+arrow_x = np.array([2.5, 5, 7, 9])
+draw_arrows(ax, np.column_stack([arrow_x, np.full(4, 5.5)]),
+            np.column_stack([arrow_x + 0.4, np.full(4, 5.5)]), color=mlgray, linewidth=1.5)
 
 # Architecture details
 details = [
@@ -0,0 +1,35 @@
+"""
+Build tooling for the Neural Networks Introduction chart collection.
+
+Every chart lives in its own directory as a standalone script that writes its
+outputs with relative ``savefig`` paths. This package discovers those
+directories and renders them in parallel from pre-warmed worker processes.
+
+Usage: python -m chartbuild build [-j JOBS] [CHART ...]
+"""
+
+from .cache import RenderCache, cache_key
+from .discovery import REPO_ROOT, Chart, discover_charts, select_charts
+from .runner import build
+from .profiles import PROFILES, Profile
+from .registry import build_registry, write_registry
+from .settings import RenderSettings
+from .worker import ChartResult, WarmWorker, render_chart
+
+__all__ = [
+    'REPO_ROOT',
+    'Chart',
+    'ChartResult',
+    'PROFILES',
+    'Profile',
+    'RenderCache',
+    'RenderSettings',
+    'WarmWorker',
+    'build',
+    'build_registry',
+    'cache_key',
+    'discover_charts',
+    'render_chart',
+    'select_charts',
+    'write_registry',
+]
@@ -0,0 +1,335 @@
+"""
+Command-line entry point: python -m chartbuild <command> [options]
+"""
+
+import argparse
+import dataclasses
+import sys
+
+from .assemble import DECK_PATH, assemble_deck
+from .assets import THUMBNAIL_DIR, THUMBNAIL_WIDTH, generate_assets
+from .bench import run_benchmark
+from .cache import RenderCache
+from .discovery import discover_charts, select_charts
+from .export import export_benchmark
+from .gallery import GALLERY_DIR, build_gallery
+from .mathcache import MathtextCache
+from .pngopt import DEFAULT_BUDGET, optimise_pngs, over_budget, rendered_outputs
+from .profiles import PROFILES, get_profile
+from .profiling import phase_report
+from .rasterize import rasterize_report
+from .registry import REGISTRY_PATH, build_registry, tagged, write_registry
+from .runner import build
+from .settings import RenderSettings
+from .verify import verify_reproducible
+from .watch import DEBOUNCE, watch
+from .worker import startup_benchmark
+
+
+def _charts(args):
+    charts = select_charts(discover_charts(), args.charts)
+    if args.tag:
+        names = set(tagged(build_registry(), args.tag))
+        charts = [chart for chart in charts if chart.name in names]
+    return charts
+
+
+def _settings(args):
+    if args.pdf_only and 'pdf' not in get_profile(args.profile).formats:
+        raise ValueError(f'--pdf-only conflicts with the {args.profile} profile')
+    return RenderSettings(reproducible=not args.no_reproducible,
+                          single_draw=not args.separate_saves,
+                          png=not args.pdf_only,
+                          rasterize=args.rasterize,
+                          raster_threshold=args.raster_threshold,
+                          raster_dpi=args.raster_dpi,
+                          profile=args.profile,
+                          mathtext_cache=not args.no_mathtext_cache,
+                          optimise_png=args.optimise_png,
+                          size_budget=round(args.size_budget * 1e6))
+
+
+def _build(args):
+    charts = _charts(args)
+    settings = _settings(args)
+    cache = None if args.no_cache else RenderCache(settings=settings)
+    results = build(charts, jobs=args.jobs, cache=cache, settings=settings)
+    return 0 if all(result.ok for result in results) else 1
+
+
+def _cache(args):
+    cache = RenderCache()
+    if args.clear:
+        cache.clear()
+        print(f'Cleared {cache.root}')
+        return 0
+    entries, total = cache.size()
+    print(f'{cache.root}: {entries} entries, {total / 1e6:.1f} MB')
+    layouts, total = MathtextCache().size()
+    print(f'  mathtext: {layouts} layouts, {total / 1e6:.1f} MB')
+    return 0
+
+
+def _list(args):
+    for chart in _charts(args):
+        print(f'{chart.name:40s} {chart.script.name}')
+    return 0
+
+
+def _registry(args):
+    write_registry(args.output)
+    return 0
+
+
+def _assemble(args):
+    try:
+        assemble_deck(_charts(args), args.output, full=args.full)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+def _assets(args):
+    try:
+        _, failed = generate_assets(_charts(args), jobs=args.jobs, qr=not args.no_qr,
+                                    thumbnails=not args.no_thumbnails, width=args.width,
+                                    directory=args.output, force=args.force)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 1 if failed else 0
+
+
+def _optimise(args):
+    charts = _charts(args)
+    outputs = {chart: rendered_outputs(chart.directory) for chart in charts}
+    optimise_pngs([chart.directory / name for chart, names in outputs.items()
+                   for name in names if name.lower().endswith('.png')], jobs=args.jobs)
+    budget = round(args.size_budget * 1e6)
+    over = 0
+    for chart, names in outputs.items():
+        total = over_budget(chart.directory, names, budget)
+        if total is not None:
+            over += 1
+            print(f'  OVER {chart.name}: static outputs take {total / 1e6:.2f} MB, '
+                  f'over the {budget / 1e6:.2f} MB size budget')
+    return 1 if over else 0
+
+
+def _gallery(args):
+    page = build_gallery(_charts(args), args.output, thumbnails=not args.no_thumbnails,
+                         jobs=args.jobs)
+    print(f'Open {page.as_uri()}')
+    return 0
+
+
+def _verify(args):
+    charts = _charts(args)
+    return 1 if verify_reproducible(charts, _settings(args)) else 0
+
+
+def _bench(args):
+    regressions = run_benchmark(_charts(args), _settings(args), repeat=args.repeat,
+                                threshold=args.threshold, record=not args.no_record)
+    return 1 if regressions else 0
+
+
+def _export_bench(args):
+    export_benchmark(_charts(args), repeat=args.repeat)
+    return 0
+
+
+def _raster_report(args):
+    rasterize_report(_charts(args), _settings(args))
+    return 0
+
+
+def _phases(args):
+    settings = dataclasses.replace(_settings(args), phases=True, cprofile_dir=args.cprofile)
+    phase_report(_charts(args), settings)
+    return 0
+
+
+def _watch(args):
+    try:
+        watch(_charts(args), _settings(args), debounce=args.debounce)
+    except RuntimeError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    return 0
+
+
+def _startup_bench(args):
+    startup_benchmark(_charts(args), repeat=args.repeat)
+    return 0
+
+
+def _add_chart_arguments(parser):
+    parser.add_argument('charts', nargs='*', help='chart directory names or wildcards')
+    parser.add_argument('-t', '--tag', action='append', default=[],
+                        help='only charts with this metainfo keyword (repeatable)')
+
+
+def _add_settings_arguments(parser):
+    parser.add_argument('--no-reproducible', action='store_true',
+                        help='keep timestamps and tool versions in the output metadata')
+    parser.add_argument('--pdf-only', action='store_true',
+                        help='skip the 300 dpi PNG outputs')
+    parser.add_argument('--separate-saves', action='store_true',
+                        help='draw the figure once per savefig call instead of once per figure')
+    parser.add_argument('--rasterize', action='store_true',
+                        help='embed surfaces, filled contours and dense scatters in PDFs as images')
+    parser.add_argument('--raster-threshold', type=int, default=RenderSettings.raster_threshold,
+                        help='vertex count above which an artist is rasterised (default: %(default)s)')
+    parser.add_argument('--raster-dpi', type=float, default=None,
+                        help='resolution of rasterised artists (default: the savefig dpi)')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='final',
+                        help='render profile: final outputs or fast draft previews in .preview/')
+    parser.add_argument('--no-mathtext-cache', action='store_true',
+                        help='lay out every mathtext string afresh instead of reusing stored layouts')
+    parser.add_argument('--optimise-png', action='store_true',
+                        help='re-encode PNG outputs losslessly with the smallest filters and palette')
+    _add_budget_argument(parser)
+
+
+def _add_budget_argument(parser):
+    parser.add_argument('--size-budget', type=float, metavar='MB', default=DEFAULT_BUDGET / 1e6,
+                        help='fail charts whose PDF/PNG outputs exceed this size '
+                             '(default: %(default)s; 0 disables; animations are not counted)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m chartbuild',
+                                     description='Build the neural network course charts.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help='render charts in parallel')
+    _add_chart_arguments(build_parser)
+    build_parser.add_argument('-j', '--jobs', type=int, default=None,
+                              help='worker processes (default: all cores)')
+    build_parser.add_argument('--no-cache', action='store_true',
+                              help='render every chart, ignoring the render cache')
+    _add_settings_arguments(build_parser)
+    build_parser.set_defaults(func=_build)
+
+    assemble_parser = commands.add_parser(
+        'assemble', help='assemble the chart PDFs into one deck, reusing unchanged pages')
+    _add_chart_arguments(assemble_parser)
+    assemble_parser.add_argument('-o', '--output', default=DECK_PATH,
+                                 help='deck path (default: %(default)s)')
+    assemble_parser.add_argument('--full', action='store_true',
+                                 help='rebuild every page instead of reusing unchanged ones')
+    assemble_parser.set_defaults(func=_assemble)
+
+    assets_parser = commands.add_parser(
+        'assets', help='generate missing or stale QR codes and PDF thumbnails in parallel')
+    _add_chart_arguments(assets_parser)
+    assets_parser.add_argument('-j', '--jobs', type=int, default=None,
+                               help='worker processes (default: all cores)')
+    assets_parser.add_argument('-o', '--output', default=THUMBNAIL_DIR,
+                               help='thumbnail directory (default: %(default)s)')
+    assets_parser.add_argument('--width', type=int, default=THUMBNAIL_WIDTH,
+                               help='thumbnail width in pixels (default: %(default)s)')
+    assets_parser.add_argument('--no-qr', action='store_true', help='skip the QR codes')
+    assets_parser.add_argument('--no-thumbnails', action='store_true', help='skip the thumbnails')
+    assets_parser.add_argument('--force', action='store_true',
+                               help='regenerate every asset, including the shipped QR codes')
+    assets_parser.set_defaults(func=_assets)
+
+    optimise_parser = commands.add_parser(
+        'optimise', help='losslessly re-encode the rendered PNGs in place and check size budgets')
+    _add_chart_arguments(optimise_parser)
+    optimise_parser.add_argument('-j', '--jobs', type=int, default=None,
+                                 help='worker processes (default: all cores)')
+    _add_budget_argument(optimise_parser)
+    optimise_parser.set_defaults(func=_optimise)
+
+    gallery_parser = commands.add_parser(
+        'gallery', help='write a searchable static HTML gallery of the charts')
+    _add_chart_arguments(gallery_parser)
+    gallery_parser.add_argument('-o', '--output', default=GALLERY_DIR,
+                                help='gallery directory (default: %(default)s)')
+    gallery_parser.add_argument('-j', '--jobs', type=int, default=None,
+                                help='thumbnail worker processes (default: all cores)')
+    gallery_parser.add_argument('--no-thumbnails', action='store_true',
+                                help='use the thumbnails already there instead of updating them')
+    gallery_parser.set_defaults(func=_gallery)
+
+    verify_parser = commands.add_parser(
+        'verify', help='render charts twice and check the outputs are byte-identical')
+    _add_chart_arguments(verify_parser)
+    _add_settings_arguments(verify_parser)
+    verify_parser.set_defaults(func=_verify)
+
+    cache_parser = commands.add_parser('cache', help='inspect or clear the render cache')
+    cache_parser.add_argument('--clear', action='store_true', help='delete all cached renders')
+    cache_parser.set_defaults(func=_cache)
+
+    list_parser = commands.add_parser('list', help='list discovered charts')
+    _add_chart_arguments(list_parser)
+    list_parser.set_defaults(func=_list)
+
+    bench_parser = commands.add_parser(
+        'bench', help='benchmark every chart and flag regressions against the history')
+    _add_chart_arguments(bench_parser)
+    bench_parser.add_argument('-n', '--repeat', type=int, default=3,
+                              help='renders per chart (default: 3)')
+    bench_parser.add_argument('--threshold', type=float, default=0.2,
+                              help='relative slowdown flagged as a regression (default: 0.2)')
+    bench_parser.add_argument('--no-record', action='store_true',
+                              help='compare against the history without appending this run')
+    _add_settings_arguments(bench_parser)
+    bench_parser.set_defaults(func=_bench)
+
+    registry_parser = commands.add_parser(
+        'registry', help='write the static chart registry (no script is executed)')
+    registry_parser.add_argument('-o', '--output', default=REGISTRY_PATH,
+                                 help='index path (default: %(default)s)')
+    registry_parser.set_defaults(func=_registry)
+
+    startup_parser = commands.add_parser(
+        'startup-bench', help='compare cold subprocess renders against the warm worker')
+    _add_chart_arguments(startup_parser)
+    startup_parser.add_argument('-n', '--repeat', type=int, default=3,
+                                help='renders per chart and mode (default: 3)')
+    startup_parser.set_defaults(func=_startup_bench)
+
+    export_parser = commands.add_parser(
+        'export-bench', help='time separate saves against single-draw and PDF-only export')
+    _add_chart_arguments(export_parser)
+    export_parser.add_argument('-n', '--repeat', type=int, default=3,
+                               help='renders per chart and mode (default: 3)')
+    export_parser.set_defaults(func=_export_bench)
+
+    raster_parser = commands.add_parser(
+        'raster-report', help='compare PDF size and render time with and without rasterisation')
+    _add_chart_arguments(raster_parser)
+    _add_settings_arguments(raster_parser)
+    raster_parser.set_defaults(func=_raster_report)
+
+    phases_parser = commands.add_parser(
+        'phases', help='time the compute, figure, artist, layout and save phases of each chart')
+    _add_chart_arguments(phases_parser)
+    phases_parser.add_argument('--cprofile', metavar='DIR', default=None,
+                               help='also write a cProfile dump per chart (<chart>.prof) to DIR')
+    _add_settings_arguments(phases_parser)
+    phases_parser.set_defaults(func=_phases)
+
+    watch_parser = commands.add_parser(
+        'watch', help='re-render a chart in a warm worker whenever its sources are saved')
+    _add_chart_arguments(watch_parser)
+    watch_parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                              help='quiet seconds that end a burst of saves (default: %(default)s)')
+    _add_settings_arguments(watch_parser)
+    watch_parser.set_defaults(func=_watch)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Incremental assembly of the combined chart deck.
+
+The per-chart PDFs are concatenated in deck order (numbered ``01_``-``20_``
+modules first, then topic charts), one outline entry per chart. A manifest
+records the hash and page range of every source PDF, so a rebuild copies
+the pages of unchanged charts from the previous deck and only reads the
+chart PDFs that changed; when nothing changed the deck is left untouched.
+
+The deck is streamed: pages are copied one page range (a chart PDF, or the
+pages of an unchanged chart in the previous deck) at a time, and each object
+is renumbered and written to the output as soon as it is reached. Only the
+object offsets, page numbers and outline titles are kept until the page
+tree, outline and cross-reference table are written at the end, so peak
+memory is set by the largest chart rather than by the deck.
+
+``NeuralNetworks_Complete.pdf`` is the compiled lecture deck and is not
+produced here; the chart deck is written to ``NeuralNetworks_Charts.pdf``.
+Requires ``pypdf``.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from .discovery import CACHE_DIR, REPO_ROOT
+
+DECK_PATH = REPO_ROOT / 'NeuralNetworks_Charts.pdf'
+
+# Object numbers of the objects written last, once every page is known.
+_CATALOG, _PAGES, _OUTLINES = 1, 2, 3
+# Page attributes a page may inherit from the page tree.
+_INHERITED = ('/Resources', '/MediaBox', '/CropBox', '/Rotate')
+
+
+def _pypdf():
+    try:
+        import pypdf
+    except ImportError:
+        raise RuntimeError('Assembling the deck requires pypdf (pip install pypdf)') from None
+    return pypdf
+
+
+def chart_pdfs(chart):
+    """The PDF outputs of ``chart`` that go into the deck, in declaration order."""
+    names = [name for name in chart.outputs if name.endswith('.pdf')]
+    if not names:
+        names = [f'{chart.script.stem}.pdf']
+    return [chart.directory / name for name in names if (chart.directory / name).exists()]
+
+
+def _digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _manifest_path(output):
+    return CACHE_DIR / f'{Path(output).stem}.deck.json'
+
+
+def _load_manifest(output):
+    try:
+        manifest = json.loads(_manifest_path(output).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    if manifest.get('deck_sha256') != (_digest(output) if Path(output).exists() else None):
+        return None  # the deck was replaced or edited since the manifest was written
+    return manifest
+
+
+class _DeckWriter:
+    """Write a PDF page range by page range without holding it in memory."""
+
+    def __init__(self, handle, pypdf):
+        self._handle = handle
+        self._generic = pypdf.generic
+        self._offsets = {}
+        self._next = _OUTLINES + 1
+        self.pages = []  # object numbers, in page order
+        self._outline = []  # (title, page index)
+        handle.write(b'%PDF-1.7\n%\xe2\xe3\xcf\xd3\n')
+
+    def _allocate(self):
+        self._next += 1
+        return self._next - 1
+
+    def _ref(self, number):
+        return self._generic.IndirectObject(number, 0, None)
+
+    def _write(self, number, obj):
+        self._offsets[number] = self._handle.tell()
+        self._handle.write(b'%d 0 obj\n' % number)
+        obj.write_to_stream(self._handle)
+        self._handle.write(b'\nendobj\n')
+
+    def _remap(self, obj, numbers, pending):
+        # A copy of ``obj`` whose indirect references use the output's object
+        # numbers; objects reached for the first time are queued for writing.
+        generic = self._generic
+        if isinstance(obj, generic.IndirectObject):
+            key = obj.idnum, obj.generation
+            if key not in numbers:
+                target = obj.get_object()
+                if isinstance(target, generic.DictionaryObject):
+                    # Never follow links out of the range into the source's page tree.
+                    if target.get('/Type') == '/Pages':
+                        return self._ref(_PAGES)
+                    if target.get('/Type') == '/Page':
+                        return generic.NullObject()
+                numbers[key] = self._allocate()
+                pending.append(obj)
+            return self._ref(numbers[key])
+        if isinstance(obj, generic.StreamObject):
+            copy = generic.StreamObject()
+            copy._data = obj._data  # the encoded bytes, copied without re-encoding
+        elif isinstance(obj, generic.DictionaryObject):
+            copy = generic.DictionaryObject()
+        elif isinstance(obj, generic.ArrayObject):
+            return generic.ArrayObject(self._remap(item, numbers, pending) for item in obj)
+        else:
+            return obj
+        for key, value in obj.items():
+            if key != '/Length':  # streams write their own
+                copy[key] = self._remap(value, numbers, pending)
+        return copy
+
+    def add_pages(self, pages):
+        """Copy ``pages`` (pypdf page objects of one document) to the output."""
+        generic = self._generic
+        numbers, pending, copied = {}, [], []
+        for page in pages:
+            ref = page.indirect_reference
+            numbers[ref.idnum, ref.generation] = self._allocate()
+            copied.append((numbers[ref.idnum, ref.generation], page))
+        for number, page in copied:
+            attributes = {key: value for key, value in page.items() if key != '/Parent'}
+            node = page.raw_get('/Parent') if '/Parent' in page else None
+            while node is not None:
+                node = node.get_object()
+                for key in _INHERITED:
+                    if key in node and key not in attributes:
+                        attributes[key] = node.raw_get(key)
+                node = node.raw_get('/Parent') if '/Parent' in node else None
+            copy = self._remap(generic.DictionaryObject(attributes), numbers, pending)
+            copy[generic.NameObject('/Parent')] = self._ref(_PAGES)
+            self._write(number, copy)
+            self.pages.append(number)
+            while pending:
+                ref = pending.pop()
+                self._write(numbers[ref.idnum, ref.generation],
+                            self._remap(ref.get_object(), numbers, pending))
+
+    def add_outline_item(self, title, page_index):
+        self._outline.append((title, page_index))
+
+    def close(self):
+        """Write the page tree, outline and cross-reference table."""
+        generic = self._generic
+        name = generic.NameObject
+        self._write(_PAGES, generic.DictionaryObject({
+            name('/Type'): name('/Pages'),
+            name('/Kids'): generic.ArrayObject(self._ref(number) for number in self.pages),
+            name('/Count'): generic.NumberObject(len(self.pages))}))
+        items = [self._allocate() for _ in self._outline]
+        for position, (number, (title, page_index)) in enumerate(zip(items, self._outline)):
+            item = generic.DictionaryObject({
+                name('/Title'): generic.TextStringObject(title),
+                name('/Parent'): self._ref(_OUTLINES),
+                name('/Dest'): generic.ArrayObject([self._ref(self.pages[page_index]),
+                                                    name('/Fit')])})
+            if position:
+                item[name('/Prev')] = self._ref(items[position - 1])
+            if position + 1 < len(items):
+                item[name('/Next')] = self._ref(items[position + 1])
+            self._write(number, item)
+        outlines = generic.DictionaryObject({name('/Type'): name('/Outlines'),
+                                             name('/Count'): generic.NumberObject(len(items))})
+        if items:
+            outlines[name('/First')] = self._ref(items[0])
+            outlines[name('/Last')] = self._ref(items[-1])
+        self._write(_OUTLINES, outlines)
+        self._write(_CATALOG, generic.DictionaryObject({
+            name('/Type'): name('/Catalog'), name('/Pages'): self._ref(_PAGES),
+            name('/Outlines'): self._ref(_OUTLINES)}))
+
+        xref = self._handle.tell()
+        self._handle.write(b'xref\n0 %d\n0000000000 65535 f \n' % self._next)
+        for number in range(1, self._next):
+            self._handle.write(b'%010d 00000 n \n' % self._offsets[number])
+        self._handle.write(b'trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+                           % (self._next, _CATALOG, xref))
+
+
+def assemble_deck(charts, output=DECK_PATH, full=False, report=print):
+    """Write the combined deck; return the number of source PDFs re-read."""
+    pypdf = _pypdf()
+    output = Path(output)
+    start = time.perf_counter()
+    sources = [(chart, path, _digest(path)) for chart in charts for path in chart_pdfs(chart)]
+    previous = None if full else _load_manifest(output)
+    if previous and [(e['file'], e['sha256']) for e in previous['entries']] == \
+            [(str(path.relative_to(REPO_ROOT)), digest) for _, path, digest in sources]:
+        report(f'{output.name} is up to date ({time.perf_counter() - start:.2f}s)')
+        return 0
+
+    reusable = {}
+    if previous:
+        reusable = {(e['file'], e['sha256']): e for e in previous['entries']}
+    old_deck = pypdf.PdfReader(output) if reusable else None
+    entries, reread, reused_pages = [], 0, 0
+    partial = output.with_name(f'{output.name}.tmp')
+    with open(partial, 'wb') as handle:
+        writer = _DeckWriter(handle, pypdf)
+        for chart, path, digest in sources:
+            name = str(path.relative_to(REPO_ROOT))
+            first = len(writer.pages)
+            kept = reusable.get((name, digest))
+            if kept is not None:
+                writer.add_pages(old_deck.pages[kept['start']:kept['start'] + kept['pages']])
+                # Drop the objects just copied; the reader would otherwise
+                # end up caching the whole previous deck.
+                old_deck.resolved_objects.clear()
+                reused_pages += kept['pages']
+            else:
+                writer.add_pages(pypdf.PdfReader(path).pages)
+                reread += 1
+            writer.add_outline_item(chart.name, first)
+            entries.append({'chart': chart.name, 'file': name, 'sha256': digest,
+                            'start': first, 'pages': len(writer.pages) - first})
+        writer.close()
+    os.replace(partial, output)
+    manifest = {'deck_sha256': _digest(output), 'entries': entries}
+    _manifest_path(output).parent.mkdir(parents=True, exist_ok=True)
+    _manifest_path(output).write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+
+    mode = 'incremental' if reusable else 'full'
+    report(f'{output.name}: {len(writer.pages)} pages from {len(sources)} PDFs, '
+           f'{reread} re-read, {reused_pages} pages reused ({mode}, '
+           f'{time.perf_counter() - start:.2f}s)')
+    return reread
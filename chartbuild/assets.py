@@ -0,0 +1,176 @@
+"""
+Derived chart assets: QR codes and thumbnails.
+
+Every chart directory ships a ``qr_code.png`` linking to the chart's page on
+GitHub (the ``url`` of its registry entry, i.e. ``CHART_METADATA['url']``),
+and the gallery shows a small thumbnail of each chart. Both are derived from
+files that already exist, so this stage never runs a chart script:
+thumbnails are rasterised from the first page of the chart's first PDF.
+
+A manifest records what each asset was made from (the URL, or the PDF's
+hash and the thumbnail width) and the hash of the file written. Only assets
+whose input changed, whose file is missing or whose file was edited are
+regenerated, in a process pool. A ``qr_code.png`` that predates the manifest
+is taken as encoding the chart's current URL and recorded rather than
+rewritten; ``force=True`` regenerates everything.
+
+QR codes need the ``qrcode`` package; thumbnails need PyMuPDF or poppler's
+``pdftoppm``.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .assemble import chart_pdfs
+from .discovery import CACHE_DIR, REPO_ROOT
+from .pngopt import QR_NAME
+from .registry import chart_entry
+
+THUMBNAIL_DIR = REPO_ROOT / 'gallery' / 'thumbnails'
+THUMBNAIL_WIDTH = 320
+MANIFEST_PATH = CACHE_DIR / 'assets.json'
+
+
+def _digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _qrcode():
+    try:
+        import qrcode
+    except ImportError:
+        raise RuntimeError('QR codes require qrcode (pip install qrcode)') from None
+    return qrcode
+
+
+def make_qr_code(url, path):
+    """Write the QR code for ``url`` to ``path`` in the style of the shipped codes."""
+    qrcode = _qrcode()
+    # Level L, 10 px modules and a 4-module border: the shipped codes are 410-450 px.
+    code = qrcode.QRCode(error_correction=qrcode.constants.ERROR_CORRECT_L,
+                         box_size=10, border=4)
+    code.add_data(url)
+    code.make(fit=True)
+    code.make_image().save(path)
+
+
+def _rasteriser():
+    try:
+        import pymupdf
+    except ImportError:
+        pdftoppm = shutil.which('pdftoppm')
+        if pdftoppm is None:
+            raise RuntimeError('Thumbnails require PyMuPDF (pip install pymupdf) '
+                               'or poppler\'s pdftoppm') from None
+        return pdftoppm
+    return pymupdf
+
+
+def make_thumbnail(pdf, path, width=THUMBNAIL_WIDTH):
+    """Rasterise the first page of ``pdf`` to a PNG ``width`` pixels wide."""
+    rasteriser = _rasteriser()
+    if isinstance(rasteriser, str):
+        subprocess.run([rasteriser, '-png', '-singlefile', '-f', '1', '-l', '1',
+                        '-scale-to-x', str(width), '-scale-to-y', '-1',
+                        str(pdf), str(Path(path).with_suffix(''))], check=True)
+        return
+    with rasteriser.open(pdf) as document:
+        page = document[0]
+        zoom = width / page.rect.width
+        page.get_pixmap(matrix=rasteriser.Matrix(zoom, zoom), alpha=False).save(path)
+
+
+def thumbnail_path(chart, directory=THUMBNAIL_DIR):
+    return Path(directory) / f'{chart.name}.png'
+
+
+def _load_manifest(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def _current(record, inputs, path):
+    return (record is not None and record.get('inputs') == inputs and path.exists()
+            and record.get('sha256') == _digest(path))
+
+
+def _plan(charts, manifest, qr, thumbnails, width, directory, force):
+    """Jobs ``(chart name, kind, inputs, function, args, path)`` for the stale assets."""
+    jobs, current = [], 0
+    for chart in charts:
+        records = manifest.get(chart.name, {})
+        wanted = []
+        url = chart_entry(chart)['url'] if qr else None
+        if url:
+            path = chart.directory / QR_NAME
+            inputs = {'url': url}
+            if not force and 'qr' not in records and path.exists():
+                records['qr'] = {'inputs': inputs, 'sha256': _digest(path)}  # shipped code
+            wanted.append(('qr', inputs, make_qr_code, (url, path), path))
+        pdfs = chart_pdfs(chart) if thumbnails else []
+        if pdfs:
+            path = thumbnail_path(chart, directory)
+            inputs = {'pdf': pdfs[0].relative_to(chart.directory.parent).as_posix(),
+                      'sha256': _digest(pdfs[0]), 'width': width}
+            wanted.append(('thumbnail', inputs, make_thumbnail, (pdfs[0], path, width), path))
+        for kind, inputs, function, args, path in wanted:
+            if not force and _current(records.get(kind), inputs, path):
+                current += 1
+            else:
+                jobs.append((chart.name, kind, inputs, function, args, path))
+        manifest[chart.name] = records
+    return jobs, current
+
+
+def _run(function, args, path):
+    function(*args)
+    return _digest(path)
+
+
+def generate_assets(charts, jobs=None, qr=True, thumbnails=True, width=THUMBNAIL_WIDTH,
+                    directory=THUMBNAIL_DIR, force=False, manifest_path=MANIFEST_PATH,
+                    report=print):
+    """Bring the QR codes and thumbnails of ``charts`` up to date.
+
+    Returns the number of files written and a list of failures.
+    """
+    start = time.perf_counter()
+    manifest = _load_manifest(manifest_path)
+    pending, current = _plan(charts, manifest, qr, thumbnails, width, directory, force)
+    written = {'qr': 0, 'thumbnail': 0}
+    failed = []
+    kinds = {kind for _, kind, *_ in pending}
+    if 'qr' in kinds:
+        _qrcode()  # fail once, before forking, when a dependency is missing
+    if 'thumbnail' in kinds:
+        _rasteriser()
+    if pending:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        jobs = min(jobs or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [(name, kind, inputs, pool.submit(_run, function, args, path))
+                       for name, kind, inputs, function, args, path in pending]
+            for name, kind, inputs, future in futures:
+                try:
+                    digest = future.result()
+                except Exception as exc:  # one bad PDF should not stop the stage
+                    failed.append(f'{name} ({kind}): {exc}')
+                    continue
+                manifest[name][kind] = {'inputs': inputs, 'sha256': digest}
+                written[kind] += 1
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding='utf-8')
+    report(f"Assets: {written['qr']} QR codes and {written['thumbnail']} thumbnails written, "
+           f'{current} up to date ({time.perf_counter() - start:.2f}s)')
+    for failure in failed:
+        report(f'  FAIL {failure}')
+    return sum(written.values()), failed
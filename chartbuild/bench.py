@@ -0,0 +1,113 @@
+"""
+Per-chart performance benchmark with regression tracking.
+
+Each chart is rendered ``repeat`` times in the warm worker, one at a time so
+the timings do not compete for cores. The medians of wall time, CPU time,
+peak RSS, artist count and output sizes are appended to a local history
+file (one JSON record per run), and every metric is compared with the median
+of the previous runs made with the same render settings.
+"""
+
+import json
+import statistics
+import time
+from pathlib import Path
+
+from .cache import stack_versions
+from .discovery import CACHE_DIR
+from .profiles import output_directory
+from .worker import render_isolated, warm_up
+
+HISTORY_PATH = CACHE_DIR / 'bench_history.jsonl'
+
+# Metrics checked for regressions and the smallest change worth flagging.
+TRACKED = {'wall': 0.05, 'cpu': 0.05, 'max_rss': 8e6, 'output_bytes': 10e3}
+
+
+def measure(chart, settings, repeat=3):
+    """Median metrics of ``repeat`` renders of ``chart``, or ``None`` if it fails."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = render_isolated(chart, settings)
+        wall = time.perf_counter() - start
+        if not result.ok:
+            return None
+        directory = output_directory(chart, settings.render_profile)
+        sizes = {name: (directory / name).stat().st_size for name in result.outputs}
+        runs.append({'wall': wall, 'cpu': result.cpu_seconds, 'max_rss': result.max_rss,
+                     'artists': result.artists, 'output_bytes': sum(sizes.values()),
+                     'sizes': sizes})
+    metrics = {key: statistics.median(run[key] for run in runs)
+               for key in ('wall', 'cpu', 'max_rss', 'artists', 'output_bytes')}
+    metrics['sizes'] = runs[-1]['sizes']
+    return metrics
+
+
+def load_history(path=HISTORY_PATH):
+    try:
+        lines = Path(path).read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return []
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def find_regressions(charts, history, settings, threshold=0.2, window=5):
+    """``(chart, metric, baseline, current)`` for metrics worse than baseline by ``threshold``."""
+    comparable = [record for record in history if record['settings'] == settings.as_dict()]
+    regressions = []
+    for name, metrics in charts.items():
+        previous = [record['charts'][name] for record in comparable[-window:]
+                    if name in record['charts']]
+        if not previous:
+            continue
+        for metric, minimum in TRACKED.items():
+            baseline = statistics.median(run[metric] for run in previous)
+            current = metrics[metric]
+            if current > baseline * (1 + threshold) and current - baseline > minimum:
+                regressions.append((name, metric, baseline, current))
+    return regressions
+
+
+def _format(metric, value):
+    if metric in ('max_rss', 'output_bytes'):
+        return f'{value / 1e6:.1f}MB'
+    return f'{value:.2f}s'
+
+
+def run_benchmark(charts, settings, repeat=3, threshold=0.2, history_path=HISTORY_PATH,
+                  record=True, report=print):
+    """Benchmark ``charts``, report outliers and regressions; return the regressions."""
+    warm_up()
+    results, failed = {}, []
+    for chart in charts:
+        metrics = measure(chart, settings, repeat)
+        if metrics is None:
+            failed.append(chart.name)
+        else:
+            results[chart.name] = metrics
+
+    report(f"{'chart':40s} {'wall':>7s} {'cpu':>7s} {'rss':>8s} {'artists':>8s} {'outputs':>8s}")
+    for name, metrics in sorted(results.items(), key=lambda item: -item[1]['wall']):
+        report(f"{name:40s} {metrics['wall']:6.2f}s {metrics['cpu']:6.2f}s "
+               f"{metrics['max_rss'] / 1e6:6.0f}MB {metrics['artists']:8.0f} "
+               f"{metrics['output_bytes'] / 1e3:6.0f}kB")
+    if failed:
+        report(f"Failed: {', '.join(failed)}")
+
+    history = load_history(history_path)
+    regressions = find_regressions(results, history, settings, threshold)
+    for name, metric, baseline, current in regressions:
+        report(f'REGRESSION {name}: {metric} {_format(metric, baseline)} -> '
+               f'{_format(metric, current)}')
+    if not regressions and history:
+        report(f'No regressions above {threshold:.0%}')
+
+    if record:
+        entry = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': repeat,
+                 'settings': settings.as_dict(), 'versions': stack_versions(),
+                 'charts': results}
+        Path(history_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(history_path, 'a', encoding='utf-8') as handle:
+            handle.write(json.dumps(entry) + '\n')
+    return regressions
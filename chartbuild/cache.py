@@ -0,0 +1,135 @@
+"""
+Content-addressed render cache.
+
+A chart's outputs are stored under a key derived from its source files, the
+versions of the rendering stack and the render settings. When none of those
+change, a build restores the stored PDF/PNG files instead of running the
+script again.
+
+The cache lives in ``.chartcache/`` at the repository root unless the
+``CHARTBUILD_CACHE`` environment variable points elsewhere.
+"""
+
+import hashlib
+import json
+import os
+import platform
+import shutil
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+
+from .discovery import CACHE_DIR
+from .profiles import output_directory
+from .registry import local_modules, parse_script
+from .settings import RenderSettings
+
+# Distributions whose version changes how a chart renders.
+RENDER_STACK = ('matplotlib', 'numpy', 'scipy', 'scikit-learn', 'pandas', 'pillow', 'fonttools')
+
+MANIFEST = 'manifest.json'
+
+
+def stack_versions():
+    """Installed versions of the rendering stack (``None`` when absent)."""
+    versions = {'python': platform.python_version()}
+    for dist in RENDER_STACK:
+        try:
+            versions[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            versions[dist] = None
+    return versions
+
+
+def source_files(chart):
+    """Files whose content determines the chart's outputs.
+
+    That is every script in the chart directory plus the repository modules
+    the chart script imports (e.g. ``chartbuild.profiles``), directly or
+    through other repository modules, with their packages' ``__init__.py``.
+    """
+    shared = local_modules(parse_script(chart.script)['imports'], root=chart.directory.parent)
+    return sorted(chart.directory.glob('*.py')) + shared
+
+
+def cache_key(chart, settings=RenderSettings()):
+    """Hash of the chart sources, rendering stack and render settings."""
+    digest = hashlib.sha256()
+    for path in source_files(chart):
+        digest.update(path.relative_to(chart.directory.parent).as_posix().encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    digest.update(json.dumps(stack_versions(), sort_keys=True).encode())
+    digest.update(json.dumps(settings.as_dict(), sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters reported at the end of a build."""
+
+    hits: int = 0
+    misses: int = 0
+    bytes_restored: int = 0
+    seconds_saved: float = 0.0
+
+    def summary(self):
+        total = self.hits + self.misses
+        return (f'Cache: {self.hits}/{total} hits, {self.misses} misses, '
+                f'{self.bytes_restored / 1e6:.1f} MB restored, '
+                f'{self.seconds_saved:.1f}s of rendering skipped')
+
+
+class RenderCache:
+    """Stores and restores chart outputs keyed by :func:`cache_key`."""
+
+    def __init__(self, root=CACHE_DIR, settings=RenderSettings()):
+        self.root = Path(root)
+        self.settings = settings
+        self.stats = CacheStats()
+
+    def _entry(self, key):
+        return self.root / key[:2] / key
+
+    def restore(self, chart):
+        """Copy cached outputs into the chart directory; return the manifest or ``None``."""
+        entry = self._entry(cache_key(chart, self.settings))
+        try:
+            manifest = json.loads((entry / MANIFEST).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.stats.misses += 1
+            return None
+        target = output_directory(chart, self.settings.render_profile)
+        target.mkdir(parents=True, exist_ok=True)
+        for name in manifest['outputs']:
+            shutil.copyfile(entry / name, target / name)
+            self.stats.bytes_restored += (entry / name).stat().st_size
+        self.stats.hits += 1
+        self.stats.seconds_saved += manifest.get('seconds', 0.0)
+        return manifest
+
+    def store(self, chart, outputs, seconds):
+        """Save freshly rendered ``outputs`` (file names in the output directory)."""
+        source = output_directory(chart, self.settings.render_profile)
+        key = cache_key(chart, self.settings)
+        entry = self._entry(key)
+        staging = entry.with_name(f'{key}.tmp{os.getpid()}')
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for name in outputs:
+            shutil.copyfile(source / name, staging / name)
+        manifest = {'chart': chart.name, 'outputs': sorted(outputs), 'seconds': seconds}
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(staging, entry)
+
+    def clear(self):
+        """Delete every cached entry."""
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def size(self):
+        """Number of entries and total bytes on disk."""
+        entries, total = 0, 0
+        for manifest in self.root.glob(f'*/*/{MANIFEST}'):
+            entries += 1
+            total += sum(path.stat().st_size for path in manifest.parent.iterdir())
+        return entries, total
@@ -0,0 +1,92 @@
+"""
+Chart discovery.
+
+A chart directory is any top-level directory with a ``metainfo.txt``. Its
+script is the ``*.py`` file that defines ``CHART_METADATA``; directories with
+helper scripts (e.g. ``01_biological_neuron/generate_chart_improved.py``) are
+resolved to the script carrying the metadata.
+"""
+
+import fnmatch
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+# Build state (render cache, manifests, registry); CHARTBUILD_CACHE overrides.
+CACHE_DIR = Path(os.environ.get('CHARTBUILD_CACHE', REPO_ROOT / '.chartcache'))
+
+_NUMBERED = re.compile(r'^(\d+)_')
+
+
+@dataclass(frozen=True)
+class Chart:
+    """One chart directory and the script that renders it."""
+
+    name: str
+    directory: Path
+    script: Path
+    metainfo: dict = field(default_factory=dict, compare=False, hash=False)
+
+    @property
+    def outputs(self):
+        """Output files declared in ``metainfo.txt`` (QR codes excluded)."""
+        declared = self.metainfo.get('Output', '')
+        names = [part.strip() for part in declared.split(',')]
+        return [name for name in names if name and name != 'qr_code.png']
+
+    @property
+    def sort_key(self):
+        """Numbered modules (``01_`` .. ``20_``) first, then topic charts."""
+        match = _NUMBERED.match(self.name)
+        if match:
+            return (0, int(match.group(1)), self.name)
+        return (1, 0, self.name)
+
+
+def parse_metainfo(path):
+    """Parse the ``Key: value`` lines of a ``metainfo.txt`` file."""
+    info = {}
+    for line in Path(path).read_text(encoding='utf-8').splitlines():
+        key, sep, value = line.partition(':')
+        if sep and key.strip():
+            info[key.strip()] = value.strip()
+    return info
+
+
+def _find_script(directory):
+    scripts = sorted(directory.glob('*.py'))
+    for script in scripts:
+        if 'CHART_METADATA' in script.read_text(encoding='utf-8'):
+            return script
+    named = directory / f'{directory.name}.py'
+    if named.exists():
+        return named
+    return scripts[0] if len(scripts) == 1 else None
+
+
+def discover_charts(root=REPO_ROOT):
+    """Return every chart under ``root`` in deck order."""
+    root = Path(root)
+    charts = []
+    for metainfo in root.glob('*/metainfo.txt'):
+        directory = metainfo.parent
+        script = _find_script(directory)
+        if script is None:
+            continue
+        charts.append(Chart(directory.name, directory, script, parse_metainfo(metainfo)))
+    return sorted(charts, key=lambda chart: chart.sort_key)
+
+
+def select_charts(charts, patterns):
+    """Filter charts by directory name, accepting shell-style wildcards."""
+    if not patterns:
+        return list(charts)
+    selected = [chart for chart in charts
+                if any(fnmatch.fnmatchcase(chart.name, pattern) for pattern in patterns)]
+    unknown = [pattern for pattern in patterns
+               if not any(fnmatch.fnmatchcase(chart.name, pattern) for chart in charts)]
+    if unknown:
+        raise ValueError(f"No chart matches: {', '.join(unknown)}")
+    return selected
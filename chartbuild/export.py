@@ -0,0 +1,144 @@
+"""
+Single-draw export of one figure to several formats.
+
+About half of the chart scripts save the same figure twice at dpi=300, once
+as PDF and once as PNG, each with ``bbox_inches='tight'``. Every such call
+first lays the figure out in a measuring draw to find its tight bounding box
+and then draws it again for the output. :class:`Exporter` collects
+consecutive ``savefig`` calls for a figure, measures the box once and hands
+it to every format, so each output costs exactly one draw.
+
+Cropping the PNG out of a single full-figure Agg draw is not used: most
+charts place suptitles or labels outside the figure area (``y=1.02``), where
+a plain draw has no pixels.
+
+Requests the fast path does not understand (file objects, extra keyword
+arguments, other formats) are passed to ``savefig`` unchanged.
+"""
+
+import os
+import time
+from pathlib import Path
+
+# savefig keywords the single-draw path reproduces exactly.
+_SUPPORTED = {'format', 'dpi', 'bbox_inches', 'metadata'}
+
+
+def output_format(fname, kwargs):
+    """The format ``savefig`` will write, following matplotlib's own precedence."""
+    import matplotlib
+
+    fmt = kwargs.get('format')
+    if fmt is None and isinstance(fname, (str, os.PathLike)):
+        fmt = Path(fname).suffix[1:] or None
+    return (fmt or matplotlib.rcParams['savefig.format']).lower()
+
+
+class Exporter:
+    """Queues ``savefig`` requests per figure and writes them from one layout pass.
+
+    ``savefig`` is the unwrapped :meth:`Figure.savefig` that does the actual
+    writing. With ``png=False`` PNG requests are dropped, for builds that only
+    need the PDFs.
+    """
+
+    def __init__(self, savefig, png=True):
+        self._savefig = savefig
+        self._png = png
+        self._figure = None
+        self._pending = []
+
+    def request(self, figure, fname, kwargs):
+        """Queue one ``savefig`` call, or run it at once if it cannot be batched."""
+        fmt = output_format(fname, kwargs)
+        if fmt == 'png' and not self._png:
+            return
+        if not isinstance(fname, (str, os.PathLike)) or set(kwargs) - _SUPPORTED:
+            self.flush()
+            self._savefig(figure, fname, **kwargs)
+            return
+        if figure is self._figure and any(os.fspath(fname) == os.fspath(queued)
+                                          for queued, _, _ in self._pending):
+            return  # e.g. a PDF and a PNG both mapped to one draft PNG
+        if figure is not self._figure or any(fmt == queued for _, _, queued in self._pending):
+            self.flush()
+        self._figure = figure
+        self._pending.append((fname, kwargs, fmt))
+
+    def flush(self):
+        """Write every queued request for the current figure."""
+        figure, pending = self._figure, self._pending
+        self._figure, self._pending = None, []
+        if not pending:
+            return
+        if len(pending) == 1:
+            fname, kwargs, _ = pending[0]
+            self._savefig(figure, fname, **kwargs)
+            return
+        _export(figure, pending, self._savefig)
+
+
+def _dpi(kwargs):
+    import matplotlib
+
+    dpi = kwargs.get('dpi', matplotlib.rcParams['savefig.dpi'])
+    return None if dpi == 'figure' else float(dpi)
+
+
+def tight_bbox(figure, dpi=None):
+    """Measure the padded tight bounding box (inches) with a draw that renders nothing."""
+    import matplotlib
+
+    original_dpi = figure.dpi
+    if dpi is not None:
+        figure.dpi = dpi
+    try:
+        figure.draw_without_rendering()
+        bbox = figure.get_tightbbox(figure.canvas.get_renderer())
+    finally:
+        figure.dpi = original_dpi
+    return bbox.padded(matplotlib.rcParams['savefig.pad_inches'])
+
+
+def _export(figure, pending, savefig):
+    if not all(kwargs.get('bbox_inches') == 'tight' for _, kwargs, _ in pending):
+        for fname, kwargs, _ in pending:
+            savefig(figure, fname, **kwargs)
+        return
+    # Measure at the raster resolution so the PNG matches a plain tight save.
+    raster_dpis = [_dpi(kwargs) for _, kwargs, fmt in pending if fmt == 'png']
+    bbox = tight_bbox(figure, max(filter(None, raster_dpis), default=None))
+    for fname, kwargs, _ in pending:
+        savefig(figure, fname, **dict(kwargs, bbox_inches=bbox))
+
+
+def export_benchmark(charts, repeat=3, report=print):
+    """Time each chart with separate saves, single-draw export and PDF only."""
+    from .settings import RenderSettings
+    from .worker import render_isolated, warm_up
+
+    warm_up()
+    modes = {
+        'separate': RenderSettings(single_draw=False),
+        'single': RenderSettings(single_draw=True),
+        'pdf-only': RenderSettings(single_draw=True, png=False),
+    }
+    report(f"{'chart':40s} " + ' '.join(f'{mode:>9s}' for mode in modes) + f" {'saved':>8s}")
+    totals = dict.fromkeys(modes, 0.0)
+    for chart in charts:
+        timings = {}
+        for mode, settings in modes.items():
+            elapsed = 0.0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                render_isolated(chart, settings)
+                elapsed += time.perf_counter() - start
+            timings[mode] = elapsed / repeat
+            totals[mode] += timings[mode]
+        saved = timings['separate'] - timings['single']
+        report(f'{chart.name:40s} '
+               + ' '.join(f'{timings[mode]:8.2f}s' for mode in modes) + f' {saved:7.2f}s')
+    saved = totals['separate'] - totals['single']
+    report(f"{'total':40s} " + ' '.join(f'{totals[mode]:8.2f}s' for mode in modes)
+           + f' {saved:7.2f}s')
+    return totals
@@ -0,0 +1,271 @@
+"""
+Static HTML gallery of every chart.
+
+``gallery/index.html`` shows one card per chart from the registry: title,
+description, keywords, creation date and author, a thumbnail and links to
+the chart's PDF/PNG outputs and its GitHub page. Everything is relative
+files, so the page opens straight from the file system (``file://``); the
+search data is a ``<script>`` rather than JSON, which browsers refuse to
+fetch from disk.
+
+Thumbnails come from :mod:`chartbuild.assets` and are lazy-loaded with
+their size set up front, so the page lays out at once and only fetches the
+images scrolled into view.
+
+Search is instant because nothing is scanned at query time: ``index.js``
+holds a prebuilt inverted index from every word of the titles, keywords and
+chart names to the charts containing it, with the words sorted so that a
+prefix ("grad") is a binary search followed by a short scan. Query words
+are intersected.
+
+The build is incremental. A manifest keeps each chart's card and index
+words keyed by a hash of its script, ``metainfo.txt``, output names and
+thumbnail; unchanged charts are not parsed again, and files whose content
+did not change are not rewritten.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+import struct
+import time
+from pathlib import Path
+
+from .assets import THUMBNAIL_DIR, generate_assets, thumbnail_path
+from .discovery import CACHE_DIR
+from .pngopt import rendered_outputs
+from .registry import chart_entry
+
+GALLERY_DIR = THUMBNAIL_DIR.parent
+MANIFEST_PATH = CACHE_DIR / 'gallery.json'
+
+_WORD = re.compile(r'[a-z0-9]+')
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Neural network course charts</title>
+<style>
+body {{ font-family: system-ui, sans-serif; margin: 0; background: #f5f5f5; color: #222; }}
+header {{ position: sticky; top: 0; background: #fff; padding: 12px 24px;
+         box-shadow: 0 1px 4px rgba(0, 0, 0, .15); display: flex; gap: 16px; align-items: center; }}
+header h1 {{ font-size: 20px; margin: 0; }}
+#search {{ flex: 1; max-width: 480px; font-size: 16px; padding: 6px 10px; }}
+main {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(340px, 1fr));
+       gap: 16px; padding: 24px; }}
+.card {{ background: #fff; border-radius: 6px; padding: 10px;
+         box-shadow: 0 1px 3px rgba(0, 0, 0, .1); }}
+.card[hidden] {{ display: none; }}
+.card img {{ width: 100%; height: auto; display: block; }}
+.card .placeholder {{ aspect-ratio: 2; background: #eee; }}
+.card h2 {{ font-size: 16px; margin: 8px 0 4px; }}
+.card p {{ font-size: 13px; margin: 4px 0; }}
+.meta {{ color: #777; }}
+.tags {{ list-style: none; padding: 0; margin: 6px 0; display: flex; flex-wrap: wrap; gap: 4px; }}
+.tags button {{ font-size: 12px; border: 0; border-radius: 10px; padding: 2px 8px;
+               background: #e3ecf7; cursor: pointer; }}
+.links a {{ margin-right: 10px; }}
+</style>
+</head>
+<body>
+<header>
+<h1>Neural network course charts</h1>
+<input id="search" type="search" placeholder="Search titles and keywords" autofocus>
+<span id="count">{count} charts</span>
+</header>
+<main>
+{cards}
+</main>
+<script src="index.js"></script>
+<script src="search.js"></script>
+</body>
+</html>
+"""
+
+_SEARCH_JS = """// Prefix search over the inverted index in index.js (window.GALLERY).
+(function () {
+  var data = window.GALLERY, words = data.words, postings = data.postings;
+  var cards = data.charts.map(function (name) { return document.getElementById('chart-' + name); });
+  var input = document.getElementById('search'), count = document.getElementById('count');
+
+  function lowerBound(prefix) {
+    var lo = 0, hi = words.length;
+    while (lo < hi) {
+      var mid = (lo + hi) >> 1;
+      if (words[mid] < prefix) { lo = mid + 1; } else { hi = mid; }
+    }
+    return lo;
+  }
+
+  function matches(prefix) {
+    var found = new Set();
+    for (var i = lowerBound(prefix); i < words.length && words[i].startsWith(prefix); i++) {
+      postings[i].forEach(function (chart) { found.add(chart); });
+    }
+    return found;
+  }
+
+  function search() {
+    var terms = input.value.toLowerCase().match(/[a-z0-9]+/g) || [];
+    var result = null;
+    terms.forEach(function (term) {
+      var found = matches(term);
+      result = result === null ? found
+        : new Set([...result].filter(function (chart) { return found.has(chart); }));
+    });
+    var shown = 0;
+    cards.forEach(function (card, chart) {
+      var visible = result === null || result.has(chart);
+      card.hidden = !visible;
+      shown += visible;
+    });
+    count.textContent = shown + (result === null ? ' charts' : ' of ' + cards.length + ' charts');
+  }
+
+  input.addEventListener('input', search);
+  document.querySelector('main').addEventListener('click', function (event) {
+    if (event.target.matches('.tags button')) {
+      input.value = event.target.textContent;
+      search();
+    }
+  });
+  if (input.value) { search(); }
+})();
+"""
+
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+def _png_size(path):
+    """``(width, height)`` from a PNG header, or ``None`` when the file is missing."""
+    try:
+        with open(path, 'rb') as png:
+            header = png.read(24)
+    except OSError:
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def _link(path, output):
+    return html.escape(Path(os.path.relpath(path, output)).as_posix(), quote=True)
+
+
+def _card(entry, chart, outputs, size, output):
+    """One chart's ``<article>``."""
+    esc = html.escape
+    documents = [name for name in outputs if name.endswith('.pdf')] or outputs
+    target = _link(chart.directory / documents[0], output) if documents else None
+    if size is not None:
+        image = (f'<img loading="lazy" decoding="async" '
+                 f'src="{_link(thumbnail_path(chart, output / "thumbnails"), output)}" '
+                 f'width="{size[0]}" height="{size[1]}" alt="{esc(entry["title"])}">')
+    else:
+        image = '<div class="placeholder"></div>'
+    if target:
+        image = f'<a href="{target}">{image}</a>'
+    meta = ' · '.join(esc(value) for value in (entry['created'], entry['author']) if value)
+    tags = ''.join(f'<li><button type="button">{esc(keyword)}</button></li>'
+                   for keyword in entry['keywords'])
+    links = [f'<a href="{_link(chart.directory / name, output)}">'
+             f'{esc(Path(name).suffix[1:].upper())}</a>' for name in outputs]
+    if entry['url']:
+        links.append(f'<a href="{esc(entry["url"], quote=True)}">GitHub</a>')
+    parts = [
+        f'<article class="card" id="chart-{esc(chart.name, quote=True)}">',
+        image,
+        f'<h2>{esc(entry["title"])}</h2>',
+        f'<p>{esc(entry["description"])}</p>',
+        f'<p class="meta">{meta}</p>' if meta else '',
+        f'<ul class="tags">{tags}</ul>' if tags else '',
+        f'<p class="links">{" ".join(links)}</p>',
+        '</article>',
+    ]
+    return '\n'.join(part for part in parts if part)
+
+
+def _words(entry):
+    text = ' '.join([entry['title'], entry['name'].replace('_', ' '), *entry['keywords']])
+    return sorted(set(_WORD.findall(text.lower())))
+
+
+def _inverted_index(charts, words):
+    """Sorted words and, for each, the positions of the charts containing it."""
+    postings = {}
+    for position, chart in enumerate(charts):
+        for word in words[chart.name]:
+            postings.setdefault(word, []).append(position)
+    ordered = sorted(postings)
+    return ordered, [postings[word] for word in ordered]
+
+
+def _write_if_changed(path, text):
+    path = Path(path)
+    try:
+        if path.read_text(encoding='utf-8') == text:
+            return False
+    except OSError:
+        pass
+    path.write_text(text, encoding='utf-8')
+    return True
+
+
+def _load_manifest(path):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def build_gallery(charts, output=GALLERY_DIR, thumbnails=True, jobs=None,
+                  manifest_path=MANIFEST_PATH, report=print):
+    """Write the gallery for ``charts`` (in deck order) to ``output``; return the page path."""
+    start = time.perf_counter()
+    output = Path(output).resolve()
+    output.mkdir(parents=True, exist_ok=True)
+    if thumbnails:
+        try:
+            generate_assets(charts, jobs=jobs, qr=False, directory=output / 'thumbnails',
+                            report=report)
+        except RuntimeError as exc:  # the page still works, with placeholders
+            report(f'No thumbnails: {exc}')
+    manifest = _load_manifest(manifest_path)
+    cards, words, rebuilt = [], {}, 0
+    for chart in charts:
+        outputs = rendered_outputs(chart.directory)
+        size = _png_size(thumbnail_path(chart, output / 'thumbnails'))
+        metainfo = chart.directory / 'metainfo.txt'
+        key = _digest(chart.script.read_bytes(),
+                      metainfo.read_bytes() if metainfo.exists() else b'',
+                      json.dumps([str(output), outputs, size]).encode())
+        record = manifest.get(chart.name)
+        if record is None or record['key'] != key:
+            entry = chart_entry(chart)
+            record = {'key': key, 'card': _card(entry, chart, outputs, size, output),
+                      'words': _words(entry)}
+            rebuilt += 1
+        manifest[chart.name] = record
+        cards.append(record['card'])
+        words[chart.name] = record['words']
+    ordered, postings = _inverted_index(charts, words)
+    data = {'charts': [chart.name for chart in charts], 'words': ordered, 'postings': postings}
+    written = [name for name, text in (
+        ('index.html', _PAGE.format(count=len(charts), cards='\n'.join(cards))),
+        ('index.js', f'window.GALLERY = {json.dumps(data, separators=(",", ":"))};\n'),
+        ('search.js', _SEARCH_JS),
+    ) if _write_if_changed(output / name, text)]
+    manifest_path = Path(manifest_path)
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest), encoding='utf-8')
+    report(f'Gallery: {len(charts)} charts, {rebuilt} cards rebuilt, '
+           f"{', '.join(written) or 'no files'} written to {output} "
+           f'({time.perf_counter() - start:.2f}s)')
+    return output / 'index.html'
@@ -0,0 +1,130 @@
+"""
+Hooks applied around a chart script while it renders.
+
+The chart scripts call ``plt.savefig`` directly, so build-wide behaviour is
+added by temporarily wrapping :meth:`matplotlib.figure.Figure.savefig` rather
+than by editing 126 scripts.
+"""
+
+import contextlib
+import os
+import random
+from pathlib import Path
+
+from .export import Exporter, output_format
+from .profiles import PROFILE_ENV, REPRODUCIBLE_ENV
+from .rasterize import VECTOR_FORMATS, rasterize_heavy_artists
+
+# Metadata that would otherwise embed timestamps or tool versions.
+REPRODUCIBLE_METADATA = {
+    'pdf': {'Creator': None, 'Producer': None, 'CreationDate': None, 'ModDate': None},
+    'png': {'Software': None},
+}
+REPRODUCIBLE_SEED = 0
+SOURCE_DATE_EPOCH = '0'
+
+
+def _reproducible_kwargs(fname, kwargs):
+    fmt = output_format(fname, kwargs)
+    if fmt in REPRODUCIBLE_METADATA:
+        metadata = dict(REPRODUCIBLE_METADATA[fmt])
+        metadata.update(kwargs.get('metadata') or {})
+        kwargs = dict(kwargs, metadata=metadata)
+    return kwargs
+
+
+def _profile_target(profile, output_dir, fname, kwargs):
+    """Apply the profile's dpi, formats and output directory to one savefig call."""
+    if profile.dpi is not None:
+        kwargs = dict(kwargs, dpi=profile.dpi)
+    if not isinstance(fname, (str, os.PathLike)):
+        return fname, kwargs
+    path = Path(fname)
+    fmt = output_format(fname, kwargs)
+    if fmt not in profile.formats:
+        fmt = profile.formats[0]
+        path = path.with_suffix(f'.{fmt}')
+        kwargs = dict(kwargs, format=fmt)
+    if profile.preview:
+        path = Path(output_dir) / path.name
+    return path, kwargs
+
+
+@contextlib.contextmanager
+def _environ(**values):
+    saved = {name: os.environ.get(name) for name in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextlib.contextmanager
+def render_hooks(settings, output_dir, timer=None):
+    """Apply ``settings`` to every figure saved inside the block.
+
+    ``output_dir`` receives the outputs of profiles that do not write into
+    the chart directory. The block receives a dict of render statistics
+    (``artists``: artists in the saved figures), filled in as figures are saved.
+    With a :class:`~chartbuild.profiling.PhaseTimer`, the deferred exports
+    written on ``plt.close`` and at the end are timed as its ``save`` phase.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from matplotlib.figure import Figure
+
+    profile = settings.render_profile
+    original_savefig = Figure.savefig
+    original_close = plt.close
+    exporter = Exporter(original_savefig, png=settings.png)
+    stats = {'artists': 0}
+    counted = set()
+
+    def savefig(self, fname, **kwargs):
+        if id(self) not in counted:
+            counted.add(id(self))
+            stats['artists'] += len(self.findobj())
+        fname, kwargs = _profile_target(profile, output_dir, fname, kwargs)
+        if settings.reproducible:
+            kwargs = _reproducible_kwargs(fname, kwargs)
+        if settings.rasterize and output_format(fname, kwargs) in VECTOR_FORMATS:
+            rasterize_heavy_artists(self, settings.raster_threshold)
+            if settings.raster_dpi is not None:
+                kwargs = dict(kwargs, dpi=settings.raster_dpi)
+        if settings.single_draw:
+            exporter.request(self, fname, kwargs)
+        elif settings.png or output_format(fname, kwargs) != 'png':
+            original_savefig(self, fname, **kwargs)
+
+    def flush():
+        if timer is None:
+            exporter.flush()
+            return
+        with timer.phase('save'):
+            exporter.flush()
+
+    def close(fig=None):
+        flush()
+        return original_close(fig)
+
+    environ = {PROFILE_ENV: profile.name, REPRODUCIBLE_ENV: str(int(settings.reproducible))}
+    if settings.reproducible:
+        environ['SOURCE_DATE_EPOCH'] = SOURCE_DATE_EPOCH
+        matplotlib.rcParams['svg.hashsalt'] = 'chartbuild'
+        random.seed(REPRODUCIBLE_SEED)
+        np.random.seed(REPRODUCIBLE_SEED)
+    Figure.savefig = savefig
+    plt.close = close
+    try:
+        with _environ(**environ):
+            yield stats
+            flush()
+    finally:
+        Figure.savefig = original_savefig
+        plt.close = original_close
@@ -0,0 +1,231 @@
+"""
+Persistent mathtext layout cache.
+
+Parsing and laying out a mathtext string such as
+``r'$\\sigma(z) = \\frac{1}{1+e^{-z}}$'`` takes milliseconds, and matplotlib
+only remembers the last 50 layouts of the current process. Every chart runs
+in a fresh fork of a warm worker, so the same labels are laid out again by
+every chart, at every dpi, in every build.
+
+:class:`MathtextCache` wraps ``MathTextParser._parse_cached`` (which every
+backend goes through) and keeps its results on disk, keyed by the output
+type, the string, the dpi, the font properties, the ``font.*`` and
+``mathtext.*`` rcParams and the matplotlib version. Vector layouts (PDF,
+SVG) are stored as metrics, glyph positions and rules; glyph fonts are
+stored by file name and reopened through matplotlib's font cache, so a
+cached layout draws exactly like a fresh one. Raster layouts (Agg, hence
+PNG) are stored as their metrics and the rendered 8-bit glyph image.
+
+``_parse_cached`` is private matplotlib API. If it or the parse result
+types are missing, :meth:`MathtextCache.install` leaves matplotlib alone
+and every layout is made as usual.
+
+Render children write their new layouts to ``pending/`` one file per entry
+(no locking between parallel workers; a miss also looks there, so workers
+share layouts within a build). :meth:`MathtextCache.compact` merges them
+into ``index.pickle`` at the end of a build, and warm workers load that index
+once before forking. The cache lives in ``mathtext/`` inside the render
+cache directory and is cleared with it.
+"""
+
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .discovery import CACHE_DIR
+
+MATHTEXT_DIR = CACHE_DIR / 'mathtext'
+INDEX = 'index.pickle'
+PENDING = 'pending'
+
+
+@dataclass
+class MathtextStats:
+    """Layout lookups served from the cache and laid out afresh."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def __add__(self, other):
+        return MathtextStats(self.hits + other.hits, self.misses + other.misses)
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        return f'Mathtext cache: {self.hits}/{total} layouts reused ({rate:.0%})'
+
+
+def _key(output_type, s, dpi, prop, antialiased, load_glyph_flags):
+    import matplotlib
+    from matplotlib.font_manager import FontProperties
+
+    prop = prop if prop is not None else FontProperties()
+    rc = matplotlib.rcParams
+    fonts = tuple((name, repr(rc[name])) for name in sorted(rc)
+                  if name.startswith(('font.', 'mathtext.')))
+    key = (matplotlib.__version__, output_type, s, float(dpi), bool(antialiased), str(load_glyph_flags),
+           tuple(prop.get_family()), prop.get_style(), prop.get_variant(),
+           str(prop.get_weight()), str(prop.get_stretch()), prop.get_size_in_points(),
+           prop.get_math_fontfamily(), prop.get_file(), fonts)
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+def _serialise(output_type, parse):
+    if output_type == 'raster':
+        ox, oy, width, height, depth, image = parse
+        return ox, oy, width, height, depth, np.array(image, copy=True)
+    glyphs = []
+    for font, *rest in parse.glyphs:
+        if getattr(font, 'face_index', 0):
+            return None  # faces of font collections cannot be reopened by file name alone
+        glyphs.append((font.fname, *rest))
+    return parse.width, parse.height, parse.depth, glyphs, list(parse.rects)
+
+
+def _restore(output_type, entry):
+    from matplotlib.font_manager import get_font
+    from matplotlib.mathtext import RasterParse, VectorParse
+
+    if output_type == 'raster':
+        return RasterParse(*entry)
+    width, height, depth, glyphs, rects = entry
+    return VectorParse(width, height, depth,
+                       [(get_font(fname), *rest) for fname, *rest in glyphs], rects)
+
+
+def _supported():
+    """Whether this matplotlib has the private parser hook the cache wraps."""
+    from matplotlib import mathtext
+
+    parser = getattr(mathtext, 'MathTextParser', None)
+    return (callable(getattr(parser, '_parse_cached', None))
+            and hasattr(mathtext, 'VectorParse') and hasattr(mathtext, 'RasterParse'))
+
+
+def _write_atomic(path, data):
+    staging = path.with_name(f'{path.name}.tmp{os.getpid()}')
+    staging.write_bytes(data)
+    os.replace(staging, path)
+
+
+class MathtextCache:
+    """On-disk store of mathtext layouts, installed into matplotlib's parser."""
+
+    def __init__(self, root=MATHTEXT_DIR):
+        self.root = Path(root)
+        self.stats = MathtextStats()
+        self.enabled = True
+        self._entries = {}
+        self._new = {}
+        self._restored = {}
+        self._made = set()
+        self._original = None
+
+    def load(self):
+        """Read the merged index; return the number of layouts available."""
+        try:
+            self._entries = pickle.loads((self.root / INDEX).read_bytes())
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self._entries = {}
+        return len(self._entries)
+
+    def _lookup(self, digest):
+        entry = self._entries.get(digest)
+        if entry is None:
+            try:
+                entry = pickle.loads((self.root / PENDING / digest).read_bytes())
+            except (OSError, pickle.UnpicklingError, EOFError):
+                return None
+            self._entries[digest] = entry
+        return entry
+
+    def install(self):
+        """Route matplotlib's mathtext layouts through the cache.
+
+        Returns whether the cache is installed; it is not when matplotlib's
+        private parser hook has changed.
+        """
+        if self._original is not None:
+            return True
+        if not _supported():
+            return False
+        from matplotlib.mathtext import MathTextParser
+
+        original = self._original = MathTextParser._parse_cached
+        cache = self
+
+        def _parse_cached(parser, s, dpi, prop, antialiased, load_glyph_flags):
+            output_type = getattr(parser, '_output_type', None)
+            if not cache.enabled or output_type not in ('vector', 'raster'):
+                return original(parser, s, dpi, prop, antialiased, load_glyph_flags)
+            digest = _key(output_type, s, dpi, prop, antialiased, load_glyph_flags)
+            parse = cache._restored.get(digest)
+            if parse is not None:
+                if digest not in cache._made:  # repeats of our own layouts are not reuse
+                    cache.stats.hits += 1
+                return parse
+            entry = cache._lookup(digest)
+            if entry is not None:
+                cache.stats.hits += 1
+                parse = cache._restored[digest] = _restore(output_type, entry)
+                return parse
+            cache.stats.misses += 1
+            parse = original(parser, s, dpi, prop, antialiased, load_glyph_flags)
+            entry = _serialise(output_type, parse)
+            if entry is not None:
+                cache._entries[digest] = cache._new[digest] = entry
+                cache._restored[digest] = parse
+                cache._made.add(digest)
+            return parse
+
+        MathTextParser._parse_cached = _parse_cached
+        return True
+
+    def uninstall(self):
+        from matplotlib.mathtext import MathTextParser
+
+        if self._original is not None:
+            MathTextParser._parse_cached = self._original
+            self._original = None
+
+    def reset_stats(self):
+        self.stats = MathtextStats()
+
+    def flush(self):
+        """Write the layouts made since the last flush to ``pending/``."""
+        if not self._new:
+            return 0
+        pending = self.root / PENDING
+        pending.mkdir(parents=True, exist_ok=True)
+        for digest, entry in self._new.items():
+            _write_atomic(pending / digest, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        written, self._new = len(self._new), {}
+        return written
+
+    def compact(self):
+        """Merge ``pending/`` into the index; return the number of layouts added."""
+        self.load()
+        merged = []
+        for path in sorted((self.root / PENDING).glob('*')):
+            if '.tmp' in path.name:
+                continue  # still being written
+            try:
+                self._entries[path.name] = pickle.loads(path.read_bytes())
+            except (OSError, pickle.UnpicklingError, EOFError):
+                continue
+            merged.append(path)
+        if merged:
+            _write_atomic(self.root / INDEX, pickle.dumps(self._entries, pickle.HIGHEST_PROTOCOL))
+            for path in merged:
+                path.unlink(missing_ok=True)
+        return len(merged)
+
+    def size(self):
+        """Number of stored layouts and bytes on disk."""
+        paths = [self.root / INDEX, *(self.root / PENDING).glob('*')]
+        total = sum(path.stat().st_size for path in paths if path.is_file())
+        return self.load() + sum(1 for path in paths[1:] if '.tmp' not in path.name), total
@@ -0,0 +1,254 @@
+"""
+Lossless PNG optimisation and per-chart size budgets.
+
+Matplotlib writes every PNG as 8-bit RGBA with libpng's default filtering
+and compression, although the course charts are opaque. :func:`optimise_png`
+re-encodes a file with the smallest lossless representation it can prove:
+
+* the alpha channel is dropped when every pixel is opaque, and the colour
+  channels collapse to grey when they are equal everywhere;
+* images with at most 256 distinct colours (flat diagrams drawn without
+  antialiasing, QR-code style graphics) become palette images, packed to
+  1, 2 or 4 bits per pixel when the palette allows;
+* the scanlines are encoded both unfiltered and with per-row adaptive
+  filters (the filter with the smallest sum of absolute differences), and
+  each candidate is deflated at level 9; the smallest file wins.
+
+Antialiased charts compress best unfiltered, which libpng never chooses for
+truecolour images. The result is decoded and compared with the original
+pixels before it replaces the file, and it is only kept when it is smaller.
+Text and physical-size chunks (``pHYs`` carries the 300 dpi) are copied.
+
+A size budget caps the total bytes of a chart's static outputs (PDF and
+PNG); animations are left out, since a GIF or video of a whole training run
+is expected to be larger. See :func:`over_budget`.
+"""
+
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Ancillary chunks that stay valid when the pixel format changes.
+_KEPT_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'pHYs', b'gAMA', b'cHRM', b'sRGB', b'iCCP', b'tIME'}
+# Bytes a chart's outputs may take together before the build fails.
+DEFAULT_BUDGET = 2_000_000
+# Rendered files in a chart directory; the QR code is a shipped asset, not an output.
+OUTPUT_SUFFIXES = ('.pdf', '.png', '.gif', '.apng', '.mp4')
+QR_NAME = 'qr_code.png'
+# Outputs that count towards the size budget: the static figures, not animations.
+BUDGETED_SUFFIXES = ('.pdf', '.png')
+
+_GREY, _RGB, _PALETTE, _GREY_ALPHA, _RGBA = 0, 2, 3, 4, 6
+
+
+@dataclass
+class PngStats:
+    """Files re-encoded and their total size before and after."""
+
+    files: int = 0
+    before: int = 0
+    after: int = 0
+
+    def __add__(self, other):
+        return PngStats(self.files + other.files, self.before + other.before,
+                        self.after + other.after)
+
+    @property
+    def saved(self):
+        return self.before - self.after
+
+    def summary(self):
+        rate = self.saved / self.before if self.before else 0.0
+        return (f'PNG optimisation: {self.files} files, {self.before / 1e6:.1f} MB -> '
+                f'{self.after / 1e6:.1f} MB, {self.saved / 1e6:.1f} MB saved ({rate:.0%})')
+
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def _chunks(data):
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError('not a PNG file')
+    chunks, position = [], len(PNG_SIGNATURE)
+    while position < len(data):
+        length, kind = struct.unpack('>I4s', data[position:position + 8])
+        chunks.append((kind, data[position + 8:position + 8 + length]))
+        position += 12 + length
+    return chunks
+
+
+def _pack(indices, depth):
+    """Pack rows of values below ``2 ** depth`` into ``depth``-bit scanlines."""
+    if depth == 8:
+        return indices
+    per_byte = 8 // depth
+    height, width = indices.shape
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), np.uint8)
+    padded[:, :width] = indices
+    groups = padded.reshape(height, -1, per_byte)
+    shifts = np.arange(8 - depth, -1, -depth, dtype=np.uint8)
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+
+def _representations(rgba):
+    """Lossless pixel formats for ``rgba``: ``(colour type, bit depth, scanlines, bpp, chunks)``.
+
+    ``bpp`` is the filter distance in bytes; ``chunks`` are the PLTE/tRNS
+    chunks a palette image needs.
+    """
+    opaque = bool((rgba[..., 3] == 255).all())
+    pixels = rgba[..., :3] if opaque else rgba
+    height, width, _ = rgba.shape
+    if (pixels[..., 0] == pixels[..., 1]).all() and (pixels[..., 1] == pixels[..., 2]).all():
+        grey = np.ascontiguousarray(pixels[..., [0]] if opaque else pixels[..., [0, 3]])
+        yield (_GREY if opaque else _GREY_ALPHA), 8, grey.reshape(height, -1), grey.shape[2], []
+    else:
+        rows = np.ascontiguousarray(pixels).reshape(height, -1)
+        yield (_RGB if opaque else _RGBA), 8, rows, pixels.shape[2], []
+    packed = np.ascontiguousarray(rgba).view(np.uint32)[..., 0]
+    if len(np.unique(packed[::7, ::7])) > 256:  # cheap early out for antialiased charts
+        return
+    colours = np.unique(packed)
+    if len(colours) > 256:
+        return
+    palette = colours.view(np.uint8).reshape(-1, 4)
+    depth = next(bits for bits in (1, 2, 4, 8) if len(colours) <= 1 << bits)
+    chunks = [_chunk(b'PLTE', palette[:, :3].tobytes())]
+    if not opaque:
+        alpha = palette[:, 3]
+        chunks.append(_chunk(b'tRNS', alpha[:np.flatnonzero(alpha != 255).max() + 1].tobytes()))
+    indices = np.searchsorted(colours, packed).astype(np.uint8)
+    yield _PALETTE, depth, _pack(indices, depth), 1, chunks
+
+
+def _filters(rows, above, bpp):
+    """The five PNG filters (None, Sub, Up, Average, Paeth) applied to every row.
+
+    ``above`` is the scanline before ``rows`` (zeros for the first one).
+    """
+    current = rows.astype(np.int16)
+    left = np.zeros_like(current)
+    left[:, bpp:] = current[:, :-bpp]
+    up = np.concatenate([above[None].astype(np.int16), current[:-1]])
+    upper_left = np.zeros_like(current)
+    upper_left[:, bpp:] = up[:, :-bpp]
+    estimate = left + up - upper_left
+    distance_left = np.abs(estimate - left)
+    distance_up = np.abs(estimate - up)
+    distance_upper_left = np.abs(estimate - upper_left)
+    paeth = np.where((distance_left <= distance_up) & (distance_left <= distance_upper_left),
+                     left, np.where(distance_up <= distance_upper_left, up, upper_left))
+    return np.stack([rows, (current - left).astype(np.uint8), (current - up).astype(np.uint8),
+                     (current - (left + up) // 2).astype(np.uint8),
+                     (current - paeth).astype(np.uint8)])
+
+
+def _scanlines(types, rows):
+    return np.concatenate([types.astype(np.uint8)[:, None], rows], axis=1).tobytes()
+
+
+def _encode(raw, bpp, block=256):
+    """The smallest deflated scanline stream: unfiltered or per-row adaptive filters.
+
+    Adaptive picks, per row, the filter with the smallest sum of absolute
+    (signed) bytes. Rows are filtered in blocks and both candidates are
+    deflated as they go, so memory stays a few blocks wide.
+    """
+    unfiltered, adaptive = zlib.compressobj(9), zlib.compressobj(9)
+    streams = ([], [])
+    above = np.zeros(raw.shape[1], np.uint8)
+    for start in range(0, raw.shape[0], block):
+        rows = raw[start:start + block]
+        filtered = _filters(rows, above, bpp)
+        cost = np.abs(filtered.view(np.int8).astype(np.int16)).sum(axis=2, dtype=np.int64)
+        choice = cost.argmin(axis=0)
+        streams[0].append(unfiltered.compress(_scanlines(np.zeros(len(rows)), rows)))
+        streams[1].append(adaptive.compress(
+            _scanlines(choice, filtered[choice, np.arange(len(rows))])))
+        above = rows[-1]
+    streams[0].append(unfiltered.flush())
+    streams[1].append(adaptive.flush())
+    return min((b''.join(stream) for stream in streams), key=len)
+
+
+def _decode_rgba(data):
+    import io
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        return np.asarray(image.convert('RGBA'))
+
+
+def optimise_png(path):
+    """Losslessly re-encode ``path`` in place; return ``(bytes before, bytes after)``."""
+    path = Path(path)
+    original = path.read_bytes()
+    chunks = _chunks(original)
+    rgba = _decode_rgba(original)
+    height, width = rgba.shape[:2]
+    ancillary = [_chunk(name, body) for name, body in chunks if name in _KEPT_CHUNKS]
+    data = original
+    for kind, depth, raw, bpp, extra in _representations(rgba):
+        header = _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, depth, kind, 0, 0, 0))
+        candidate = b''.join([PNG_SIGNATURE, header, *ancillary, *extra,
+                              _chunk(b'IDAT', _encode(raw, bpp)), _chunk(b'IEND', b'')])
+        if len(candidate) < len(data):
+            data = candidate
+    if data is original or not np.array_equal(_decode_rgba(data), rgba):
+        return len(original), len(original)
+    staging = path.with_name(f'{path.name}.tmp{os.getpid()}')
+    staging.write_bytes(data)
+    os.replace(staging, path)
+    return len(original), len(data)
+
+
+def optimise_outputs(directory, names):
+    """Optimise the PNGs among ``names`` in ``directory``; return their :class:`PngStats`."""
+    stats = PngStats()
+    for name in names:
+        if name.lower().endswith('.png'):
+            before, after = optimise_png(Path(directory) / name)
+            stats += PngStats(1, before, after)
+    return stats
+
+
+def optimise_pngs(paths, jobs=None, report=print):
+    """Optimise ``paths`` in a process pool; return the combined :class:`PngStats`."""
+    start = time.perf_counter()
+    stats = PngStats()
+    paths = list(paths)
+    if paths:
+        jobs = min(jobs or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for path, (before, after) in zip(paths, pool.map(optimise_png, paths)):
+                stats += PngStats(1, before, after)
+                if after < before:
+                    report(f'  {before / 1e3:8.0f} kB -> {after / 1e3:8.0f} kB  {path}')
+    report(f'{stats.summary()} in {time.perf_counter() - start:.1f}s')
+    return stats
+
+
+def rendered_outputs(directory):
+    """Names of the rendered files in a chart directory."""
+    return sorted(path.name for path in Path(directory).iterdir()
+                  if path.suffix.lower() in OUTPUT_SUFFIXES and path.name != QR_NAME)
+
+
+def over_budget(directory, names, budget):
+    """Total bytes of the static outputs among ``names`` when above ``budget``, else ``None``."""
+    if not budget:
+        return None
+    total = sum((Path(directory) / name).stat().st_size for name in names
+                if Path(name).suffix.lower() in BUDGETED_SUFFIXES
+                and (Path(directory) / name).is_file())
+    return total if total > budget else None
@@ -0,0 +1,113 @@
+"""
+Render profiles.
+
+``final`` is what the course ships: every ``savefig`` call as written (PDF and
+PNG at dpi=300) into the chart directory, at full data resolution. ``draft``
+is for previews: 72 dpi PNG only, written to ``.preview/<chart>/`` so the
+final outputs are never overwritten, with coarser grids and fewer random
+samples.
+
+Output settings are applied to every chart by :mod:`chartbuild.hooks`;
+files a script writes without ``savefig`` (animations) are placed with
+:func:`output_path`. Data
+resolution needs the script's cooperation; heavy charts size their grids and
+sample counts with the helpers below, which fall back to the final values
+when a script is run on its own::
+
+    try:
+        from chartbuild.profiles import grid_points
+    except ImportError:  # run standalone: final profile
+        grid_points = lambda n: n
+
+Charts that could annotate measured timings ask :func:`reproducible`
+first; only ``--no-reproducible`` builds get the timings.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from .discovery import REPO_ROOT
+
+PROFILE_ENV = 'CHART_PROFILE'
+REPRODUCIBLE_ENV = 'CHART_REPRODUCIBLE'
+PREVIEW_DIR = REPO_ROOT / '.preview'
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Output and data-resolution settings for one kind of build."""
+
+    name: str
+    # Overrides every savefig dpi when set.
+    dpi: float = None
+    # Formats written; other requests are converted to the first one.
+    formats: tuple = ('pdf', 'png')
+    # Scale factor for grid resolution (meshgrids, contour surfaces).
+    resolution: float = 1.0
+    # Scale factor for random sample and simulation sizes.
+    samples: float = 1.0
+    # Write into PREVIEW_DIR instead of the chart directory.
+    preview: bool = False
+
+
+PROFILES = {
+    'final': Profile('final'),
+    'draft': Profile('draft', dpi=72, formats=('png',), resolution=0.25, samples=0.1,
+                     preview=True),
+}
+
+
+def get_profile(name):
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown profile {name!r}; choose from {', '.join(PROFILES)}") from None
+
+
+def active_profile():
+    """The profile of the running build (``CHART_PROFILE``, default ``final``)."""
+    return get_profile(os.environ.get(PROFILE_ENV, 'final'))
+
+
+def output_directory(chart, profile):
+    """Where ``chart`` writes its outputs under ``profile``."""
+    return PREVIEW_DIR / chart.name if profile.preview else chart.directory
+
+
+def output_path(name):
+    """Where a script writes a file it saves itself (an animation, say) rather than via savefig.
+
+    ``name`` in the chart directory in the final profile; in previews, the
+    chart's preview directory (scripts run with the chart directory as cwd).
+    """
+    profile = active_profile()
+    if not profile.preview:
+        return name
+    directory = PREVIEW_DIR / Path.cwd().name
+    directory.mkdir(parents=True, exist_ok=True)
+    return str(directory / name)
+
+
+def grid_points(n, minimum=10):
+    """Number of points per grid axis; ``n`` in the final profile."""
+    return max(minimum, round(n * active_profile().resolution))
+
+
+def grid_step(step):
+    """Mesh step size; ``step`` in the final profile, coarser in drafts."""
+    return step / active_profile().resolution
+
+
+def sample_count(n, minimum=1):
+    """Random sample or simulation size; ``n`` in the final profile."""
+    return max(minimum, round(n * active_profile().samples))
+
+
+def reproducible():
+    """Whether the build pins its outputs (``CHART_REPRODUCIBLE``, default yes).
+
+    Charts that could annotate measured times show deterministic costs
+    instead, so that repeated renders give identical bytes.
+    """
+    return os.environ.get(REPRODUCIBLE_ENV, '1') != '0'
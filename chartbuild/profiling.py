@@ -0,0 +1,170 @@
+"""
+Opt-in phase profiling of chart scripts.
+
+When enabled, :class:`PhaseTimer` wraps the matplotlib entry points the
+scripts use and attributes the time of the module body to phases:
+
+``figure``
+    ``plt.figure``/``plt.subplots`` and adding axes;
+``artists``
+    Axes and Figure methods that create artists (``plot``, ``scatter``,
+    ``text``, ``contourf``, ``add_patch``, ...);
+``layout``
+    ``tight_layout`` and ``subplots_adjust``;
+``save``
+    ``savefig``, including the deferred single-draw export;
+``compute``
+    everything else in the script body: numpy data generation, model
+    fitting and plain Python.
+
+Nested calls (``annotate`` creating a ``Text``) count once, towards the
+outermost phase. Nothing is wrapped when profiling is off, so a normal build
+pays no overhead. A cProfile dump per chart (``.prof``, readable by pstats,
+snakeviz, gprof2dot or flameprof) can be written alongside.
+"""
+
+import contextlib
+import functools
+import time
+from collections import defaultdict
+
+PHASES = ('compute', 'figure', 'artists', 'layout', 'save')
+
+_FIGURE_CALLS = {
+    'matplotlib.pyplot': ('figure', 'subplots', 'subplot', 'subplot2grid'),
+    'matplotlib.figure.Figure': ('add_subplot', 'add_axes', 'subplots', 'add_gridspec'),
+}
+_ARTIST_CALLS = {
+    'matplotlib.axes.Axes': (
+        'plot', 'scatter', 'bar', 'barh', 'hist', 'fill', 'fill_between', 'fill_betweenx',
+        'text', 'annotate', 'arrow', 'axhline', 'axvline', 'axhspan', 'axvspan', 'hlines',
+        'vlines', 'contour', 'contourf', 'imshow', 'pcolormesh', 'errorbar', 'step', 'stem',
+        'pie', 'legend', 'semilogx', 'semilogy', 'loglog', 'boxplot', 'violinplot', 'quiver',
+        'table', 'add_patch', 'add_artist', 'add_collection', 'add_line'),
+    'matplotlib.figure.Figure': ('text', 'suptitle', 'legend', 'colorbar', 'add_artist'),
+    'mpl_toolkits.mplot3d.axes3d.Axes3D': (
+        'plot_surface', 'plot_wireframe', 'plot_trisurf', 'contour', 'contourf', 'scatter',
+        'plot', 'bar3d', 'text'),
+}
+_LAYOUT_CALLS = {
+    'matplotlib.figure.Figure': ('tight_layout', 'subplots_adjust'),
+}
+# Installed inside chartbuild.hooks, so this wraps the build's savefig hook.
+_SAVE_CALLS = {
+    'matplotlib.figure.Figure': ('savefig',),
+}
+
+
+def _resolve(dotted):
+    import importlib
+
+    module, _, attribute = dotted.rpartition('.')
+    try:
+        owner = importlib.import_module(dotted)
+    except ImportError:
+        owner = getattr(importlib.import_module(module), attribute)
+    return owner
+
+
+class PhaseTimer:
+    """Accumulates wall time per phase while installed."""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self._active = False
+        self._restore = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if self._active:  # nested call: already attributed to the outer phase
+            yield
+            return
+        self._active = True
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] += time.perf_counter() - start
+            self._active = False
+
+    def _wrap(self, owner, attribute, phase):
+        original = getattr(owner, attribute, None)
+        if original is None:
+            return
+        # Inherited methods (Axes.add_patch lives on _AxesBase) are shadowed, then removed.
+        own = attribute in vars(owner)
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            with self.phase(phase):
+                return original(*args, **kwargs)
+
+        setattr(owner, attribute, timed)
+        self._restore.append((owner, attribute, original if own else None))
+
+    def install(self):
+        for calls, phase in ((_FIGURE_CALLS, 'figure'), (_ARTIST_CALLS, 'artists'),
+                             (_LAYOUT_CALLS, 'layout'), (_SAVE_CALLS, 'save')):
+            for dotted, attributes in calls.items():
+                try:
+                    owner = _resolve(dotted)
+                except (ImportError, AttributeError):
+                    continue
+                for attribute in attributes:
+                    self._wrap(owner, attribute, phase)
+
+    def uninstall(self):
+        while self._restore:
+            owner, attribute, original = self._restore.pop()
+            if original is None:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+
+    def breakdown(self, total):
+        """Seconds per phase; ``compute`` is whatever the wrapped calls do not cover."""
+        phases = {name: self.totals.get(name, 0.0) for name in PHASES}
+        phases['compute'] = max(0.0, total - sum(self.totals.values()))
+        return phases
+
+
+@contextlib.contextmanager
+def instrument(timer=None, cprofile_path=None):
+    """Run the block under ``timer`` (installed) and optionally cProfile."""
+    profiler = None
+    if timer is not None:
+        timer.install()
+    if cprofile_path is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+        if timer is not None:
+            timer.uninstall()
+
+
+def phase_report(charts, settings, report=print):
+    """Render ``charts`` one by one with phase timing and print the breakdown."""
+    from .worker import render_isolated, warm_up
+
+    warm_up()
+    report(f"{'chart':40s} " + ' '.join(f'{phase:>8s}' for phase in PHASES) + f" {'total':>8s}")
+    totals = dict.fromkeys(PHASES, 0.0)
+    for chart in charts:
+        result = render_isolated(chart, settings)
+        if not result.ok:
+            report(f'{chart.name:40s} FAILED')
+            continue
+        for phase in PHASES:
+            totals[phase] += result.phases.get(phase, 0.0)
+        report(f'{chart.name:40s} '
+               + ' '.join(f'{result.phases.get(phase, 0.0):7.2f}s' for phase in PHASES)
+               + f' {sum(result.phases.values()):7.2f}s')
+    report(f"{'total':40s} " + ' '.join(f'{totals[phase]:7.2f}s' for phase in PHASES)
+           + f' {sum(totals.values()):7.2f}s')
+    return totals
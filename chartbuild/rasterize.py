@@ -0,0 +1,78 @@
+"""
+Rasterisation of dense artists inside vector outputs.
+
+Surfaces, filled contours and dense scatters turn into tens of thousands of
+PDF path objects, which makes the files large and slow to open in the
+combined deck. Before a vector format is written, artists above a complexity
+threshold are marked ``rasterized`` so matplotlib embeds them as one image at
+the save dpi, while text, axes, ticks and light artists stay vector.
+"""
+
+import math
+import time
+
+VECTOR_FORMATS = {'pdf', 'svg', 'eps', 'ps'}
+
+# Vertices (or scatter points) above which an artist is rasterised.
+DEFAULT_THRESHOLD = 5000
+
+
+def complexity(artist):
+    """Rough count of the vector primitives ``artist`` will emit."""
+    from matplotlib.collections import Collection
+    from matplotlib.contour import ContourSet
+    from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+
+    if isinstance(artist, Poly3DCollection):
+        # Projected polygons only exist at draw time; 3D surfaces are always dense.
+        return math.inf
+    if isinstance(artist, (Collection, ContourSet)):
+        vertices = sum(len(path.vertices) for path in artist.get_paths())
+        return max(vertices, len(artist.get_offsets()))
+    return 0
+
+
+def rasterize_heavy_artists(figure, threshold=DEFAULT_THRESHOLD):
+    """Mark every artist of ``figure`` above ``threshold`` as rasterised; return the count."""
+    from matplotlib.collections import Collection
+    from matplotlib.contour import ContourSet
+
+    count = 0
+    for artist in figure.findobj(lambda a: isinstance(a, (Collection, ContourSet))):
+        if not artist.get_rasterized() and complexity(artist) >= threshold:
+            artist.set_rasterized(True)
+            count += 1
+    return count
+
+
+def rasterize_report(charts, settings, report=print):
+    """Render each chart with and without rasterisation and compare PDF size and time."""
+    from dataclasses import replace
+
+    from .profiles import output_directory
+    from .worker import render_isolated, warm_up
+
+    warm_up()
+    modes = {'vector': replace(settings, rasterize=False), 'rasterized': replace(settings, rasterize=True)}
+    report(f"{'chart':40s} {'vector':>10s} {'rasterized':>10s} {'time':>7s} {'time':>7s}")
+    totals = {mode: [0, 0.0] for mode in modes}
+    for chart in charts:
+        sizes, seconds = {}, {}
+        for mode, mode_settings in modes.items():
+            start = time.perf_counter()
+            result = render_isolated(chart, mode_settings)
+            seconds[mode] = time.perf_counter() - start
+            directory = output_directory(chart, mode_settings.render_profile)
+            sizes[mode] = sum((directory / name).stat().st_size
+                              for name in result.outputs if name.endswith('.pdf'))
+        if sizes['vector'] == sizes['rasterized']:
+            continue  # nothing dense enough to rasterise
+        for mode in modes:
+            totals[mode][0] += sizes[mode]
+            totals[mode][1] += seconds[mode]
+        report(f"{chart.name:40s} {sizes['vector'] / 1e3:8.0f}kB {sizes['rasterized'] / 1e3:8.0f}kB "
+               f"{seconds['vector']:6.2f}s {seconds['rasterized']:6.2f}s")
+    report(f"{'affected charts total':40s} {totals['vector'][0] / 1e3:8.0f}kB "
+           f"{totals['rasterized'][0] / 1e3:8.0f}kB "
+           f"{totals['vector'][1]:6.2f}s {totals['rasterized'][1]:6.2f}s")
+    return totals
@@ -0,0 +1,168 @@
+"""
+Static chart registry.
+
+Every chart script is parsed with :mod:`ast`, never executed, to collect its
+``CHART_METADATA`` literal, the modules it imports and the file names it
+passes to ``savefig``; keywords come from ``metainfo.txt``. The result is one
+JSON index that tools can filter ("all charts tagged backtest") without
+importing matplotlib.
+
+The scripts disagree on metadata keys: the numbered modules use
+``name``/``description``/``created`` while most topic charts only have
+``title``/``url``. Entries normalise them to ``title``, ``description`` and
+``created``, falling back to ``metainfo.txt``.
+"""
+
+import ast
+import json
+import time
+from pathlib import Path
+
+from .discovery import CACHE_DIR, REPO_ROOT, discover_charts
+
+REGISTRY_PATH = CACHE_DIR / 'registry.json'
+
+
+def _metadata(tree):
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(target, ast.Name) and target.id == 'CHART_METADATA'
+                for target in node.targets):
+            try:
+                return ast.literal_eval(node.value)
+            except ValueError:
+                return {}
+    return {}
+
+
+def _imports(tree):
+    modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.add(node.module)
+    return sorted(modules)
+
+
+def _savefig_targets(tree):
+    targets = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == 'savefig' and node.args
+                and isinstance(node.args[0], ast.Constant)
+                and isinstance(node.args[0].value, str)):
+            targets.append(node.args[0].value)
+    return list(dict.fromkeys(targets))
+
+
+def parse_script(path):
+    """Metadata, imports and savefig targets of one script."""
+    tree = ast.parse(Path(path).read_text(encoding='utf-8'), filename=str(path))
+    return {'metadata': _metadata(tree), 'imports': _imports(tree),
+            'outputs': _savefig_targets(tree)}
+
+
+def _module_file(module, root):
+    base = Path(root, *module.split('.'))
+    for candidate in (base.with_suffix('.py'), base / '__init__.py'):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _module_imports(path, module):
+    """Absolute names imported by the module ``module`` at ``path``.
+
+    Relative imports are resolved against the module's package, and
+    ``from package import name`` also yields ``package.name`` in case
+    ``name`` is a submodule.
+    """
+    tree = ast.parse(path.read_text(encoding='utf-8'), filename=str(path))
+    package = module.split('.') if path.name == '__init__.py' else module.split('.')[:-1]
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                if node.level - 1 > len(package):
+                    continue
+                base = package[:len(package) - node.level + 1]
+                parent = '.'.join(base + ([node.module] if node.module else []))
+            else:
+                parent = node.module
+            if not parent:
+                continue
+            names.add(parent)
+            names.update(f'{parent}.{alias.name}' for alias in node.names if alias.name != '*')
+    return names
+
+
+def local_modules(imports, root=REPO_ROOT):
+    """Source files in this repository for the dotted module names in ``imports``.
+
+    Imports are followed transitively through the repository modules, and
+    the ``__init__.py`` of every enclosing package is included, since
+    importing ``chartlib.graph`` runs ``chartlib/__init__.py`` first.
+    """
+    files, seen = {}, set()
+    pending = list(imports)
+    while pending:
+        module = pending.pop()
+        if module in seen:
+            continue
+        seen.add(module)
+        parts = module.split('.')
+        pending.extend('.'.join(parts[:end]) for end in range(1, len(parts)))
+        path = _module_file(module, root)
+        if path is None or path in files:
+            continue
+        files[path] = module
+        pending.extend(_module_imports(path, module))
+    return sorted(files)
+
+
+def chart_entry(chart):
+    """Registry entry for one chart."""
+    parsed = parse_script(chart.script)
+    metadata = parsed['metadata']
+    info = chart.metainfo
+    keywords = [word.strip() for word in info.get('Keywords', '').split(',') if word.strip()]
+    return {
+        'name': chart.name,
+        'directory': chart.directory.name,
+        'script': chart.script.name,
+        'title': metadata.get('name') or metadata.get('title') or chart.name,
+        'description': metadata.get('description') or info.get('Description', ''),
+        'created': metadata.get('created') or info.get('Submitted'),
+        'url': metadata.get('url'),
+        'author': metadata.get('author') or info.get('Author'),
+        'keywords': keywords,
+        'imports': parsed['imports'],
+        'outputs': parsed['outputs'],
+        'metadata': metadata,
+    }
+
+
+def build_registry(root=REPO_ROOT):
+    """Registry entries for every chart under ``root`` in deck order."""
+    return [chart_entry(chart) for chart in discover_charts(root)]
+
+
+def write_registry(path=REGISTRY_PATH, root=REPO_ROOT, report=print):
+    """Build the registry and write it as JSON; return the entries."""
+    start = time.perf_counter()
+    entries = build_registry(root)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({'charts': entries}, indent=1), encoding='utf-8')
+    report(f'Wrote {len(entries)} charts to {path} in {time.perf_counter() - start:.2f}s')
+    return entries
+
+
+def tagged(entries, tags):
+    """Names of the entries carrying any of ``tags`` as a keyword (case-insensitive)."""
+    wanted = {tag.lower() for tag in tags}
+    return [entry['name'] for entry in entries
+            if wanted & {keyword.lower() for keyword in entry['keywords']}]
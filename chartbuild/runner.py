@@ -0,0 +1,99 @@
+"""
+Parallel chart rendering.
+
+Each chart script is executed with ``runpy`` by a pre-warmed worker process
+(see :mod:`chartbuild.worker`) with the chart directory as working directory,
+so the relative ``savefig`` paths in the scripts land where they always have.
+Charts are independent, so a full rebuild scales with the number of cores. With a :class:`~chartbuild.cache.RenderCache`
+unchanged charts are restored from the cache instead of being executed.
+"""
+
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .mathcache import MathtextCache, MathtextStats
+from .pngopt import PngStats, over_budget
+from .profiles import output_directory
+from .settings import RenderSettings
+from .worker import ChartResult, render_isolated, warm_up
+
+
+def _report_result(result, report):
+    status = 'ok  ' if result.ok else 'FAIL'
+    if result.cached:
+        status = 'hit '
+    report(f'  {status} {result.seconds:7.2f}s  {result.name}')
+    if not result.ok:
+        report(result.error.rstrip())
+
+
+def build(charts, jobs=None, cache=None, settings=RenderSettings(), report=print):
+    """Render ``charts`` in a process pool and return their results in input order.
+
+    A ``cache`` must have been created with the same ``settings``.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    results = {}
+    start = time.perf_counter()
+    pending = []
+    for chart in charts:
+        manifest = cache.restore(chart) if cache is not None else None
+        if manifest is None:
+            pending.append(chart)
+            continue
+        result = ChartResult(chart.name, True, 0.0, outputs=manifest['outputs'], cached=True)
+        results[chart.name] = result
+        _report_result(result, report)
+    if pending:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=warm_up) as pool:
+            futures = {pool.submit(render_isolated, chart, settings): chart for chart in pending}
+            for future in as_completed(futures):
+                chart = futures[future]
+                try:
+                    result = future.result()
+                except Exception:  # the worker itself died
+                    result = ChartResult(chart.name, False, 0.0, error=traceback.format_exc())
+                if result.ok and cache is not None:
+                    cache.store(chart, result.outputs, result.seconds)
+                results[chart.name] = result
+                _report_result(result, report)
+    wall = time.perf_counter() - start
+    ordered = [results[chart.name] for chart in charts]
+    _check_budget(charts, ordered, settings, report)
+    _summarise(ordered, wall, jobs, report)
+    if cache is not None:
+        report(cache.stats.summary())
+    if pending and settings.mathtext_cache:
+        added = MathtextCache().compact()
+        stats = sum((result.mathtext for result in ordered), MathtextStats())
+        report(f'{stats.summary()}, {added} new layouts stored')
+    if pending and settings.optimise_png:
+        report(sum((result.png for result in ordered), PngStats()).summary())
+    return ordered
+
+
+def _check_budget(charts, results, settings, report):
+    """Fail the charts whose PDF/PNG outputs take more than ``settings.size_budget`` bytes."""
+    for chart, result in zip(charts, results):
+        if not result.ok:
+            continue
+        directory = output_directory(chart, settings.render_profile)
+        total = over_budget(directory, result.outputs, settings.size_budget)
+        if total is not None:
+            result.ok = False
+            result.error = (f'static outputs take {total / 1e6:.2f} MB, over the '
+                            f'{settings.size_budget / 1e6:.2f} MB size budget')
+            report(f'  OVER {chart.name}: {result.error}')
+
+
+def _summarise(results, wall, jobs, report):
+    failed = [result.name for result in results if not result.ok]
+    serial = sum(result.seconds for result in results if not result.cached)
+    speedup = serial / wall if wall > 0 else 0.0
+    report('')
+    report(f'{len(results) - len(failed)}/{len(results)} charts rendered with {jobs} workers')
+    report(f'Wall time {wall:.1f}s, summed chart time {serial:.1f}s ({speedup:.1f}x)')
+    if failed:
+        report(f"Failed: {', '.join(failed)}")
@@ -0,0 +1,62 @@
+"""
+Render settings shared by every chart in a build.
+
+The settings are applied by :mod:`chartbuild.hooks` around each chart script
+and are part of the render cache key, so changing any of them re-renders.
+The profiling switches only measure the render, the mathtext cache only
+speeds it up and the size budget only checks the outputs, so they are left
+out of the key.
+"""
+
+from dataclasses import asdict, dataclass
+
+from .pngopt import DEFAULT_BUDGET
+from .profiles import get_profile
+from .rasterize import DEFAULT_THRESHOLD
+
+# Fields that change how a render is measured, checked or how fast it runs, not what it writes.
+_INSTRUMENTATION = ('phases', 'cprofile_dir', 'mathtext_cache', 'size_budget')
+
+
+@dataclass(frozen=True)
+class RenderSettings:
+    """Options applied to every ``savefig`` call of a build."""
+
+    # Pin PDF/PNG metadata and random seeds so unchanged charts give identical bytes.
+    reproducible: bool = True
+    # Lay out and draw each figure once for all of its PDF/PNG outputs.
+    single_draw: bool = True
+    # Write PNG outputs; PDF-only builds skip the 300 dpi rasterisation.
+    png: bool = True
+    # Embed dense artists (surfaces, filled contours, big scatters) in PDFs as images.
+    # Off by default: at dpi=300 the images outweigh the course's current vector paths.
+    rasterize: bool = False
+    # Complexity above which an artist is rasterised, see chartbuild.rasterize.
+    raster_threshold: int = DEFAULT_THRESHOLD
+    # Resolution of rasterised artists in vector outputs; None keeps the savefig dpi.
+    raster_dpi: float = None
+    # Render profile name, see chartbuild.profiles ('final' or 'draft').
+    profile: str = 'final'
+    # Time the script body per phase, see chartbuild.profiling.
+    phases: bool = False
+    # Directory for a cProfile dump per chart (<chart>.prof); None disables it.
+    cprofile_dir: str = None
+    # Reuse mathtext layouts across charts and builds, see chartbuild.mathcache.
+    mathtext_cache: bool = True
+    # Re-encode PNG outputs losslessly, see chartbuild.pngopt (about 2s per 300 dpi PNG).
+    optimise_png: bool = False
+    # Bytes a chart's outputs may take together; larger charts fail the build. 0 disables.
+    size_budget: int = DEFAULT_BUDGET
+
+    def __post_init__(self):
+        get_profile(self.profile)  # fail early on unknown names
+
+    @property
+    def render_profile(self):
+        return get_profile(self.profile)
+
+    def as_dict(self):
+        settings = asdict(self)
+        for name in _INSTRUMENTATION:
+            del settings[name]
+        return settings
@@ -0,0 +1,39 @@
+"""
+Reproducibility check: render each chart twice and compare output hashes.
+"""
+
+import hashlib
+
+from .profiles import output_directory
+from .worker import render_isolated, warm_up
+
+
+def _digests(directory, outputs):
+    return {name: hashlib.sha256((directory / name).read_bytes()).hexdigest()
+            for name in outputs}
+
+
+def verify_reproducible(charts, settings, report=print):
+    """Return the names of charts whose outputs differ between two renders."""
+    warm_up()
+    unstable = []
+    for chart in charts:
+        directory = output_directory(chart, settings.render_profile)
+        first = render_isolated(chart, settings)
+        first_digests = _digests(directory, first.outputs) if first.ok else {}
+        second = render_isolated(chart, settings)
+        if not (first.ok and second.ok):
+            report(f'  FAIL        {chart.name}')
+            unstable.append(chart.name)
+            continue
+        second_digests = _digests(directory, second.outputs)
+        changed = sorted(name for name in set(first_digests) | set(second_digests)
+                         if first_digests.get(name) != second_digests.get(name))
+        if changed:
+            report(f"  differs     {chart.name}: {', '.join(changed)}")
+            unstable.append(chart.name)
+        else:
+            report(f'  identical   {chart.name}')
+    report('')
+    report(f'{len(charts) - len(unstable)}/{len(charts)} charts render byte-identically')
+    return unstable
@@ -0,0 +1,179 @@
+"""
+Watch mode: re-render a chart as soon as one of its sources is saved.
+
+The watcher puts one inotify watch on every chart directory and on the
+directories of the repository modules the charts import, directly or
+through other modules, then sleeps in ``select`` until the kernel reports a
+write, so an idle watcher costs nothing however large the tree is. A burst of events (editors often write a
+temporary file and rename it) is debounced into one change set, mapped back
+to the charts whose :func:`~chartbuild.cache.source_files` it touches, and
+only those charts are rendered, each in a fork of this already warm process.
+
+Outputs go where the chart scripts put them (or to ``.preview/`` with the
+draft profile). inotify is Linux-only; elsewhere :func:`watch` raises
+:class:`RuntimeError` rather than falling back to polling.
+"""
+
+import ctypes
+import ctypes.util
+import importlib
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from .cache import source_files
+from .registry import local_modules
+from .settings import RenderSettings
+from .worker import render_isolated, warm_up
+
+# <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len; the name follows
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# Seconds without further events before a burst of writes is acted on.
+DEBOUNCE = 0.1
+# Seconds from the last write to fresh outputs above which a render is flagged.
+LATENCY_BUDGET = 1.0
+
+
+class Inotify:
+    """Minimal ctypes binding of the inotify calls the watcher needs."""
+
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise RuntimeError('watch mode needs inotify, which is only available on Linux')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._directories = {}
+
+    def fileno(self):
+        return self._fd
+
+    def add_watch(self, directory, mask=_WATCH_MASK):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), mask)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._directories[wd] = Path(directory)
+        return wd
+
+    def read(self):
+        """Paths reported since the last call (empty if there are none)."""
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths, offset = [], 0
+        while offset < len(data):
+            wd, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if wd in self._directories and name:
+                paths.append(self._directories[wd] / os.fsdecode(name))
+        return paths
+
+    def close(self):
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def dependents(charts):
+    """Map every source file to the charts whose outputs depend on it."""
+    mapping = {}
+    for chart in charts:
+        for path in source_files(chart):
+            mapping.setdefault(path.resolve(), []).append(chart)
+    return mapping
+
+
+def _reload_shared(paths, sources):
+    # The watcher's interpreter already imported the repository modules the
+    # charts use; reload the edited ones and every loaded chart source that
+    # imports them, dependencies first, so the forked renders see the new code.
+    edited = {path.resolve() for path in paths}
+    closures = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if path is None or Path(path).resolve() not in sources:
+            continue
+        closure = {file.resolve() for file in local_modules([name])}
+        if closure & edited:
+            closures[name] = closure
+    # A module's dependencies have strictly smaller closures than it has.
+    for name in sorted(closures, key=lambda name: (len(closures[name]), name)):
+        importlib.reload(sys.modules[name])
+
+
+def _wait(notifier, timeout=None):
+    readable, _, _ = select.select([notifier], [], [], timeout)
+    return bool(readable)
+
+
+def _changes(notifier, debounce):
+    """Block until sources change.
+
+    Returns the ``.py`` files touched by the burst and the time of its last event.
+    """
+    _wait(notifier)
+    changed = set()
+    while True:
+        last_event = time.perf_counter()
+        changed.update(path for path in notifier.read() if path.suffix == '.py')
+        if not _wait(notifier, debounce):
+            return changed, last_event
+
+
+def watch(charts, settings=RenderSettings(), debounce=DEBOUNCE, budget=LATENCY_BUDGET,
+          report=print):
+    """Re-render ``charts`` whose sources change until interrupted."""
+    charts = list(charts)
+    with Inotify() as notifier:
+        mapping, watched = dependents(charts), set()
+        for directory in sorted({path.parent for path in mapping}):
+            notifier.add_watch(directory)
+            watched.add(directory)
+        warm_up()
+        report(f'Watching {len(charts)} charts; Ctrl+C to stop')
+        try:
+            while True:
+                changed, last_event = _changes(notifier, debounce)
+                changed = {path.resolve() for path in changed}
+                affected = {chart.name: chart for path in changed if path in mapping
+                            for chart in mapping[path]}
+                if not affected:
+                    continue
+                _reload_shared((path for path in changed
+                                if not any(path.parent == chart.directory.resolve()
+                                           for chart in affected.values())), mapping)
+                for chart in sorted(affected.values(), key=lambda chart: chart.sort_key):
+                    result = render_isolated(chart, settings)
+                    latency = time.perf_counter() - last_event
+                    if not result.ok:
+                        report(f'FAIL {chart.name} ({latency:.2f}s)\n{result.error}')
+                        continue
+                    note = ' over budget' if latency > budget else ''
+                    report(f'ok   {chart.name} ({latency:.2f}s{note}) '
+                           f'-> {", ".join(result.outputs) or "no changed outputs"}')
+                mapping = dependents(charts)  # imports may have changed
+                for directory in {path.parent for path in mapping} - watched:
+                    notifier.add_watch(directory)
+                    watched.add(directory)
+        except KeyboardInterrupt:
+            report('Stopped watching')
@@ -0,0 +1,276 @@
+"""
+Pre-warmed render workers.
+
+Importing ``matplotlib.pyplot``, numpy, scipy and scikit-learn, loading the
+font cache and initialising mathtext often costs more than drawing a chart.
+A warm worker pays that once in :func:`warm_up` and then forks a child per
+chart (fork-after-import), so every chart starts from the same pristine,
+already-imported interpreter: its module namespace, rcParams and open figures
+die with the child. Where ``os.fork`` is unavailable the chart runs in the
+worker itself and is cleaned up with ``plt.close('all')`` and an rcParams
+context.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import pickle
+import runpy
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from .discovery import REPO_ROOT
+from .hooks import render_hooks
+from .mathcache import MathtextCache, MathtextStats
+from .pngopt import PngStats, optimise_outputs
+from .profiles import output_directory
+from .profiling import PhaseTimer, instrument
+from .settings import RenderSettings
+
+# Modules the chart scripts import, warmed in order; missing ones are skipped.
+PRELOAD = (
+    'numpy',
+    'matplotlib.pyplot',
+    'matplotlib.patches',
+    'matplotlib.collections',
+    'mpl_toolkits.mplot3d',
+    'scipy.ndimage',
+    'scipy.stats',
+    'pandas',
+    'sklearn.neural_network',
+    'sklearn.linear_model',
+    'sklearn.preprocessing',
+)
+
+_WARM = False
+# Installed by warm_up() and inherited by every forked render.
+_MATHTEXT = MathtextCache()
+
+
+@dataclass
+class ChartResult:
+    """Outcome of rendering one chart."""
+
+    name: str
+    ok: bool
+    seconds: float
+    output: str = ''
+    error: str = ''
+    outputs: list = field(default_factory=list)
+    cached: bool = False
+    cpu_seconds: float = 0.0
+    # Peak resident set size of the render process in bytes (0 if unknown).
+    max_rss: int = 0
+    # Artists in the figures the chart saved.
+    artists: int = 0
+    # Seconds per phase of the script body when profiled, see chartbuild.profiling.
+    phases: dict = field(default_factory=dict)
+    # Mathtext layouts served from and added to chartbuild.mathcache.
+    mathtext: MathtextStats = field(default_factory=MathtextStats)
+    # PNG outputs re-encoded by chartbuild.pngopt.
+    png: PngStats = field(default_factory=PngStats)
+
+
+def warm_up():
+    """Import the rendering stack and exercise fonts, mathtext and the PDF/PNG backends.
+
+    Also loads the persistent mathtext layouts, so every fork starts with them.
+    """
+    global _WARM
+    if _WARM:
+        return
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    import importlib
+    for module in PRELOAD:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    _MATHTEXT.load()
+    _MATHTEXT.install()
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(2, 1))
+    ax.set_title('warm-up', fontweight='bold')
+    ax.text(0.5, 0.5, r'$\sigma(z) = \frac{1}{1+e^{-z}}$', ha='center')
+    for fmt in ('pdf', 'png'):
+        fig.savefig(io.BytesIO(), format=fmt, dpi=72, bbox_inches='tight')
+    plt.close(fig)
+    _MATHTEXT.flush()  # so renders only write their own layouts
+    _WARM = True
+
+
+def _snapshot(directory):
+    return {path.name: (stat.st_mtime_ns, stat.st_size)
+            for path in directory.iterdir()
+            if path.is_file() and path.suffix != '.py'
+            for stat in [path.stat()]}
+
+
+def render_chart(chart, settings=RenderSettings()):
+    """Run one chart script in its own directory and report the outcome."""
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    previous = os.getcwd()
+    stdout = io.StringIO()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    ok, error, stats = True, '', {}
+    output_dir = output_directory(chart, settings.render_profile)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    before = _snapshot(output_dir)
+    timer = PhaseTimer() if settings.phases else None
+    cprofile_path = None
+    if settings.cprofile_dir is not None:
+        Path(settings.cprofile_dir).mkdir(parents=True, exist_ok=True)
+        cprofile_path = str(Path(settings.cprofile_dir).resolve() / f'{chart.name}.prof')
+    _MATHTEXT.enabled = settings.mathtext_cache
+    _MATHTEXT.reset_stats()
+    body_start = time.perf_counter()
+    try:
+        os.chdir(chart.directory)
+        with contextlib.redirect_stdout(stdout), matplotlib.rc_context(), \
+                render_hooks(settings, output_dir, timer) as stats, \
+                instrument(timer, cprofile_path):
+            body_start = time.perf_counter()
+            runpy.run_path(str(chart.script), run_name='__main__')
+    except BaseException:  # chart scripts may call sys.exit()
+        ok, error = False, traceback.format_exc()
+    finally:
+        plt.close('all')
+        os.chdir(previous)
+    end = time.perf_counter()
+    seconds = end - start
+    cpu_seconds = time.process_time() - cpu_start
+    after = _snapshot(output_dir)
+    outputs = sorted(name for name, stamp in after.items() if before.get(name) != stamp)
+    png = PngStats()
+    if ok:
+        _MATHTEXT.flush()
+        if settings.optimise_png:
+            png = optimise_outputs(output_dir, outputs)
+            seconds = time.perf_counter() - start
+    return ChartResult(chart.name, ok, seconds, stdout.getvalue(), error, outputs,
+                       cpu_seconds=cpu_seconds, max_rss=_max_rss(),
+                       artists=stats.get('artists', 0),
+                       phases=timer.breakdown(end - body_start) if timer else {},
+                       mathtext=_MATHTEXT.stats, png=png)
+
+
+def _max_rss():
+    if resource is None:
+        return 0
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def render_isolated(chart, settings=RenderSettings()):
+    """Render ``chart`` in a forked child of this (warm) process."""
+    warm_up()
+    if not hasattr(os, 'fork'):
+        return render_chart(chart, settings)
+    read_fd, write_fd = os.pipe()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        try:
+            payload = pickle.dumps(render_chart(chart, settings))
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pipe.write(payload)
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as pipe:
+        payload = pipe.read()
+    _, status = os.waitpid(pid, 0)
+    if not payload:
+        return ChartResult(chart.name, False, 0.0,
+                           error=f'render process exited with status {status}')
+    return pickle.loads(payload)
+
+
+def _serve(connection):
+    warm_up()
+    connection.send('ready')
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        connection.send(render_isolated(*request))
+    connection.close()
+
+
+class WarmWorker:
+    """A long-lived warm process that renders charts on request.
+
+    >>> with WarmWorker() as worker:
+    ...     result = worker.render(chart)
+    """
+
+    def __init__(self):
+        context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+        self._connection, child = context.Pipe()
+        self._process = context.Process(target=_serve, args=(child,), daemon=True)
+        self._process.start()
+        child.close()
+        self._connection.recv()  # blocks until warm_up() has finished
+
+    def render(self, chart, settings=RenderSettings()):
+        self._connection.send((chart, settings))
+        return self._connection.recv()
+
+    def close(self):
+        if self._process.is_alive():
+            self._connection.send(None)
+            self._process.join()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def startup_benchmark(charts, repeat=3, report=print):
+    """Compare a cold ``python script.py`` subprocess against the warm worker."""
+    env = dict(os.environ, MPLBACKEND='Agg')
+    start = time.perf_counter()
+    worker = WarmWorker()
+    warm_start = time.perf_counter() - start
+    report(f'Warm worker ready in {warm_start:.2f}s (paid once)')
+    report(f"{'chart':40s} {'cold':>8s} {'warm':>8s} {'saved':>8s}")
+    cold_total = warm_total = 0.0
+    with worker:
+        for chart in charts:
+            cold = warm = 0.0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, chart.script.name], cwd=chart.directory,
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               check=False)
+                cold += time.perf_counter() - start
+                start = time.perf_counter()
+                worker.render(chart)
+                warm += time.perf_counter() - start
+            cold, warm = cold / repeat, warm / repeat
+            cold_total += cold
+            warm_total += warm
+            report(f'{chart.name:40s} {cold:7.2f}s {warm:7.2f}s {cold - warm:7.2f}s')
+    report(f"{'total':40s} {cold_total:7.2f}s {warm_total:7.2f}s {cold_total - warm_total:7.2f}s")
+    return cold_total, warm_total
@@ -0,0 +1,21 @@
+"""
+Drawing and computation components shared by the chart scripts.
+
+The chart scripts stay standalone: each one that uses a component puts the
+repository root on ``sys.path`` before importing from here (the build runner
+already does), so ``python network_architecture.py`` keeps working from the
+chart directory::
+
+    import sys
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from chartlib.network import draw_network
+
+Components build a handful of collection artists from numpy arrays instead
+of one artist per element, so their cost grows with the data, not with the
+number of matplotlib calls. The numerical components (:mod:`chartlib.forward`,
+:mod:`chartlib.autodiff`, :mod:`chartlib.graph`, :mod:`chartlib.optimizers`,
+:mod:`chartlib.batches`) compute what the charts show over whole batches in
+preallocated arrays.
+"""
@@ -0,0 +1,225 @@
+"""
+Animated charts streamed frame by frame to GIF, APNG or MP4.
+
+:func:`animate` drives a figure through any iterable of frames (typically a
+generator over a training history, so frames are produced only when they
+are encoded). ``update(frame)`` changes the figure and returns the artists
+that move. Everything else is drawn once: the figure is rendered without
+the animated artists, that background is kept as an Agg region, and each
+frame restores it and draws only the updated artists on top (blitting).
+
+Frames go straight to a writer chosen by the file suffix:
+
+``.gif``
+    each frame stores only the rectangle that changed since the previous
+    one, quantised to its own 256-colour palette (Pillow's GIF encoder);
+``.png`` / ``.apng``
+    animated PNG, lossless, also storing only the changed rectangle; the
+    frame count is patched into the header when the stream is closed;
+``.mp4``
+    H.264 through an ``ffmpeg`` process fed raw frames on a pipe.
+
+Writers keep only the previous frame, so memory does not grow with the
+number of frames. Matplotlib's own ``FuncAnimation`` writers are not used:
+its Pillow writer holds every frame until the end.
+"""
+
+import shutil
+import struct
+import subprocess
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+FPS = 20
+ANIMATION_DPI = 100
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def changed_box(previous, frame):
+    """``(x0, y0, x1, y1)`` of the pixels that differ, or ``None`` for identical frames.
+
+    Frames are ``(height, width, 4)`` uint8 arrays, compared a pixel at a time.
+    """
+    if previous is None:
+        return 0, 0, frame.shape[1], frame.shape[0]
+    diff = previous.view(np.uint32)[..., 0] != frame.view(np.uint32)[..., 0]
+    rows, columns = np.flatnonzero(diff.any(axis=1)), np.flatnonzero(diff.any(axis=0))
+    if not len(rows):
+        return None
+    return columns[0], rows[0], columns[-1] + 1, rows[-1] + 1
+
+
+class _DeltaWriter:
+    """Base of the writers that store the changed rectangle of each frame."""
+
+    def __init__(self, path, size, fps):
+        self.path, self.size, self.fps = Path(path), size, fps
+        self.frames = 0
+        self._previous = None
+        self._file = open(self.path, 'wb')
+
+    def write(self, frame):
+        frame = np.array(frame, dtype=np.uint8)  # RGBA; the canvas buffer is reused
+        box = changed_box(self._previous, frame)
+        if box is None:
+            box = (0, 0, 1, 1)  # keep the timing: a one-pixel no-op frame
+        x0, y0, x1, y1 = box
+        self._write_frame(np.ascontiguousarray(frame[y0:y1, x0:x1, :3]), (x0, y0))
+        self._previous = frame
+        self.frames += 1
+
+    def close(self):
+        self._finish()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GifWriter(_DeltaWriter):
+    """Looping GIF with a local palette per frame."""
+
+    def __init__(self, path, size, fps):
+        super().__init__(path, size, fps)
+        width, height = size
+        self._file.write(b'GIF89a' + struct.pack('<HHBBB', width, height, 0, 0, 0))
+        self._file.write(b'!\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00')  # loop forever
+
+    def _write_frame(self, region, offset):
+        from PIL import GifImagePlugin, Image
+
+        image = Image.fromarray(region).quantize(256, method=Image.Quantize.FASTOCTREE,
+                                                 dither=Image.Dither.NONE)
+        # Disposal 1 leaves the frame in place, so the next rectangle draws over it.
+        self._file.writelines(GifImagePlugin.getdata(
+            image, offset, duration=1000 / self.fps, disposal=1, include_color_table=True))
+
+    def _finish(self):
+        self._file.write(b';')
+
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+class ApngWriter(_DeltaWriter):
+    """Looping animated PNG (RGB, lossless)."""
+
+    def __init__(self, path, size, fps):
+        super().__init__(path, size, fps)
+        width, height = size
+        self._sequence = 0
+        self._file.write(_PNG_SIGNATURE)
+        self._file.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)))
+        self._actl = self._file.tell()
+        self._file.write(_chunk(b'acTL', struct.pack('>II', 0, 0)))  # patched by _finish
+
+    def _write_frame(self, region, offset):
+        height, width = region.shape[:2]
+        self._file.write(_chunk(b'fcTL', struct.pack(
+            '>IIIIIHHBB', self._next(), width, height, *offset, 1, self.fps, 0, 0)))
+        # Filter type 2 (Up) on every row: the difference to the row above.
+        filtered = region.copy()
+        filtered[1:] -= region[:-1]
+        rows = np.concatenate([np.full((height, 1), 2, np.uint8),
+                               filtered.reshape(height, -1)], axis=1)
+        data = zlib.compress(rows.tobytes(), 6)
+        if self.frames == 0:
+            self._file.write(_chunk(b'IDAT', data))
+        else:
+            self._file.write(_chunk(b'fdAT', struct.pack('>I', self._next()) + data))
+
+    def _next(self):
+        self._sequence += 1
+        return self._sequence - 1
+
+    def _finish(self):
+        self._file.write(_chunk(b'IEND', b''))
+        self._file.seek(self._actl)
+        self._file.write(_chunk(b'acTL', struct.pack('>II', self.frames, 0)))
+
+
+class FfmpegWriter:
+    """H.264 MP4 encoded by an ``ffmpeg`` subprocess."""
+
+    def __init__(self, path, size, fps):
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError('MP4 output needs ffmpeg on PATH; write a .gif or .png instead')
+        self.path, self.frames = Path(path), 0
+        width, height = size
+        self._process = subprocess.Popen(
+            [ffmpeg, '-loglevel', 'error', '-y', '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+             '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p',
+             str(path)], stdin=subprocess.PIPE)
+
+    def write(self, frame):
+        self._process.stdin.write(np.ascontiguousarray(frame[..., :3]).tobytes())
+        self.frames += 1
+
+    def close(self):
+        self._process.stdin.close()
+        if self._process.wait():
+            raise RuntimeError(f'ffmpeg failed writing {self.path}')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+WRITERS = {'.gif': GifWriter, '.png': ApngWriter, '.apng': ApngWriter, '.mp4': FfmpegWriter}
+
+
+def frame_writer(path, size, fps=FPS):
+    """The streaming writer for ``path``'s suffix, for frames of ``size = (width, height)``."""
+    try:
+        writer = WRITERS[Path(path).suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported animation format {Path(path).suffix!r}; "
+                         f"use one of {', '.join(WRITERS)}") from None
+    return writer(path, size, fps)
+
+
+def animate(fig, frames, update, path, fps=FPS, dpi=ANIMATION_DPI):
+    """Render ``update(frame)`` for every item of ``frames`` into the animation ``path``.
+
+    ``update`` returns the artists that move (including any it created); only
+    those are redrawn over the cached background. Returns ``(frame count, seconds)``.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    start = time.perf_counter()
+    fig.set_dpi(dpi)
+    canvas = FigureCanvasAgg(fig)
+    frames = iter(frames)
+    try:
+        artists = list(update(next(frames)))
+    except StopIteration:
+        raise ValueError('no frames to animate') from None
+    for artist in artists:
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    with frame_writer(path, canvas.get_width_height(), fps) as writer:
+        while True:
+            canvas.restore_region(background)
+            for artist in artists:
+                fig.draw_artist(artist)
+            writer.write(np.asarray(canvas.buffer_rgba()))
+            try:
+                artists = list(update(next(frames)))
+            except StopIteration:
+                break
+            for artist in artists:
+                artist.set_animated(True)
+    return writer.frames, time.perf_counter() - start
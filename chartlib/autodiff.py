@@ -0,0 +1,267 @@
+"""
+Reverse-mode automatic differentiation on a tape of vectorised numpy ops.
+
+Operations on :class:`Node` objects are computed at once and recorded on
+their :class:`Tape` in execution order, which is a topological order of the
+computation graph. :meth:`Tape.backward` walks the tape in reverse, seeding
+the chosen output with 1, and adds each node's gradient contribution to the
+gradients of its inputs (the chain rule); only nodes that depend on a
+:meth:`~Tape.parameter` carry gradients.
+
+The tape is recorded once and replayed: every node owns a value buffer, a
+gradient buffer and the scratch space its backward rule needs, all
+allocated when it is recorded. :meth:`Tape.forward` recomputes the values
+in place after inputs are assigned, and :meth:`Tape.backward` zeroes and
+refills the gradient buffers, so training iterations reuse the same memory.
+
+Inputs may be whole batches: with ``x`` of shape ``(N,)`` and scalar
+weights, ``mean(...)`` gives the batch loss and one backward pass gives its
+gradient. Broadcast operands have their gradients summed back to their own
+shape. Supported operations are ``+``, ``-``, ``*`` (with nodes or
+constants), ``@`` on 2-D matrices, and :func:`sigmoid`, :func:`square`,
+:func:`mean` and :func:`total`.
+"""
+
+import numpy as np
+
+
+class Node:
+    """A value on a :class:`Tape` and, after :meth:`Tape.backward`, its gradient."""
+
+    __slots__ = ('tape', 'name', 'op', 'inputs', 'value', 'grad', '_scratch', '_reduce')
+
+    def __init__(self, tape, name, op, inputs, value, requires_grad):
+        self.tape, self.name, self.op, self.inputs = tape, name, op, inputs
+        self.value = value
+        self.grad = np.zeros_like(value) if requires_grad else None
+        self._scratch = None
+        self._reduce = []
+
+    @property
+    def shape(self):
+        return self.value.shape
+
+    def item(self):
+        return self.value.item()
+
+    def assign(self, value):
+        """Set the value of an input or parameter in place (its shape is fixed)."""
+        np.copyto(self.value, value)
+
+    def _operand(self, other):
+        return other if isinstance(other, Node) else self.tape.constant(other)
+
+    def __add__(self, other):
+        return self.tape.record('add', self, self._operand(other))
+
+    def __radd__(self, other):
+        return self.tape.record('add', self._operand(other), self)
+
+    def __sub__(self, other):
+        return self.tape.record('sub', self, self._operand(other))
+
+    def __rsub__(self, other):
+        return self.tape.record('sub', self._operand(other), self)
+
+    def __mul__(self, other):
+        return self.tape.record('mul', self, self._operand(other))
+
+    def __rmul__(self, other):
+        return self.tape.record('mul', self._operand(other), self)
+
+    def __matmul__(self, other):
+        return self.tape.record('matmul', self, self._operand(other))
+
+    def __repr__(self):
+        return f'Node({self.name or self.op}, shape={self.shape})'
+
+
+def _sigmoid(x, out):
+    np.negative(x, out=out)
+    with np.errstate(over='ignore'):
+        np.exp(out, out=out)
+    out += 1
+    np.reciprocal(out, out=out)
+
+
+def _forward(node):
+    a = node.inputs[0].value
+    b = node.inputs[1].value if len(node.inputs) > 1 else None
+    out = node.value
+    if node.op == 'add':
+        np.add(a, b, out=out)
+    elif node.op == 'sub':
+        np.subtract(a, b, out=out)
+    elif node.op == 'mul':
+        np.multiply(a, b, out=out)
+    elif node.op == 'matmul':
+        np.matmul(a, b, out=out)
+    elif node.op == 'sigmoid':
+        _sigmoid(a, out)
+    elif node.op == 'square':
+        np.multiply(a, a, out=out)
+    elif node.op == 'total':
+        np.sum(a, out=out)
+    elif node.op == 'mean':
+        np.sum(a, out=out)
+        out /= a.size
+
+
+def _accumulate(node, index, contribution):
+    """Add ``contribution`` (shaped like ``node``) to the gradient of input ``index``."""
+    target = node.inputs[index]
+    if target.grad is None:
+        return
+    reduce = node._reduce[index]
+    if reduce is not None:
+        axes, buffer = reduce
+        np.sum(contribution, axis=axes, keepdims=True, out=buffer)
+        contribution = buffer.reshape(target.shape)
+    np.add(target.grad, contribution, out=target.grad)
+
+
+def _backward(node):
+    grad, scratch = node.grad, node._scratch
+    inputs = node.inputs
+    if node.op == 'add':
+        _accumulate(node, 0, grad)
+        _accumulate(node, 1, grad)
+    elif node.op == 'sub':
+        _accumulate(node, 0, grad)
+        if inputs[1].grad is not None:
+            np.negative(grad, out=scratch)
+            _accumulate(node, 1, scratch)
+    elif node.op == 'mul':
+        for index, other in ((0, inputs[1]), (1, inputs[0])):
+            if inputs[index].grad is not None:
+                np.multiply(grad, other.value, out=scratch)
+                _accumulate(node, index, scratch)
+    elif node.op == 'matmul':
+        a, b = inputs
+        if a.grad is not None:
+            a.grad += np.matmul(grad, b.value.T, out=scratch[0])
+        if b.grad is not None:
+            b.grad += np.matmul(a.value.T, grad, out=scratch[1])
+    elif node.op == 'sigmoid':
+        # sigma' = sigma (1 - sigma), from the stored output
+        np.subtract(1, node.value, out=scratch)
+        scratch *= node.value
+        scratch *= grad
+        _accumulate(node, 0, scratch)
+    elif node.op == 'square':
+        np.multiply(inputs[0].value, grad, out=scratch)
+        scratch *= 2
+        _accumulate(node, 0, scratch)
+    elif node.op in ('total', 'mean'):
+        np.copyto(scratch, grad)
+        if node.op == 'mean':
+            scratch /= scratch.size
+        _accumulate(node, 0, scratch)
+
+
+def _output_shape(op, inputs):
+    if op in ('total', 'mean'):
+        return ()
+    if op in ('sigmoid', 'square'):
+        return inputs[0].shape
+    if op == 'matmul':
+        # Only matrices: backward transposes the operands, which for a 1-D
+        # vector would not give the outer products its gradients need.
+        a, b = inputs[0].shape, inputs[1].shape
+        if len(a) != 2 or len(b) != 2 or a[1] != b[0]:
+            raise ValueError(f'cannot multiply {a} by {b}')
+        return a[0], b[1]
+    return np.broadcast_shapes(inputs[0].shape, inputs[1].shape)
+
+
+def _reduction(shape, operand_shape, dtype):
+    """Axes and buffer that sum a gradient of ``shape`` back to ``operand_shape``."""
+    if shape == operand_shape:
+        return None
+    padded = (1,) * (len(shape) - len(operand_shape)) + tuple(operand_shape)
+    axes = tuple(axis for axis, (n, m) in enumerate(zip(shape, padded)) if m == 1 and n != 1)
+    axes += tuple(range(len(shape) - len(operand_shape)))
+    axes = tuple(sorted(set(axes)))
+    kept = tuple(1 if axis in axes else n for axis, n in enumerate(shape))
+    return axes, np.empty(kept, dtype)
+
+
+class Tape:
+    """Records operations on :class:`Node` values for reverse-mode differentiation."""
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.nodes = []
+
+    def _leaf(self, value, name, requires_grad):
+        node = Node(self, name, None, (), np.array(value, self.dtype), requires_grad)
+        self.nodes.append(node)
+        return node
+
+    def input(self, value, name=None):
+        """A value to differentiate through but not with respect to (data, targets)."""
+        return self._leaf(value, name, False)
+
+    constant = input
+
+    def parameter(self, value, name=None):
+        """A value whose gradient :meth:`backward` computes (weights, biases)."""
+        return self._leaf(value, name, True)
+
+    def record(self, op, *inputs, name=None):
+        """Compute ``op`` on ``inputs`` now and append it to the tape."""
+        shape = _output_shape(op, inputs)
+        requires_grad = any(node.grad is not None for node in inputs)
+        node = Node(self, name, op, inputs, np.empty(shape, self.dtype), requires_grad)
+        if requires_grad:
+            if op == 'matmul':
+                node._scratch = (np.empty(inputs[0].shape, self.dtype),
+                                 np.empty(inputs[1].shape, self.dtype))
+            elif op in ('total', 'mean'):
+                node._scratch = np.empty(inputs[0].shape, self.dtype)
+            elif op != 'add':
+                node._scratch = np.empty(shape, self.dtype)
+            scratch_shape = inputs[0].shape if op in ('total', 'mean') else shape
+            node._reduce = [_reduction(scratch_shape, operand.shape, self.dtype)
+                            if operand.grad is not None else None for operand in inputs]
+        _forward(node)
+        self.nodes.append(node)
+        return node
+
+    def forward(self):
+        """Recompute every value in place, e.g. after assigning new inputs."""
+        for node in self.nodes:
+            if node.op is not None:
+                _forward(node)
+
+    def backward(self, output):
+        """Fill the ``grad`` of every node ``output`` depends on with d output / d node.
+
+        ``output`` is seeded with ones (for a scalar loss, d loss / d loss = 1).
+        """
+        if output.grad is None:
+            raise ValueError(f'{output!r} does not depend on any parameter')
+        for node in self.nodes:
+            if node.grad is not None:
+                node.grad.fill(0)
+        output.grad.fill(1)
+        position = self.nodes.index(output)
+        for node in reversed(self.nodes[:position + 1]):
+            if node.op is not None and node.grad is not None:
+                _backward(node)
+
+
+def sigmoid(node, name=None):
+    return node.tape.record('sigmoid', node, name=name)
+
+
+def square(node, name=None):
+    return node.tape.record('square', node, name=name)
+
+
+def total(node, name=None):
+    return node.tape.record('total', node, name=name)
+
+
+def mean(node, name=None):
+    return node.tape.record('mean', node, name=name)
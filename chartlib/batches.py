@@ -0,0 +1,192 @@
+"""
+Shuffled mini-batches from in-memory or memory-mapped arrays.
+
+:class:`BatchLoader` streams an epoch of mini-batches from one or more
+arrays with the same number of rows (features and targets), which may be
+ordinary arrays or memory maps (``np.load(path, mmap_mode='r')``) larger
+than memory. Nothing is copied up front:
+
+* each epoch draws a permutation of row *blocks* (``block`` consecutive
+  rows, 1 for a full per-row shuffle) and cuts the expanded row order into
+  batches;
+* a batch's row indices are sorted before the gather, so ``np.take`` reads
+  the source front to back (for a memory map, page by page), and rows of
+  the same block are read as contiguous runs; the order of the rows within
+  a batch does not change its gradient;
+* rows are gathered with ``np.take(..., out=)`` into a small ring of
+  preallocated batch buffers, which are reused for the whole run.
+
+With ``prefetch`` > 0 a background thread gathers the next batches while
+the caller computes on the current one (numpy releases the GIL while it
+copies, and memory-map page faults are served then too). Batches are
+yielded as views of the ring buffers: a batch is valid until the next one
+is requested, so copy it to keep it.
+
+``python -m chartlib.batches`` reports samples per second by batch size.
+"""
+
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+class BatchLoader:
+    """Epochs of shuffled ``batch_size`` batches of the rows of ``arrays``."""
+
+    def __init__(self, *arrays, batch_size=32, shuffle=True, block=1, prefetch=2, seed=0,
+                 drop_last=False):
+        if not arrays:
+            raise ValueError('a loader needs at least one array')
+        self.rows = len(arrays[0])
+        if any(len(array) != self.rows for array in arrays):
+            raise ValueError('arrays must have the same number of rows')
+        if batch_size < 1 or block < 1:
+            raise ValueError('batch_size and block must be positive')
+        self.arrays = arrays
+        self.batch_size = min(batch_size, self.rows)
+        self.shuffle, self.block, self.prefetch = shuffle, block, prefetch
+        self.drop_last = drop_last
+        self.rng = np.random.default_rng(seed)
+        # One buffer set is being filled, one is held by the caller, the rest are queued.
+        self._ring = [[np.empty((self.batch_size,) + array.shape[1:], array.dtype)
+                       for array in arrays] for _ in range(prefetch + 2)]
+        self._indices = [np.empty(self.batch_size, np.intp) for _ in self._ring]
+
+    def __len__(self):
+        full, rest = divmod(self.rows, self.batch_size)
+        return full + (rest > 0 and not self.drop_last)
+
+    def order(self):
+        """The row order of the next epoch (a block-wise permutation when shuffling)."""
+        if not self.shuffle:
+            return np.arange(self.rows)
+        if self.block == 1:
+            return self.rng.permutation(self.rows)
+        starts = self.rng.permutation(np.arange(0, self.rows, self.block))
+        rows = (starts[:, None] + np.arange(self.block)).ravel()
+        return rows[rows < self.rows]
+
+    def _gather(self, slot, rows):
+        indices = self._indices[slot][:len(rows)]
+        np.copyto(indices, rows)
+        indices.sort()
+        # mode='clip' skips the bounds check that makes take() buffer its output
+        return tuple(np.take(array, indices, axis=0, out=buffer[:len(rows)], mode='clip')
+                     for array, buffer in zip(self.arrays, self._ring[slot]))
+
+    def _batches(self):
+        order = self.order()
+        for start in range(0, len(self) * self.batch_size, self.batch_size):
+            yield order[start:start + self.batch_size]
+
+    def __iter__(self):
+        """One epoch of batches: a tuple with one view per array."""
+        batches = self._batches()
+        if not self.prefetch:
+            for rows in batches:
+                yield self._gather(0, rows)
+            return
+        free, ready = queue.Queue(), queue.Queue(self.prefetch)
+        for slot in range(len(self._ring)):
+            free.put(slot)
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for rows in batches:
+                    slot = free.get()
+                    if slot is None or stop.is_set():
+                        return
+                    ready.put((slot, self._gather(slot, rows)))
+                ready.put(None)
+            except BaseException as exc:  # re-raised in the consumer
+                ready.put(exc)
+
+        worker = threading.Thread(target=produce, name='batch-prefetch', daemon=True)
+        worker.start()
+        held = None
+        try:
+            while True:
+                item = ready.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                if held is not None:
+                    free.put(held)
+                held, batch = item
+                yield batch
+        finally:
+            # Wake the producer whether it waits for a free slot or for room in the queue.
+            stop.set()
+            free.put(None)
+            while worker.is_alive():
+                try:
+                    ready.get_nowait()
+                except queue.Empty:
+                    worker.join(0.01)
+
+    def batches(self, count):
+        """``count`` batches, continuing into new epochs as needed."""
+        while count > 0:
+            for batch in self:
+                yield batch
+                count -= 1
+                if count == 0:
+                    return
+
+
+def sgd_path(loader, gradient, start, steps, learning_rate):
+    """Weights after each of ``steps`` updates ``w -= learning_rate * gradient(*batch, w)``.
+
+    Returns a ``(steps + 1, D)`` array whose first row is ``start``.
+    """
+    path = np.empty((steps + 1, len(start)))
+    path[0] = start
+    for step, batch in enumerate(loader.batches(steps), 1):
+        path[step] = path[step - 1] - learning_rate * gradient(*batch, path[step - 1])
+    return path
+
+
+def benchmark(rows=1_000_000, features=32, batch_sizes=(1, 32, 256, 4096, 65_536),
+              max_batches=20_000, report=print):
+    """Samples per second of :class:`BatchLoader`, in memory and memory-mapped.
+
+    Each batch is reduced to a sum so the loop does a little work per batch;
+    small batch sizes stop after ``max_batches`` batches. Returns
+    ``{(source, batch size, prefetch): samples per second}``.
+    """
+    import tempfile
+    from pathlib import Path
+
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(rows, features)).astype(np.float32)
+    targets = rng.normal(size=rows).astype(np.float32)
+    results = {}
+    report(f"{'source':8s} {'batch':>7s} {'prefetch':>8s} {'samples':>9s} {'samples/s':>14s}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'features.npy'
+        np.save(path, data)
+        mapped = np.load(path, mmap_mode='r')
+        for source, array in (('memory', data), ('mmap', mapped)):
+            for batch_size in batch_sizes:
+                for prefetch in (0, 2):
+                    loader = BatchLoader(array, targets, batch_size=batch_size, prefetch=prefetch)
+                    count = min(len(loader), max_batches)
+                    total, samples = 0.0, 0
+                    start = time.perf_counter()
+                    for x, y in loader.batches(count):
+                        total += float(x.sum())
+                        samples += len(x)
+                    seconds = time.perf_counter() - start
+                    results[source, batch_size, prefetch] = samples / seconds
+                    report(f'{source:8s} {batch_size:7d} {prefetch:8d} {samples:9d} '
+                           f'{samples / seconds:14,.0f}')
+        del mapped
+    return results
+
+
+if __name__ == '__main__':
+    benchmark()
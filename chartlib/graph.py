@@ -0,0 +1,489 @@
+"""
+Computational graphs executed with liveness-based buffer reuse.
+
+:class:`~chartlib.autodiff.Tape` computes as it records and keeps every
+value, gradient and scratch buffer for the life of the tape. A
+:class:`Graph` is declared first and run later: its nodes are operations
+(:class:`Op`), the edges between them are tensors, and nothing is computed
+or allocated until an :class:`Executor` plans it. The same operators and
+functions work on both (``w * x + b``, :func:`~chartlib.autodiff.sigmoid`,
+:func:`~chartlib.autodiff.mean`, ...) and the kernels are shared.
+
+The executor schedules the operations the output depends on in topological
+order, followed by their backward rules in reverse order, and works out for
+every tensor the steps during which it is live:
+
+* a value lives from its forward step until its last reader, which is a
+  forward consumer or a backward rule that needs it (``sigmoid`` reads its
+  own output, ``mul`` and ``matmul`` their operands, ``square`` its input;
+  ``add``, ``sub`` and the reductions need no values at all);
+* a gradient lives from the first backward rule that adds to it until the
+  node's own backward step; scratch lives for one backward step.
+
+Tensors whose lifetimes do not overlap share a buffer, so the activations
+of a deep MLP that backward never reads (the pre-bias products and the
+pre-activations) and every intermediate gradient reuse a handful of
+buffers. Because the assignment is static, each node's tensors are bound to
+views of those buffers once, and :meth:`Executor.run` allocates nothing.
+Inputs, parameters and parameter gradients are kept for the life of the
+graph; after a run, only the output and the parameter gradients are
+meaningful. The executor binds the graph's nodes to its buffers, so a graph
+has one executor at a time.
+
+``python -m chartlib.graph`` compares the planned peak memory and the
+iteration time with the tape for a deep MLP.
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .autodiff import Node, _backward, _forward, _output_shape, _reduction
+
+
+class Op(Node):
+    """A node of a :class:`Graph`: a leaf (input, parameter, constant) or an operation."""
+
+    __slots__ = ('_shape', 'requires_grad', 'group')
+
+    def __init__(self, graph, name, op, inputs, shape, requires_grad, group, value=None):
+        self.tape, self.name, self.op, self.inputs = graph, name, op, inputs
+        self._shape = tuple(shape)
+        self.requires_grad, self.group = requires_grad, group
+        self.value = value
+        self.grad = np.zeros_like(value) if requires_grad and op is None else None
+        self._scratch = None
+        self._reduce = []
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def graph(self):
+        return self.tape
+
+    @property
+    def nbytes(self):
+        return int(np.prod(self._shape, dtype=np.int64)) * self.tape.dtype.itemsize
+
+    def __repr__(self):
+        return f'Op({self.name or self.op}, shape={self.shape})'
+
+
+def _scratch_shapes(node):
+    """Shapes of the scratch buffers ``node``'s backward rule writes to."""
+    if node.op == 'matmul':
+        return [operand.shape for operand in node.inputs]
+    if node.op in ('total', 'mean'):
+        return [node.inputs[0].shape]
+    if node.op == 'add':
+        return []
+    return [node.shape]
+
+
+def _backward_reads(node):
+    """The nodes whose values ``node``'s backward rule reads."""
+    if node.op == 'sigmoid':
+        return [node]
+    if node.op == 'square':
+        return [node.inputs[0]]
+    if node.op in ('mul', 'matmul'):
+        a, b = node.inputs
+        return [a] * b.requires_grad + [b] * a.requires_grad
+    return []
+
+
+def _flops(node):
+    """Floating-point operations of ``node``'s forward and backward rules, as written.
+
+    A ``(m, k) @ (k, n)`` product counts ``2mkn``, elementwise kernels one
+    per element and step (the sigmoid's negate, exp, add and reciprocal are
+    four), and adding a contribution into an input's gradient one per element.
+    """
+    size = int(np.prod(node.shape, dtype=np.int64))
+    inputs = node.inputs
+    wants = [operand.requires_grad for operand in inputs]
+    if node.op == 'matmul':
+        (m, k), (_, n) = inputs[0].shape, inputs[1].shape
+        product = 2 * m * k * n
+        return product, (product + m * k) * wants[0] + (product + k * n) * wants[1]
+    if node.op in ('total', 'mean'):
+        count = int(np.prod(inputs[0].shape, dtype=np.int64))
+        return count + (node.op == 'mean'), count * (1 + (node.op == 'mean'))
+    if node.op == 'sigmoid':
+        return 4 * size, 4 * size
+    if node.op == 'square':
+        return size, 3 * size
+    if node.op == 'mul':
+        return size, 2 * size * sum(wants)
+    if node.op == 'sub':
+        return size, size * wants[0] + 2 * size * wants[1]
+    return size, size * sum(wants)
+
+
+class Graph:
+    """Operations declared on :class:`Op` nodes, to be planned and run by an :class:`Executor`."""
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.nodes = []
+        self._group = None
+
+    @contextmanager
+    def group(self, name):
+        """Tag the nodes declared in the ``with`` block (e.g. with their layer)."""
+        outer, self._group = self._group, name
+        try:
+            yield
+        finally:
+            self._group = outer
+
+    def _add(self, node):
+        self.nodes.append(node)
+        return node
+
+    def input(self, name, shape):
+        """Data fed to every :meth:`Executor.run` (copied into a buffer of ``shape``)."""
+        return self._add(Op(self, name, None, (), shape, False, self._group,
+                            np.zeros(shape, self.dtype)))
+
+    def constant(self, value, name=None):
+        value = np.array(value, self.dtype)
+        return self._add(Op(self, name, None, (), value.shape, False, self._group, value))
+
+    def parameter(self, name, value):
+        """A value whose gradient the executor computes (weights, biases)."""
+        value = np.array(value, self.dtype)
+        return self._add(Op(self, name, None, (), value.shape, True, self._group, value))
+
+    def record(self, op, *inputs, name=None):
+        """Declare ``op`` on ``inputs``; nothing is computed until the graph runs."""
+        return self._add(Op(self, name, op, inputs, _output_shape(op, inputs),
+                            any(node.requires_grad for node in inputs), self._group))
+
+    def edges(self, nodes=None):
+        """``(source, target)`` pairs, one per tensor flowing into an operation."""
+        return [(source, node) for node in (self.nodes if nodes is None else nodes)
+                for source in node.inputs]
+
+    def schedule(self, output):
+        """The nodes ``output`` depends on, in a topological (execution) order."""
+        order, state, stack = [], {}, [(output, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if state.get(id(node)) is not None:
+                continue
+            state[id(node)] = True
+            stack.append((node, True))
+            stack.extend((source, False) for source in reversed(node.inputs)
+                         if id(source) not in state)
+        return order
+
+
+@dataclass(frozen=True)
+class OpStats:
+    """Memory, work and time of one operation in an executor's plan."""
+
+    node: Op
+    # Bytes of the node's value, and whether it stays live into the backward pass.
+    nbytes: int
+    kept: bool
+    # Floating-point operations of the forward and backward rules (0 if not run backward).
+    forward_flops: int = 0
+    backward_flops: int = 0
+    # Mean seconds per run of the forward and backward rules (0 unless profiled).
+    forward: float = 0.0
+    backward: float = 0.0
+
+
+class Executor:
+    """Runs a :class:`Graph` forward to ``output`` and backward from it with pooled buffers."""
+
+    def __init__(self, graph, output):
+        if not output.requires_grad:
+            raise ValueError(f'{output!r} does not depend on any parameter')
+        self.graph, self.output = graph, output
+        self.nodes = graph.schedule(output)
+        self.ops = [node for node in self.nodes if node.op is not None]
+        self.parameters = [node for node in self.nodes if node.op is None and node.requires_grad]
+        self.inputs = {node.name: node for node in self.nodes
+                       if node.op is None and not node.requires_grad and node.name}
+        self._backward_ops = [node for node in reversed(self.ops) if node.requires_grad]
+        self.forward_steps = len(self.ops)
+        self.lifetimes = self._lifetimes()
+        self._bind(self._assign())
+
+    def _lifetimes(self):
+        """``{(kind, node, index): [first step, last step]}`` of every pooled tensor."""
+        forward = {id(node): step for step, node in enumerate(self.ops)}
+        backward = {id(node): self.forward_steps + step
+                    for step, node in enumerate(self._backward_ops)}
+        lifetimes = {}
+
+        def extend(key, step):
+            span = lifetimes.setdefault(key, [step, step])
+            span[0], span[1] = min(span[0], step), max(span[1], step)
+
+        last = self.forward_steps + len(self._backward_ops) - 1
+        for node in self.ops:
+            extend(('value', node, 0), forward[id(node)])
+            for source in node.inputs:
+                if source.op is not None:
+                    extend(('value', source, 0), forward[id(node)])
+            if node.requires_grad:
+                step = backward[id(node)]
+                for source in _backward_reads(node):
+                    if source.op is not None:
+                        extend(('value', source, 0), step)
+                extend(('grad', node, 0), step)
+                for source in node.inputs:
+                    if source.op is not None and source.requires_grad:
+                        extend(('grad', source, 0), step)
+                for index, _ in enumerate(_scratch_shapes(node)):
+                    extend(('scratch', node, index), step)
+        extend(('value', self.output, 0), last)
+        return lifetimes
+
+    def _assign(self):
+        """Give every tensor a buffer no other live tensor uses; return the assignment."""
+        events = sorted(self.lifetimes.items(), key=lambda item: item[1][0])
+        sizes, free, assignment, releases = [], [], {}, {}
+        position = 0
+        for step in range(self.forward_steps + len(self._backward_ops)):
+            while position < len(events) and events[position][1][0] == step:
+                key, (_, end) = events[position]
+                size = max(1, int(np.prod(self._tensor_shape(key), dtype=np.int64)))
+                fits = [buffer for buffer in free if sizes[buffer] >= size]
+                if fits:
+                    buffer = min(fits, key=sizes.__getitem__)
+                elif free:
+                    buffer = max(free, key=sizes.__getitem__)
+                    sizes[buffer] = size
+                else:
+                    buffer = len(sizes)
+                    sizes.append(size)
+                if buffer in free:
+                    free.remove(buffer)
+                assignment[key] = buffer
+                releases.setdefault(end, []).append(buffer)
+                position += 1
+            free.extend(releases.pop(step, []))
+        self._sizes = sizes
+        return assignment
+
+    def _tensor_shape(self, key):
+        kind, node, index = key
+        return _scratch_shapes(node)[index] if kind == 'scratch' else node.shape
+
+    def _bind(self, assignment):
+        dtype = self.graph.dtype
+        self.buffers = [np.empty(size, dtype) for size in self._sizes]
+        views = {key: self.buffers[buffer][:max(1, int(np.prod(self._tensor_shape(key))))]
+                 .reshape(self._tensor_shape(key)) for key, buffer in assignment.items()}
+        self._zero = [[] for _ in self._backward_ops]
+        first = {}
+        for key, (start, _) in self.lifetimes.items():
+            if key[0] == 'grad':
+                first[id(key[1])] = start
+        for node in self.ops:
+            node.value = views['value', node, 0]
+            node.grad = views.get(('grad', node, 0))
+            scratch = [views['scratch', node, index]
+                       for index, _ in enumerate(_scratch_shapes(node))]
+            node._scratch = (tuple(scratch) if node.op == 'matmul'
+                             else scratch[0] if scratch else None)
+            node._reduce = []
+            if node.requires_grad:
+                scratch_shape = node.inputs[0].shape if node.op in ('total', 'mean') else node.shape
+                node._reduce = [_reduction(scratch_shape, operand.shape, dtype)
+                                if operand.requires_grad else None for operand in node.inputs]
+            if node.grad is not None and node is not self.output:
+                self._zero[first[id(node)] - self.forward_steps].append(node.grad)
+
+    @property
+    def peak_bytes(self):
+        """Bytes of the pooled buffers: the peak memory of values, gradients and scratch."""
+        return sum(buffer.nbytes for buffer in self.buffers)
+
+    @property
+    def unshared_bytes(self):
+        """Bytes the same tensors take with one buffer each, as on a tape."""
+        itemsize = self.graph.dtype.itemsize
+        return sum(max(1, int(np.prod(self._tensor_shape(key)))) * itemsize
+                   for key in self.lifetimes)
+
+    def _feed(self, feeds):
+        for name, value in feeds.items():
+            if name not in self.inputs:
+                raise KeyError(f'graph has no input {name!r}')
+            np.copyto(self.inputs[name].value, value, casting='same_kind')
+
+    def run(self, feeds=None, timings=None):
+        """Run forward and backward after copying ``feeds`` (``{name: array}``) into the inputs.
+
+        Returns the output node; the parameters' ``grad`` hold d output / d
+        parameter. ``timings``, when given, is a ``(2, ops)`` array to which
+        the seconds of each forward and backward rule are added.
+        """
+        self._feed(feeds or {})
+        for parameter in self.parameters:
+            parameter.grad.fill(0)
+        with np.errstate(over='ignore'):
+            if timings is None:
+                for node in self.ops:
+                    _forward(node)
+                self.output.grad.fill(1)
+                for zero, node in zip(self._zero, self._backward_ops):
+                    for grad in zero:
+                        grad.fill(0)
+                    _backward(node)
+                return self.output
+            clock = time.perf_counter
+            for index, node in enumerate(self.ops):
+                start = clock()
+                _forward(node)
+                timings[0, index] += clock() - start
+            self.output.grad.fill(1)
+            positions = {id(node): index for index, node in enumerate(self.ops)}
+            for zero, node in zip(self._zero, self._backward_ops):
+                start = clock()
+                for grad in zero:
+                    grad.fill(0)
+                _backward(node)
+                timings[1, positions[id(node)]] += clock() - start
+        return self.output
+
+    def costs(self):
+        """:class:`OpStats` of every operation from the plan alone: bytes, liveness and FLOPs.
+
+        Unlike :meth:`profile` nothing is run, so the numbers are the same on every machine.
+        """
+        backward_start = self.forward_steps
+        stats = []
+        for node in self.ops:
+            forward, backward = _flops(node)
+            stats.append(OpStats(node, node.nbytes,
+                                 self.lifetimes['value', node, 0][1] >= backward_start,
+                                 forward, backward if node.requires_grad else 0))
+        return stats
+
+    def profile(self, feeds=None, repeat=20):
+        """:meth:`costs` with the seconds of each rule, timed over ``repeat`` runs after warm-up."""
+        self.run(feeds)
+        timings = np.zeros((2, len(self.ops)))
+        for _ in range(repeat):
+            self.run(feeds, timings)
+        timings /= repeat
+        return [replace(stat, forward=timings[0, index], backward=timings[1, index])
+                for index, stat in enumerate(self.costs())]
+
+
+def layout(executor):
+    """``{node: (column, row)}`` for drawing an executor's graph from left to right.
+
+    Operations sit in row 0 at their depth (the longest path from a leaf);
+    leaves go one column before their first consumer, stacked above the
+    operation in that column, or in row 0 when the column has none.
+    """
+    depth = {}
+    for node in executor.ops:
+        depth[id(node)] = 1 + max((depth.get(id(source), 0) for source in node.inputs), default=0)
+    for node in executor.nodes:
+        if node.op is None:
+            consumers = [depth[id(op)] for op in executor.ops if node in op.inputs]
+            depth[id(node)] = min(consumers) - 1
+    columns = {}
+    for node in executor.nodes:
+        columns.setdefault(depth[id(node)], []).append(node)
+    positions = {}
+    for column, nodes in columns.items():
+        ops = [node for node in nodes if node.op is not None]
+        leaves = [node for node in nodes if node.op is None]
+        for row, node in enumerate(ops + leaves):
+            positions[node] = (column - min(columns), row)
+    return positions
+
+
+def mlp(sizes, rows, activation='sigmoid', seed=0, dtype=np.float64):
+    """A sigmoid MLP with mean squared error on a graph; returns ``(graph, loss)``.
+
+    ``sizes`` lists the layer widths, inputs first. Each layer is declared in
+    a group named ``h1``, ``h2``, ... and ``y_hat`` for the output, so that
+    per-layer costs can be summed from :meth:`Executor.costs` or
+    :meth:`Executor.profile`; the inputs are named ``x`` and ``y``.
+    """
+    from .autodiff import mean, sigmoid, square
+
+    rng = np.random.default_rng(seed)
+    graph = Graph(dtype)
+    with graph.group('x'):
+        a = graph.input('x', (rows, sizes[0]))
+    for layer, (n_in, n_out) in enumerate(zip(sizes, sizes[1:]), 1):
+        name = 'y_hat' if layer == len(sizes) - 1 else f'h{layer}'
+        with graph.group(name):
+            weights = graph.parameter(f'W{layer}', rng.normal(0, 1 / np.sqrt(n_in), (n_in, n_out)))
+            bias = graph.parameter(f'b{layer}', np.zeros(n_out))
+            a = sigmoid(a @ weights + bias, name=name)
+    with graph.group('L'):
+        y = graph.input('y', (rows, sizes[-1]))
+        loss = mean(square(a - y), name='L')
+    return graph, loss
+
+
+def benchmark(sizes=(16, 256, 256, 256, 256, 256, 256, 256, 256, 1), rows=4096, repeat=20,
+              report=print):
+    """Peak memory and seconds per training iteration: executor against tape.
+
+    Returns ``{'executor': (peak bytes, seconds), 'tape': (bytes, seconds)}``.
+    """
+    from .autodiff import Tape, mean, sigmoid, square
+
+    rng = np.random.default_rng(1)
+    x, y = rng.normal(size=(rows, sizes[0])), rng.uniform(size=(rows, sizes[-1]))
+    graph, loss = mlp(sizes, rows)
+    executor = Executor(graph, loss)
+    executor.run({'x': x, 'y': y})
+    start = time.perf_counter()
+    for _ in range(repeat):
+        executor.run({'x': x, 'y': y})
+    seconds = (time.perf_counter() - start) / repeat
+
+    tape = Tape()
+    a = tape.input(x)
+    for parameter in graph.nodes:
+        if parameter.name and parameter.name.startswith('W'):
+            weights = tape.parameter(parameter.value)
+        elif parameter.name and parameter.name.startswith('b'):
+            a = sigmoid(a @ weights + tape.parameter(parameter.value))
+    tape_loss = mean(square(a - tape.input(y)))
+    tape.backward(tape_loss)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        tape.forward()
+        tape.backward(tape_loss)
+    tape_seconds = (time.perf_counter() - start) / repeat
+    tape_bytes = 0
+    for node in tape.nodes:
+        if node.op is not None:
+            scratch = node._scratch if isinstance(node._scratch, tuple) else (node._scratch,)
+            tape_bytes += sum(array.nbytes for array in (node.value, node.grad, *scratch)
+                              if array is not None)
+    assert np.isclose(tape_loss.item(), executor.output.item())
+
+    layers = '-'.join(map(str, sizes))
+    report(f'MLP {layers}, {rows:,} rows, {len(executor.ops)} operations')
+    report(f'{"":10s} {"peak MB":>9s} {"ms/iteration":>13s}')
+    report(f'{"tape":10s} {tape_bytes / 1e6:9.1f} {tape_seconds * 1e3:13.1f}')
+    report(f'{"executor":10s} {executor.peak_bytes / 1e6:9.1f} {seconds * 1e3:13.1f}  '
+           f'({len(executor.buffers)} buffers for {len(executor.lifetimes)} tensors)')
+    return {'executor': (executor.peak_bytes, seconds), 'tape': (tape_bytes, tape_seconds)}
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,192 @@
+"""
+Vectorised gradient-descent trajectories.
+
+The gradient-descent charts follow optimizers across a loss surface. Rather
+than stepping one point in a Python loop, :func:`optimize` advances ``K``
+trajectories in ``D`` dimensions together as ``(K, D)`` arrays: every step
+is a handful of ufuncs over all of them, whatever ``K`` is. Each trajectory
+may have its own start point, learning rate, momentum and ``beta2``
+(scalars or ``(K,)`` arrays), so a sweep over start points and
+hyperparameters is one call; :func:`sweep` builds the combinations.
+
+Supported methods (``METHODS``), with ``g`` the gradient, ``eta`` the
+learning rate and ``beta`` the momentum:
+
+``sgd``       ``w -= eta g``
+``momentum``  ``v = beta v - eta g``, ``w += v``
+``nesterov``  as momentum, with ``g`` taken at the look-ahead ``w + beta v``
+``rmsprop``   ``s = beta2 s + (1 - beta2) g^2``, ``w -= eta g / (sqrt(s) + eps)``
+``adam``      bias-corrected first and second moments (``beta``, ``beta2``)
+
+Positions are written to a ``(steps + 1, K, D)`` history array, preallocated
+or passed in as ``out``, and the optimizer state, gradient and scratch
+arrays are allocated once per call, so a step allocates nothing. The
+gradient is a callable ``gradient(w, out)`` that writes the gradient of
+the loss at ``w`` into ``out``; :func:`quadratic` makes one for the bowls
+the charts draw.
+
+``python -m chartlib.optimizers`` reports trajectory steps per second.
+"""
+
+import time
+
+import numpy as np
+
+METHODS = ('sgd', 'momentum', 'nesterov', 'rmsprop', 'adam')
+
+
+def quadratic(scales):
+    """The gradient of ``sum(scales * w ** 2) / 2``, i.e. ``scales * w``, for :func:`optimize`."""
+    scales = np.asarray(scales, dtype=float)
+
+    def gradient(w, out):
+        np.multiply(w, scales, out=out)
+
+    return gradient
+
+
+def _per_trajectory(value, count):
+    """``value`` (a scalar or ``(K,)`` array) as a ``(K, 1)`` column."""
+    column = np.empty((count, 1))
+    column[:, 0] = value
+    return column
+
+
+def sweep(starts, **hyperparameters):
+    """Every combination of ``starts`` and the hyperparameter values, as :func:`optimize` arguments.
+
+    ``starts`` is ``(S, D)`` (or one ``(D,)`` point) and each keyword a
+    sequence of values; returns ``(starts, hyperparameters)`` with ``K``
+    rows, start points varying slowest, for example::
+
+        starts, rates = sweep([2.5, 2.0], learning_rate=np.linspace(0.05, 0.45, 9))
+        history = optimize(gradient, starts, 20, **rates)
+    """
+    starts = np.atleast_2d(np.asarray(starts, dtype=float))
+    values = [np.atleast_1d(np.asarray(value, dtype=float)) for value in hyperparameters.values()]
+    grids = np.meshgrid(np.arange(len(starts)), *values, indexing='ij')
+    return starts[grids[0].ravel()], {name: grid.ravel() for name, grid in
+                                      zip(hyperparameters, grids[1:])}
+
+
+def optimize(gradient, starts, steps, method='sgd', learning_rate=0.1, momentum=0.9,
+             beta2=0.999, eps=1e-8, out=None):
+    """Positions of ``K`` trajectories over ``steps`` steps: a ``(steps + 1, K, D)`` array.
+
+    ``starts`` is ``(K, D)``, or one ``(D,)`` point shared by ``K``
+    trajectories when a hyperparameter is a ``(K,)`` array. ``history[0]``
+    holds the starts; the result is written to ``out`` when given.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}; choose from {', '.join(METHODS)}")
+    starts = np.asarray(starts, dtype=float)
+    if starts.ndim == 1:
+        count = max(np.size(value) for value in (learning_rate, momentum, beta2))
+        starts = np.broadcast_to(starts, (count, len(starts)))
+    count, dims = starts.shape
+    history = np.empty((steps + 1, count, dims)) if out is None else out
+    if history.shape != (steps + 1, count, dims):
+        raise ValueError(f'out has shape {history.shape}, expected {(steps + 1, count, dims)}')
+    eta = _per_trajectory(learning_rate, count)
+    beta = _per_trajectory(momentum, count)
+    decay = _per_trajectory(beta2, count)
+    keep, keep_squares = 1 - beta, 1 - decay
+    w = np.array(starts)
+    grad = np.empty_like(w)
+    scratch = np.empty_like(w)
+    velocity = np.zeros_like(w) if method != 'sgd' else None
+    squares = np.zeros_like(w) if method in ('rmsprop', 'adam') else None
+    if method == 'adam':
+        # 1 - beta ** t, per trajectory
+        corrections = np.empty((2, count, 1))
+        powers = np.ones((2, count, 1))
+        rates = np.concatenate([beta, decay]).reshape(2, count, 1)
+    history[0] = w
+    for step in range(1, steps + 1):
+        if method == 'nesterov':
+            np.multiply(velocity, beta, out=scratch)
+            scratch += w
+            gradient(scratch, grad)
+        else:
+            gradient(w, grad)
+        if method in ('sgd', 'momentum', 'nesterov'):
+            np.multiply(grad, eta, out=scratch)
+            if method == 'sgd':
+                w -= scratch
+            else:
+                velocity *= beta
+                velocity -= scratch
+                w += velocity
+        else:
+            # s = beta2 s + (1 - beta2) g^2
+            np.multiply(grad, grad, out=scratch)
+            scratch -= squares
+            scratch *= keep_squares
+            squares += scratch
+            if method == 'rmsprop':
+                np.sqrt(squares, out=scratch)
+                step_direction = grad
+            else:
+                # m = beta m + (1 - beta) g, held in velocity
+                np.subtract(grad, velocity, out=scratch)
+                scratch *= keep
+                velocity += scratch
+                powers *= rates
+                np.subtract(1, powers, out=corrections)
+                np.divide(squares, corrections[1], out=scratch)
+                np.sqrt(scratch, out=scratch)
+                step_direction = np.divide(velocity, corrections[0], out=grad)
+            scratch += eps
+            np.divide(step_direction, scratch, out=scratch)
+            scratch *= eta
+            w -= scratch
+        history[step] = w
+    return history
+
+
+def _loop(gradient_scale, start, steps, learning_rate, momentum):
+    """One momentum trajectory stepped in Python, as the charts used to."""
+    path_x, path_y = [start[0]], [start[1]]
+    vel_x = vel_y = 0.0
+    for _ in range(steps):
+        vel_x = momentum * vel_x - learning_rate * gradient_scale[0] * path_x[-1]
+        vel_y = momentum * vel_y - learning_rate * gradient_scale[1] * path_y[-1]
+        path_x.append(path_x[-1] + vel_x)
+        path_y.append(path_y[-1] + vel_y)
+    return path_x, path_y
+
+
+def benchmark(trajectories=(1, 100, 10_000), steps=100, report=print):
+    """Trajectory steps per second of :func:`optimize` on a 2-D bowl, by method and ``K``.
+
+    Also times the scalar Python loop the charts used to run, for one
+    trajectory at a time. Returns ``{(method, K): steps per second}``.
+    """
+    scales = np.array([1.0, 10.0])
+    gradient = quadratic(scales)
+    rng = np.random.default_rng(0)
+    results = {}
+    count = 200
+    start = time.perf_counter()
+    for _ in range(count):
+        _loop(scales, (-2.5, 1.2), steps, 0.15, 0.9)
+    seconds = time.perf_counter() - start
+    results['python loop', 1] = count * steps / seconds
+    report(f"{'method':12s} {'K':>7s} {'seconds':>8s} {'steps/s':>14s}")
+    report(f"{'python loop':12s} {1:7d} {seconds / count:8.4f} {count * steps / seconds:14,.0f}")
+    for method in METHODS:
+        for count in trajectories:
+            starts = rng.uniform(-3, 3, (count, 2))
+            rates = rng.uniform(0.01, 0.15, count)
+            out = np.empty((steps + 1, count, 2))
+            optimize(gradient, starts, steps, method, rates, out=out)  # warm up
+            start = time.perf_counter()
+            optimize(gradient, starts, steps, method, rates, out=out)
+            seconds = time.perf_counter() - start
+            results[method, count] = count * steps / seconds
+            report(f'{method:12s} {count:7d} {seconds:8.4f} {count * steps / seconds:14,.0f}')
+    return results
+
+
+if __name__ == '__main__':
+    benchmark()
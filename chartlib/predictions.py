@@ -0,0 +1,186 @@
+"""
+Prediction-results charts for direction forecasts of any length.
+
+:func:`prediction_panel` shows one model's daily up/down calls against the
+actual direction: a bar per day (up above zero, down below) and a
+correctness marker on each bar. Bars are two ``bar`` calls and markers two
+``scatter`` calls whatever the number of days.
+
+Once there are more days than the axes can show (:data:`PIXELS_PER_DAY`
+pixels each), days are aggregated into equal bins: the bars become the share
+of up and down calls in each bin and the markers are coloured by the hit
+rate of those calls, red (0%) to green (100%). :func:`prediction_results`
+assembles the full before/after training figure.
+"""
+
+import numpy as np
+
+# Screen pixels a day needs before days are aggregated into bins.
+PIXELS_PER_DAY = 4
+# Metrics-panel y limits as a multiple of the tallest bar; the top of the
+# axes is left free for the legend and the improvement label.
+_HEADROOM = 1.6
+_HIT_CMAP = 'RdYlGn'
+
+
+def pixel_budget(ax, pixels_per_day=PIXELS_PER_DAY):
+    """Number of days ``ax`` can show individually at the figure's resolution."""
+    width = ax.get_window_extent().width
+    return max(int(width / pixels_per_day), 1)
+
+
+def aggregate(values, size):
+    """Sum ``values`` over consecutive bins of ``size`` (the last may be shorter)."""
+    starts = np.arange(0, len(values), size)
+    return np.add.reduceat(np.asarray(values, dtype=float), starts)
+
+
+def prediction_panel(ax, predictions, actual, budget=None):
+    """Draw up/down calls and their correctness on ``ax``; return the hit rate.
+
+    ``predictions`` and ``actual`` are equal-length arrays of 1 (up) and
+    0 (down). ``budget`` overrides the number of days shown individually.
+    """
+    predictions = np.asarray(predictions).astype(bool)
+    actual = np.asarray(actual).astype(bool)
+    if predictions.shape != actual.shape:
+        raise ValueError(f'{len(predictions)} predictions for {len(actual)} actual days')
+    correct = predictions == actual
+    days = len(predictions)
+    budget = pixel_budget(ax) if budget is None else budget
+
+    if days <= budget:
+        x = np.arange(days)
+        ax.bar(x[predictions], np.ones(predictions.sum()),
+               color='lightblue', alpha=0.6, label='Predicted: Up', edgecolor='blue')
+        ax.bar(x[~predictions], -np.ones((~predictions).sum()),
+               color='lightcoral', alpha=0.6, label='Predicted: Down', edgecolor='red')
+        y = np.where(predictions, 1, -1)
+        ax.scatter(x[correct], y[correct], marker='o', color='green',
+                   s=64, linewidths=2, zorder=3)
+        ax.scatter(x[~correct], y[~correct], marker='x', color='red', s=64, linewidths=2,
+                   zorder=3)
+        ax.set_ylim([-1.5, 1.5])
+        ax.set_yticks([-1, 1])
+        ax.set_yticklabels(['Down', 'Up'])
+        return correct.mean()
+
+    size = -(-days // budget)
+    counts = aggregate(np.ones(days), size)
+    up = aggregate(predictions, size)
+    down = counts - up
+    up_hits = aggregate(predictions & correct, size)
+    down_hits = aggregate(~predictions & correct, size)
+    x = np.arange(len(counts)) * size + (counts - 1) / 2  # bin centres in days
+    ax.bar(x, up / counts, width=size, color='lightblue', alpha=0.6, label='Predicted: Up',
+           linewidth=0)
+    ax.bar(x, -down / counts, width=size, color='lightcoral', alpha=0.6,
+           label='Predicted: Down', linewidth=0)
+    calls = np.concatenate([up, down])
+    hit_rate = np.divide(np.concatenate([up_hits, down_hits]), calls,
+                         out=np.zeros(len(calls)), where=calls > 0)
+    shown = calls > 0
+    marker_y = np.concatenate([up, -down]) / np.concatenate([counts, counts])
+    points = ax.scatter(np.concatenate([x, x])[shown], marker_y[shown], c=hit_rate[shown],
+                        cmap=_HIT_CMAP, vmin=0, vmax=1, s=12, linewidths=0, zorder=3)
+    ax.figure.colorbar(points, ax=ax, pad=0.01, fraction=0.04, label=f'Hit rate per {size} days')
+    ax.set_ylim([-1.25, 1.25])
+    ax.set_yticks([-1, 0, 1])
+    ax.set_yticklabels(['Down', '', 'Up'])
+    return correct.mean()
+
+
+def actual_panel(ax, prices, actual, budget=None):
+    """Price line with up/down markers, dropped once the days exceed the budget."""
+    prices = np.asarray(prices, dtype=float)
+    actual = np.asarray(actual).astype(bool)
+    days = np.arange(len(prices))
+    budget = pixel_budget(ax) if budget is None else budget
+    if len(prices) > budget:
+        ax.plot(days, prices, 'k-', linewidth=1, label='Actual Price')
+        return
+    ax.plot(days, prices, 'k-', linewidth=3, label='Actual Price', marker='o')
+    ax.scatter(days[actual], prices[actual], color='green', s=100, marker='^',
+               edgecolors='darkgreen', linewidth=2, label='Actual: Price Up', zorder=5)
+    ax.scatter(days[~actual], prices[~actual], color='red', s=100, marker='v',
+               edgecolors='darkred', linewidth=2, label='Actual: Price Down', zorder=5)
+
+
+def _metrics_panel(ax, before_correct, after_correct):
+    metrics = ['Accuracy', 'Correct\nPredictions', 'Wrong\nPredictions']
+    before_values = [before_correct.mean() * 100, before_correct.sum(), (~before_correct).sum()]
+    after_values = [after_correct.mean() * 100, after_correct.sum(), (~after_correct).sum()]
+    x = np.arange(len(metrics))
+    width = 0.35
+
+    # Day counts dwarf the accuracy percentage on long series; give them their
+    # own scale on the right.
+    count_ax = ax.twinx() if len(before_correct) > 100 else ax
+    bars = []
+    for offset, values, label, color, edge in [
+            (-width/2, before_values, 'Before Training', 'lightcoral', 'darkred'),
+            (width/2, after_values, 'After Training', 'lightgreen', 'darkgreen')]:
+        style = dict(color=color, edgecolor=edge, linewidth=2)
+        bars += ax.bar(x[:1] + offset, values[:1], width, label=label, **style)
+        bars += count_ax.bar(x[1:] + offset, values[1:], width, **style)
+    if count_ax is ax:
+        ax.set_ylim(0, max(before_values + after_values) * _HEADROOM)
+    else:
+        ax.set_ylim(0, max(before_values[0], after_values[0]) * _HEADROOM)
+        count_ax.set_ylim(0, max(before_values[1:] + after_values[1:]) * _HEADROOM)
+        count_ax.set_ylabel('Days', fontsize=11)
+    for bar in bars:
+        height = bar.get_height()
+        bar.axes.text(bar.get_x() + bar.get_width()/2., height,
+                      f'{height:.0f}' if height > 10 else f'{height:.1f}',
+                      ha='center', va='bottom', fontsize=10, fontweight='bold')
+
+    ax.set_ylabel('Value' if count_ax is ax else 'Accuracy (%)', fontsize=11)
+    ax.set_title('Performance Comparison', fontsize=12, fontweight='bold')
+    ax.set_xticks(x)
+    ax.set_xticklabels(metrics, fontsize=10)
+    ax.legend(fontsize=10, loc='upper right', ncol=2)
+    ax.grid(True, alpha=0.3, axis='y')
+
+    improvement = after_correct.mean() - before_correct.mean()
+    ax.annotate('', xy=(0 + width/2, after_values[0]), xytext=(0 - width/2, before_values[0]),
+                arrowprops=dict(arrowstyle='->', lw=3, color='darkgreen'))
+    # x in data, y in axes coordinates: the label stays inside the panel
+    # however tall the bars are.
+    ax.text(0, 0.95, f'{improvement:+.1%}\nImprovement', ha='center', va='top', fontsize=10,
+            fontweight='bold', color='darkgreen', transform=ax.get_xaxis_transform(),
+            bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7))
+
+
+def prediction_results(fig, prices, actual, before, after):
+    """Fill ``fig`` with the before/after training comparison for any number of days.
+
+    ``prices`` are the actual closing prices, ``actual`` the actual
+    directions and ``before``/``after`` the model's calls (1 up, 0 down).
+    """
+    gs = fig.add_gridspec(3, 2, hspace=0.35, wspace=0.3)
+
+    ax_actual = fig.add_subplot(gs[0, :])
+    actual_panel(ax_actual, prices, actual)
+    ax_actual.set_xlabel('Day', fontsize=11)
+    ax_actual.set_ylabel('Stock Price ($)', fontsize=11)
+    ax_actual.set_title('Ground Truth: Actual Price Movement', fontsize=12, fontweight='bold')
+    ax_actual.legend(loc='upper left', fontsize=9)
+    ax_actual.grid(True, alpha=0.3)
+
+    panels = [(gs[1, 0], before, 'BEFORE Training: Random Guessing', 'red'),
+              (gs[1, 1], after, 'AFTER Training: Learned Patterns', 'green')]
+    for spec, predictions, title, color in panels:
+        ax = fig.add_subplot(spec)
+        accuracy = prediction_panel(ax, predictions, actual)
+        ax.axhline(y=0, color='black', linewidth=1)
+        ax.set_xlabel('Day', fontsize=10)
+        ax.set_ylabel('Prediction', fontsize=10)
+        ax.set_title(f'{title}\nAccuracy: {accuracy:.1%}', fontsize=11, fontweight='bold',
+                     color=color)
+        ax.legend(loc='upper right', fontsize=8)
+        ax.grid(True, alpha=0.3, axis='x')
+
+    actual = np.asarray(actual).astype(bool)
+    _metrics_panel(fig.add_subplot(gs[2, :]), np.asarray(before).astype(bool) == actual,
+                   np.asarray(after).astype(bool) == actual)
@@ -0,0 +1,105 @@
+"""
+Per-class scatter plots that stay fast for any number of points.
+
+:func:`class_scatter` is a drop-in for ``ax.scatter(x, y, c=color, ...)``
+with one colour per call, as the classification charts use it. Up to
+:data:`DENSITY_THRESHOLD` points it is exactly that call. Above it, markers
+would cost an Agg stroke (and a PDF object) each, so the points are binned
+into a 2D histogram instead and drawn as one RGBA image in the class colour:
+opacity grows with the log of the count in each bin, up to the ``alpha`` the
+markers would have had, and the images of several classes composite over
+each other in call order. An empty scatter with the same style is added so
+the legend entry is unchanged.
+
+Binning streams: :func:`density_image` takes any iterable of ``(x, y)``
+chunks (memory-mapped columns, batches read from a store), and in-memory
+arrays are fed to it :data:`CHUNK` points at a time, so the extra memory is
+bounded by the chunk and the image, not by the number of points.
+"""
+
+import numpy as np
+
+# Points per call above which markers are replaced by a density image.
+DENSITY_THRESHOLD = 20_000
+# Image bins per inch of axes.
+DENSITY_DPI = 150
+CHUNK = 1_000_000
+
+
+def chunks(x, y, size=CHUNK):
+    """Yield ``(x, y)`` slices of at most ``size`` points."""
+    for begin in range(0, len(x), size):
+        yield x[begin:begin + size], y[begin:begin + size]
+
+
+def _data_extent(x, y):
+    bounds = np.array([[np.nanmin(cx), np.nanmax(cx), np.nanmin(cy), np.nanmax(cy)]
+                       for cx, cy in chunks(x, y)])
+    x0, x1, y0, y1 = bounds[:, 0].min(), bounds[:, 1].max(), bounds[:, 2].min(), bounds[:, 3].max()
+    return (x0, x1 if x1 > x0 else x0 + 1, y0, y1 if y1 > y0 else y0 + 1)
+
+
+def _bins(ax):
+    width, height = ax.get_window_extent().size / ax.figure.dpi
+    return max(int(width * DENSITY_DPI), 2), max(int(height * DENSITY_DPI), 2)
+
+
+def histogram(chunked, extent, bins):
+    """Count the points of ``chunked`` in a ``bins = (columns, rows)`` grid over ``extent``.
+
+    Points outside ``extent`` and NaNs are dropped. Returns a ``(rows, columns)``
+    array, bottom row first.
+    """
+    x0, x1, y0, y1 = extent
+    columns, rows = bins
+    counts = np.zeros(rows * columns, dtype=np.int64)
+    for cx, cy in chunked:
+        col = np.floor((np.asarray(cx, dtype=float) - x0) * (columns / (x1 - x0)))
+        row = np.floor((np.asarray(cy, dtype=float) - y0) * (rows / (y1 - y0)))
+        # The top and right edges belong to the last bin, as in np.histogram2d.
+        col[cx == x1], row[cy == y1] = columns - 1, rows - 1
+        inside = (col >= 0) & (col < columns) & (row >= 0) & (row < rows)
+        counts += np.bincount((row[inside] * columns + col[inside]).astype(np.int64),
+                              minlength=counts.size)
+    return counts.reshape(rows, columns)
+
+
+def density_image(ax, chunked, color, extent, bins=None, alpha=1.0, zorder=None):
+    """Draw the points of ``chunked`` (an iterable of ``(x, y)`` arrays) as a density image.
+
+    ``extent`` is ``(x0, x1, y0, y1)`` in data coordinates; ``bins`` defaults
+    to :data:`DENSITY_DPI` bins per inch of the axes. The data limits grow to
+    cover ``extent``, as they would for a scatter of the points.
+    """
+    from matplotlib.colors import to_rgba
+    from matplotlib.image import AxesImage
+
+    counts = histogram(chunked, extent, bins or _bins(ax))
+    rgba = np.empty(counts.shape + (4,))
+    rgba[...] = to_rgba(color)
+    peak = counts.max()
+    rgba[..., 3] = alpha * np.log1p(counts) / np.log1p(peak) if peak else 0.0
+    image = AxesImage(ax, extent=extent, origin='lower', interpolation='nearest',
+                      zorder=2 if zorder is None else zorder)
+    image.set_data(rgba)
+    ax.add_image(image)
+    x0, x1, y0, y1 = extent
+    ax.update_datalim([(x0, y0), (x1, y1)])
+    ax.autoscale_view()
+    return image
+
+
+def class_scatter(ax, x, y, color, label=None, threshold=DENSITY_THRESHOLD, extent=None,
+                  bins=None, **kwargs):
+    """``ax.scatter(x, y, c=color, label=label, **kwargs)``, binned above ``threshold`` points.
+
+    ``extent`` limits the density image (default: the data range). Returns the
+    scatter, or the image when the points were binned.
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) <= threshold:
+        return ax.scatter(x, y, c=color, label=label, **kwargs)
+    image = density_image(ax, chunks(x, y), color, extent or _data_extent(x, y), bins,
+                          alpha=kwargs.get('alpha', 1.0), zorder=kwargs.get('zorder'))
+    ax.scatter([], [], c=color, label=label, **kwargs)  # legend entry
+    return image
@@ -3,9 +3,15 @@
 Module 1: The Birth of Neural Computing
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.scatter import class_scatter
+
 CHART_METADATA = {
     'title': 'Decision Boundary 2D',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/decision_boundary_2d'
@@ -34,10 +40,10 @@ x1_sell = np.random.randn(n_samples) * 0.8 + 0.5
 x2_sell = np.random.randn(n_samples) * 0.8 + 0.5
 
 # Plot data points
-ax.scatter(x1_buy, x2_buy, c=mlgreen, s=100, marker='o', label='Buy (y=1)',
-           edgecolors='white', linewidths=1.5, zorder=5)
-ax.scatter(x1_sell, x2_sell, c=mlorange, s=100, marker='s', label='Sell (y=0)',
-           edgecolors='white', linewidths=1.5, zorder=5)
+class_scatter(ax, x1_buy, x2_buy, mlgreen, s=100, marker='o', label='Buy (y=1)',
+              edgecolors='white', linewidths=1.5, zorder=5)
+class_scatter(ax, x1_sell, x2_sell, mlorange, s=100, marker='s', label='Sell (y=0)',
+              edgecolors='white', linewidths=1.5, zorder=5)
 
 # Decision boundary: w1*x1 + w2*x2 + b = 0
 # Using w1=1, w2=1, b=-3 -> x2 = -x1 + 3
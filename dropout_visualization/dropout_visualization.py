@@ -3,9 +3,14 @@ Dropout Visualization
 Module 3: Training Neural Networks
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.patches import Circle, FancyBboxPatch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.network import draw_network as draw_layers, layer_y
 
 CHART_METADATA = {
     'title': 'Dropout Visualization',
@@ -35,55 +40,18 @@ def draw_network(ax, title, dropout_mask=None, color=mlpurple):
     ax.axis('off')
     ax.set_title(title, fontsize=11, fontweight='bold', color=color)
 
-    neurons = {}
-    for l, (x, n) in enumerate(zip(layer_x, layer_sizes)):
-        start_y = 5 + (n - 1) * 0.7 / 2
-        for i in range(n):
-            y = start_y - i * 0.7
-            neurons[(l, i)] = (x, y)
-
-            # Check if dropped
-            dropped = False
-            if dropout_mask is not None and l > 0 and l < len(layer_sizes) - 1:
-                dropped = dropout_mask[l - 1][i] if i < len(dropout_mask[l - 1]) else False
-
-            if dropped:
-                # Dropped neuron
-                circle = Circle((x, y), 0.25, fill=True,
-                               facecolor='white', edgecolor=mlgray, linewidth=1, linestyle='--', alpha=0.3)
-                ax.add_patch(circle)
-                ax.text(x, y, 'X', ha='center', va='center', fontsize=8, color=mlgray)
-            else:
-                # Active neuron
-                facecolor = [mlblue, mlorange, mlorange, mlgreen][l]
-                circle = Circle((x, y), 0.25, fill=True,
-                               facecolor=f'{facecolor}44', edgecolor=facecolor, linewidth=2)
-                ax.add_patch(circle)
-
-    # Draw connections
-    for l in range(len(layer_sizes) - 1):
-        for i in range(layer_sizes[l]):
-            for j in range(layer_sizes[l + 1]):
-                x1, y1 = neurons[(l, i)]
-                x2, y2 = neurons[(l + 1, j)]
-
-                # Check if either neuron is dropped
-                dropped1 = False
-                dropped2 = False
-                if dropout_mask is not None:
-                    if l > 0 and l < len(layer_sizes) - 1:
-                        dropped1 = dropout_mask[l - 1][i] if i < len(dropout_mask[l - 1]) else False
-                    if l + 1 > 0 and l + 1 < len(layer_sizes) - 1:
-                        dropped2 = dropout_mask[l][j] if j < len(dropout_mask[l]) else False
-
-                if dropped1 or dropped2:
-                    ax.plot([x1 + 0.25, x2 - 0.25], [y1, y2], color=mlgray,
-                           linewidth=0.3, alpha=0.2, linestyle='--')
-                else:
-                    ax.plot([x1 + 0.25, x2 - 0.25], [y1, y2], color=mlgray,
-                           linewidth=0.5, alpha=0.5)
-
-    return neurons
+    # Dropped hidden neurons are masked out; input and output layers always stay
+    masks = None
+    if dropout_mask is not None:
+        masks = [None] + [~np.array(mask) for mask in dropout_mask] + [None]
+
+    layer_colors = [mlblue, mlorange, mlorange, mlgreen]
+    network = draw_layers(ax, layer_sizes, layer_x, [layer_y(n) for n in layer_sizes],
+                          radius=0.25, masks=masks,
+                          node_facecolor=[f'{c}44' for c in layer_colors],
+                          node_edgecolor=layer_colors, node_linewidth=2,
+                          edge_color=mlgray, edge_linewidth=0.5, edge_alpha=0.5)
+    return network.positions
 
 # ==================== LEFT: Full Network (No Dropout) ====================
 draw_network(axes[0], 'Full Network (Inference)', None, mlblue)
@@ -3,9 +3,15 @@ Finance Decision Boundary - Stock Buy/Sell Classification
 Module 1: The Birth of Neural Computing
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.scatter import class_scatter
+
 CHART_METADATA = {
     'title': 'Finance Decision Boundary',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/finance_decision_boundary'
@@ -33,10 +39,10 @@ pe_sell = np.random.uniform(5, 20, n)
 momentum_sell = np.random.uniform(-0.10, 0.03, n)
 
 # Plot stocks
-ax.scatter(pe_buy, momentum_buy * 100, c=mlgreen, s=100, marker='^',
-           label='Buy Recommendations', edgecolors='white', linewidths=1.5, zorder=5)
-ax.scatter(pe_sell, momentum_sell * 100, c=mlorange, s=100, marker='v',
-           label='Sell Recommendations', edgecolors='white', linewidths=1.5, zorder=5)
+class_scatter(ax, pe_buy, momentum_buy * 100, mlgreen, s=100, marker='^',
+              label='Buy Recommendations', edgecolors='white', linewidths=1.5, zorder=5)
+class_scatter(ax, pe_sell, momentum_sell * 100, mlorange, s=100, marker='v',
+              label='Sell Recommendations', edgecolors='white', linewidths=1.5, zorder=5)
 
 # Decision boundary: linear combination
 # w1 * PE + w2 * Momentum + b = 0
@@ -3,8 +3,20 @@ Gradient Descent on Contour Plot
 Module 3: Learning from Mistakes
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.optimizers import optimize, quadratic, sweep
+
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
 
 CHART_METADATA = {
     'title': 'Gradient Descent Contour',
@@ -23,8 +35,8 @@ mlgray = '#7F7F7F'
 fig, ax = plt.subplots(figsize=(10, 8))
 
 # Create loss surface (quadratic bowl)
-w1 = np.linspace(-3, 3, 100)
-w2 = np.linspace(-3, 3, 100)
+w1 = np.linspace(-3, 3, grid_points(100))
+w2 = np.linspace(-3, 3, grid_points(100))
 W1, W2 = np.meshgrid(w1, w2)
 
 # Loss function: elongated bowl
@@ -34,27 +46,20 @@ L = 0.5 * W1**2 + 2 * W2**2
 contours = ax.contour(W1, W2, L, levels=15, colors=mlgray, linewidths=0.5)
 contourf = ax.contourf(W1, W2, L, levels=15, cmap='Blues', alpha=0.3)
 
-# Gradient descent path
-np.random.seed(42)
-path_w1 = [2.5]
-path_w2 = [2.0]
-learning_rate = 0.15
-
-for i in range(20):
-    # Gradient
-    grad_w1 = path_w1[-1]
-    grad_w2 = 4 * path_w2[-1]
-
-    # Update
-    new_w1 = path_w1[-1] - learning_rate * grad_w1
-    new_w2 = path_w2[-1] - learning_rate * grad_w2
+# Gradient of L is (w1, 4 w2)
+gradient = quadratic([1.0, 4.0])
 
-    path_w1.append(new_w1)
-    path_w2.append(new_w2)
+# Learning-rate sweep from the same start, all trajectories in one call
+start = [2.5, 2.0]
+starts, rates = sweep(start, learning_rate=np.linspace(0.02, 0.48, 24))
+sweep_paths = optimize(gradient, starts, 20, **rates).transpose(1, 0, 2)
+sweep_lines = LineCollection(sweep_paths, cmap='plasma', linewidths=1, alpha=0.5, zorder=2)
+sweep_lines.set_array(rates['learning_rate'])
+ax.add_collection(sweep_lines)
 
-    # Stop if close to minimum
-    if abs(new_w1) < 0.01 and abs(new_w2) < 0.01:
-        break
+# Gradient descent path
+learning_rate = 0.15
+path_w1, path_w2 = optimize(gradient, [start], 20, learning_rate=learning_rate)[:, 0].T
 
 # Plot gradient descent path
 ax.plot(path_w1, path_w2, 'o-', color=mlpurple, linewidth=2, markersize=6,
@@ -97,6 +102,10 @@ ax.set_xlim(-3, 3)
 ax.set_ylim(-3, 3)
 ax.set_aspect('equal')
 
+ax.text(0.98, 0.1, f'Thin lines: $\\eta$ = {rates["learning_rate"][0]:.2f} to '
+        f'{rates["learning_rate"][-1]:.2f}\n(steep axis oscillates above $\\eta$ = 0.25)',
+        transform=ax.transAxes, fontsize=9, ha='right', va='bottom', color=mlgray)
+
 # Add equation
 eq_text = '$w_{new} = w_{old} - \\eta \\nabla L(w)$'
 ax.text(0.98, 0.02, eq_text, transform=ax.transAxes, fontsize=12,
@@ -6,6 +6,11 @@ Module 3: Training Neural Networks
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
+
 CHART_METADATA = {
     'title': 'Hyperparameter Landscape',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/hyperparameter_landscape'
@@ -27,8 +32,8 @@ np.random.seed(42)
 ax = axes[0]
 
 # Create hyperparameter grid
-lr = np.linspace(-4, 0, 100)  # log10(learning rate)
-hidden = np.linspace(1, 3, 100)  # log10(hidden units)
+lr = np.linspace(-4, 0, grid_points(100))  # log10(learning rate)
+hidden = np.linspace(1, 3, grid_points(100))  # log10(hidden units)
 LR, HIDDEN = np.meshgrid(lr, hidden)
 
 # Simulated validation accuracy surface
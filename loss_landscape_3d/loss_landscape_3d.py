@@ -7,6 +7,11 @@ import matplotlib.pyplot as plt
 import numpy as np
 from mpl_toolkits.mplot3d import Axes3D
 
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
+
 CHART_METADATA = {
     'title': 'Loss Landscape 3D',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/loss_landscape_3d'
@@ -24,8 +29,8 @@ fig = plt.figure(figsize=(14, 6))
 # ==================== LEFT: Simple Convex Loss ====================
 ax1 = fig.add_subplot(121, projection='3d')
 
-w1 = np.linspace(-3, 3, 50)
-w2 = np.linspace(-3, 3, 50)
+w1 = np.linspace(-3, 3, grid_points(50))
+w2 = np.linspace(-3, 3, grid_points(50))
 W1, W2 = np.meshgrid(w1, w2)
 
 # Simple convex loss (bowl shape)
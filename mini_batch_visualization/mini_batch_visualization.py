@@ -3,9 +3,20 @@ CHART_METADATA = {
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/mini_batch_visualization'
 }
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.batches import BatchLoader, sgd_path
+
 # Color palette
 mlpurple = '#3333B2'
 mlblue = '#0066CC'
@@ -16,21 +27,35 @@ mlgray = '#7F7F7F'
 
 fig, axes = plt.subplots(1, 3, figsize=(12, 4))
 
-np.random.seed(42)
+# Real loss: mean squared error of a linear model on two correlated features
+rng = np.random.default_rng(42)
+SAMPLES = 50_000
+features = rng.multivariate_normal([0, 0], [[1, 0.6], [0.6, 1]], SAMPLES)
+targets = features @ np.array([0.4, 0.2]) + rng.normal(0, 1.5, SAMPLES)
+A = features.T @ features / SAMPLES
+w_star = np.linalg.solve(A, features.T @ targets / SAMPLES)
+start = [2.5, -1.5]
+
+
+def gradient(x_batch, y_batch, w):
+    """Gradient of the batch's mean squared error at ``w``."""
+    return 2 * x_batch.T @ (x_batch @ w - y_batch) / len(y_batch)
+
 
-# Create contour for loss landscape
-x = np.linspace(-3, 3, 100)
-y = np.linspace(-3, 3, 100)
+# Create contour for loss landscape (loss above its minimum)
+x = np.linspace(-3, 3, grid_points(100))
+y = np.linspace(-3, 3, grid_points(100))
 X, Y = np.meshgrid(x, y)
-Z = (X**2 + Y**2) + 0.5 * np.sin(3*X) * np.cos(3*Y)
+W = np.stack([X, Y], axis=-1) - w_star
+Z = np.einsum('...i,ij,...j->...', W, A, W)
 
 # Batch Gradient Descent
 ax1 = axes[0]
 ax1.contour(X, Y, Z, levels=15, colors=mlgray, alpha=0.5)
-path_x = np.linspace(2.5, 0, 20)
-path_y = 2.5 * np.exp(-0.15 * np.arange(20))
+path_x, path_y = sgd_path(BatchLoader(features, targets, batch_size=SAMPLES, shuffle=False),
+                          gradient, start, 20, learning_rate=0.1).T
 ax1.plot(path_x, path_y, 'o-', color=mlblue, markersize=4, lw=2)
-ax1.plot(0, 0, 'r*', markersize=15)
+ax1.plot(*w_star, 'r*', markersize=15)
 ax1.set_title('Batch GD\n(All data)', fontsize=11, fontweight='bold')
 ax1.set_xlabel('$w_1$')
 ax1.set_ylabel('$w_2$')
@@ -39,27 +64,21 @@ ax1.text(0, -2.5, 'Smooth, slow', ha='center', fontsize=9, color=mlblue)
 # Mini-batch Gradient Descent
 ax2 = axes[1]
 ax2.contour(X, Y, Z, levels=15, colors=mlgray, alpha=0.5)
-path_x = [2.5]
-path_y = [2.5]
-for i in range(25):
-    path_x.append(path_x[-1] - 0.12 + np.random.randn() * 0.15)
-    path_y.append(path_y[-1] - 0.12 + np.random.randn() * 0.15)
+path_x, path_y = sgd_path(BatchLoader(features, targets, batch_size=64, seed=1),
+                          gradient, start, 25, learning_rate=0.1).T
 ax2.plot(path_x, path_y, 'o-', color=mlgreen, markersize=3, lw=1.5, alpha=0.8)
-ax2.plot(0, 0, 'r*', markersize=15)
-ax2.set_title('Mini-batch GD\n(32-256 samples)', fontsize=11, fontweight='bold')
+ax2.plot(*w_star, 'r*', markersize=15)
+ax2.set_title('Mini-batch GD\n(64 samples)', fontsize=11, fontweight='bold')
 ax2.set_xlabel('$w_1$')
 ax2.text(0, -2.5, 'Good balance', ha='center', fontsize=9, color=mlgreen)
 
 # Stochastic Gradient Descent
 ax3 = axes[2]
 ax3.contour(X, Y, Z, levels=15, colors=mlgray, alpha=0.5)
-path_x = [2.5]
-path_y = [2.5]
-for i in range(40):
-    path_x.append(path_x[-1] - 0.08 + np.random.randn() * 0.4)
-    path_y.append(path_y[-1] - 0.08 + np.random.randn() * 0.4)
+path_x, path_y = sgd_path(BatchLoader(features, targets, batch_size=1, seed=2),
+                          gradient, start, 40, learning_rate=0.05).T
 ax3.plot(path_x, path_y, 'o-', color=mlorange, markersize=2, lw=1, alpha=0.7)
-ax3.plot(0, 0, 'r*', markersize=15)
+ax3.plot(*w_star, 'r*', markersize=15)
 ax3.set_title('SGD\n(1 sample)', fontsize=11, fontweight='bold')
 ax3.set_xlabel('$w_1$')
 ax3.text(0, -2.5, 'Noisy, fast', ha='center', fontsize=9, color=mlorange)
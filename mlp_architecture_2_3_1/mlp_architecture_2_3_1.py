@@ -3,11 +3,15 @@ Multi-Layer Perceptron Architecture (2-3-1)
 Module 2: Stacking Layers
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import Circle, FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.network import draw_arrows, draw_network
+
 CHART_METADATA = {
     'title': 'MLP Architecture 2 3 1',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/mlp_architecture_2_3_1'
@@ -41,22 +45,14 @@ input_y = [5.5, 3.5]
 hidden_y = [6.5, 4.5, 2.5]
 output_y = [4.5]
 
-# Draw connections first (so they're behind nodes)
-# Input to Hidden
-for iy in input_y:
-    for hy in hidden_y:
-        ax.plot([input_x + 0.5, hidden_x - 0.5], [iy, hy], color=mlblue, linewidth=1, alpha=0.6)
-
-# Hidden to Output
-for hy in hidden_y:
-    for oy in output_y:
-        ax.plot([hidden_x + 0.5, output_x - 0.5], [hy, oy], color=mlorange, linewidth=1, alpha=0.6)
+# Neurons and connections
+draw_network(ax, [2, 3, 1], [input_x, hidden_x, output_x], [input_y, hidden_y, output_y],
+             radius=0.5, node_facecolor=['#E6E6FA', mllavender, '#FFE4B5'],
+             node_edgecolor=[mlblue, mlpurple, mlorange], node_linewidth=2,
+             edge_color=[mlblue, mlorange], edge_linewidth=1, edge_alpha=0.6)
 
 # Draw input layer
 for i, y in enumerate(input_y):
-    circle = Circle((input_x, y), 0.5, fill=True, facecolor='#E6E6FA',
-                    edgecolor=mlblue, linewidth=2)
-    ax.add_patch(circle)
     ax.text(input_x, y, f'$x_{i+1}$', ha='center', va='center', fontsize=14, fontweight='bold')
 
 ax.text(input_x, 1.5, 'Input Layer', ha='center', fontsize=12, fontweight='bold', color=mlblue)
@@ -64,19 +60,13 @@ ax.text(input_x, 0.8, '(2 neurons)', ha='center', fontsize=10, color=mlgray)
 
 # Draw hidden layer
 for i, y in enumerate(hidden_y):
-    circle = Circle((hidden_x, y), 0.5, fill=True, facecolor=mllavender,
-                    edgecolor=mlpurple, linewidth=2)
-    ax.add_patch(circle)
     ax.text(hidden_x, y, f'$h_{i+1}$', ha='center', va='center', fontsize=14, fontweight='bold')
 
 ax.text(hidden_x, 1.5, 'Hidden Layer', ha='center', fontsize=12, fontweight='bold', color=mlpurple)
 ax.text(hidden_x, 0.8, '(3 neurons)', ha='center', fontsize=10, color=mlgray)
 
 # Draw output layer
-for i, y in enumerate(output_y):
-    circle = Circle((output_x, y), 0.5, fill=True, facecolor='#FFE4B5',
-                    edgecolor=mlorange, linewidth=2)
-    ax.add_patch(circle)
+for y in output_y:
     ax.text(output_x, y, '$y$', ha='center', va='center', fontsize=14, fontweight='bold')
 
 ax.text(output_x, 1.5, 'Output Layer', ha='center', fontsize=12, fontweight='bold', color=mlorange)
@@ -89,13 +79,11 @@ ax.text(9.5, 5.8, '$W^{(2)}$', fontsize=12, color=mlorange, fontweight='bold',
         bbox=dict(boxstyle='round,pad=0.2', facecolor='white', edgecolor=mlorange, alpha=0.9))
 
 # Add bias indicators
-for y in hidden_y:
-    ax.annotate('', xy=(hidden_x, y - 0.5), xytext=(hidden_x, y - 1.2),
-                arrowprops=dict(arrowstyle='->', color=mlgreen, lw=1))
+bias_x = [hidden_x] * len(hidden_y) + [output_x]
+bias_y = np.array(hidden_y + output_y)
+draw_arrows(ax, np.column_stack([bias_x, bias_y - 1.2]), np.column_stack([bias_x, bias_y - 0.5]),
+            color=mlgreen, linewidth=1)
 ax.text(hidden_x, 1.8, '$b^{(1)}$', ha='center', fontsize=10, color=mlgreen)
-
-ax.annotate('', xy=(output_x, output_y[0] - 0.5), xytext=(output_x, output_y[0] - 1.2),
-            arrowprops=dict(arrowstyle='->', color=mlgreen, lw=1))
 ax.text(output_x, 2.8, '$b^{(2)}$', ha='center', fontsize=10, color=mlgreen)
 
 # Information flow arrows
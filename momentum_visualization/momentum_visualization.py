@@ -3,8 +3,20 @@ Momentum Optimization Visualization
 Module 3: Training Neural Networks
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.collections import LineCollection
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.optimizers import optimize, quadratic, sweep
+
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
 
 CHART_METADATA = {
     'title': 'Momentum Visualization',
@@ -23,10 +35,12 @@ fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 np.random.seed(42)
 
 # Create elongated loss surface
-x = np.linspace(-3, 3, 100)
-y = np.linspace(-1.5, 1.5, 100)
+x = np.linspace(-3, 3, grid_points(100))
+y = np.linspace(-1.5, 1.5, grid_points(100))
 X, Y = np.meshgrid(x, y)
 Z = 0.5 * X**2 + 5 * Y**2  # Elongated valley
+gradient = quadratic([1.0, 10.0])
+start = [-2.5, 1.2]
 
 # ==================== LEFT: Without Momentum ====================
 ax = axes[0]
@@ -34,15 +48,16 @@ ax = axes[0]
 ax.contour(X, Y, Z, levels=20, colors=mlgray, alpha=0.5)
 ax.contourf(X, Y, Z, levels=20, cmap='Blues', alpha=0.3)
 
+# Learning-rate sweep: every trajectory in one vectorised call
+starts, rates = sweep(start, learning_rate=np.linspace(0.02, 0.19, 18))
+lines = LineCollection(optimize(gradient, starts, 30, **rates).transpose(1, 0, 2),
+                       cmap='Blues', linewidths=0.8, alpha=0.5)
+lines.set_array(rates['learning_rate'])
+ax.add_collection(lines)
+
 # Path without momentum (oscillates in narrow dimension)
-path_x = [-2.5]
-path_y = [1.2]
 lr = 0.15
-for _ in range(30):
-    grad_x = path_x[-1]
-    grad_y = 10 * path_y[-1]
-    path_x.append(path_x[-1] - lr * grad_x)
-    path_y.append(path_y[-1] - lr * grad_y)
+path_x, path_y = optimize(gradient, [start], 30, learning_rate=lr)[:, 0].T
 
 ax.plot(path_x, path_y, 'o-', color=mlblue, linewidth=2, markersize=4, label='GD path')
 ax.scatter([0], [0], c=mlgreen, s=200, marker='*', zorder=10, label='Minimum')
@@ -54,6 +69,8 @@ ax.legend(loc='upper right', fontsize=9)
 ax.set_xlim(-3, 3)
 ax.set_ylim(-1.5, 1.5)
 
+ax.text(-2.9, 1.35, f'Thin lines: $\\eta$ = {rates["learning_rate"][0]:.2f} to '
+        f'{rates["learning_rate"][-1]:.2f}', fontsize=8, va='top', color=mlgray)
 ax.text(0, -1.3, 'Oscillates in steep direction\nSlow progress in flat direction',
         fontsize=9, ha='center', color=mlblue)
 
@@ -63,19 +80,16 @@ ax = axes[1]
 ax.contour(X, Y, Z, levels=20, colors=mlgray, alpha=0.5)
 ax.contourf(X, Y, Z, levels=20, cmap='Oranges', alpha=0.3)
 
+# Momentum sweep at the same learning rate
+starts, betas = sweep(start, momentum=np.linspace(0.0, 0.95, 20))
+lines = LineCollection(optimize(gradient, starts, 20, 'momentum', lr, **betas).transpose(1, 0, 2),
+                       cmap='Oranges', linewidths=0.8, alpha=0.5)
+lines.set_array(betas['momentum'])
+ax.add_collection(lines)
+
 # Path with momentum (smoother, faster)
-path_x = [-2.5]
-path_y = [1.2]
-vel_x, vel_y = 0, 0
-lr = 0.15
 momentum = 0.9
-for _ in range(20):
-    grad_x = path_x[-1]
-    grad_y = 10 * path_y[-1]
-    vel_x = momentum * vel_x - lr * grad_x
-    vel_y = momentum * vel_y - lr * grad_y
-    path_x.append(path_x[-1] + vel_x)
-    path_y.append(path_y[-1] + vel_y)
+path_x, path_y = optimize(gradient, [start], 20, 'momentum', lr, momentum)[:, 0].T
 
 ax.plot(path_x, path_y, 'o-', color=mlorange, linewidth=2, markersize=4, label='Momentum path')
 ax.scatter([0], [0], c=mlgreen, s=200, marker='*', zorder=10, label='Minimum')
@@ -87,6 +101,8 @@ ax.legend(loc='upper right', fontsize=9)
 ax.set_xlim(-3, 3)
 ax.set_ylim(-1.5, 1.5)
 
+ax.text(-2.9, 1.35, f'Thin lines: $\\beta$ = {betas["momentum"][0]:.2f} to '
+        f'{betas["momentum"][-1]:.2f}', fontsize=8, va='top', color=mlgray)
 ax.text(0, -1.3, 'Dampens oscillations\nAccelerates in consistent direction',
         fontsize=9, ha='center', color=mlorange)
 
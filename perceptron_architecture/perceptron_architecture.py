@@ -3,11 +3,16 @@ Perceptron Architecture Diagram
 Module 1: The Birth of Neural Computing
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.patches import FancyBboxPatch, Circle, FancyArrowPatch
+from matplotlib.patches import Circle, FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.network import draw_network
+
 CHART_METADATA = {
     'title': 'Perceptron Architecture',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/perceptron_architecture'
@@ -39,9 +44,7 @@ input_labels = ['$x_1$', '$x_2$', '$x_3$', '$x_n$']
 input_descriptions = ['P/E Ratio', 'Momentum', 'Volume', '...']
 
 for i, (y, label, desc) in enumerate(zip(input_y, input_labels, input_descriptions)):
-    # Input circle
-    circle = Circle((1, y), 0.5, fill=True, facecolor='#E6E6FA', edgecolor=mlblue, linewidth=2)
-    ax.add_patch(circle)
+    # Input label
     ax.text(1, y, label, ha='center', va='center', fontsize=12, fontweight='bold')
 
     # Description
@@ -53,28 +56,23 @@ ax.text(1, 3, '...', fontsize=16, ha='center', va='center', color=mlgray)
 # Input layer label
 ax.text(1, 0.5, 'Input Layer', fontsize=11, ha='center', fontweight='bold', color=mlblue)
 
-# ==================== WEIGHTS ====================
-weight_labels = ['$w_1$', '$w_2$', '$w_3$', '$w_n$']
-
-for i, (y, wlabel) in enumerate(zip(input_y, weight_labels)):
-    # Arrow with weight
-    ax.annotate('', xy=(5.3, 4.5), xytext=(1.6, y),
-                arrowprops=dict(arrowstyle='->', color=mlblue, lw=2,
-                               connectionstyle="arc3,rad=-0.1" if y > 4.5 else "arc3,rad=0.1"))
+# ==================== WEIGHTS AND SUMMATION NODE ====================
+# Inputs, the summation node and one weighted arrow per input
+network = draw_network(ax, [len(input_y), 1], [1, 6], [input_y, [4.5]], radius=[0.5, 0.7],
+                       node_facecolor=['#E6E6FA', mllavender], node_edgecolor=[mlblue, mlpurple],
+                       node_linewidth=[2, 3], edge_color=mlblue, edge_linewidth=2, edge_alpha=1,
+                       arrows=True, head_length=9, head_width=4.5)
+ax.text(6, 4.5, '$\\Sigma$', ha='center', va='center', fontsize=20, fontweight='bold', color=mlpurple)
 
-    # Weight label with box
-    mid_x = (1.6 + 5.3) / 2
-    mid_y = (y + 4.5) / 2 + (0.3 if i < 2 else -0.3)
+weight_labels = ['$w_1$', '$w_2$', '$w_3$', '$w_n$']
 
+# Weight labels on their arrows, 40% of the way from the input to the sum
+for (start, end), wlabel in zip(network.segments[0][:, 0], weight_labels):
+    mid_x, mid_y = start + 0.4 * (end - start)
     bbox = dict(boxstyle='round,pad=0.2', facecolor='#E6F3FF', edgecolor=mlblue, alpha=0.9)
     ax.text(mid_x, mid_y, wlabel, fontsize=10, ha='center', va='center',
             color=mlblue, fontweight='bold', bbox=bbox)
 
-# ==================== SUMMATION NODE ====================
-sum_circle = Circle((6, 4.5), 0.7, fill=True, facecolor=mllavender, edgecolor=mlpurple, linewidth=3)
-ax.add_patch(sum_circle)
-ax.text(6, 4.5, '$\\Sigma$', ha='center', va='center', fontsize=20, fontweight='bold', color=mlpurple)
-
 # Bias arrow
 ax.annotate('', xy=(6, 3.8), xytext=(6, 2.5),
             arrowprops=dict(arrowstyle='->', color=mlgreen, lw=2))
@@ -1,11 +1,26 @@
 """
-Perceptron Learning Animation (Static Frames)
+Perceptron Learning Animation
 Module 1: The Birth of Neural Computing
+
+The 2x2 grid of hand-picked iterations is the printable version; the
+animation replays an actual perceptron training run, one frame per sample
+visited, and is streamed to perceptron_learning_animation.gif.
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.animation import animate
+
+try:
+    from chartbuild.profiles import output_path
+except ImportError:  # run standalone: final profile
+    output_path = lambda name: name
+
 CHART_METADATA = {
     'title': 'Perceptron Learning Animation',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/perceptron_learning_animation'
@@ -112,3 +127,78 @@ plt.savefig('perceptron_learning_animation.png', format='png', bbox_inches='tigh
 plt.close()
 
 print("Generated: perceptron_learning_animation.pdf")
+
+
+# Animation: a real training run, frames produced lazily as the perceptron learns
+X = np.column_stack([np.concatenate([x1_pos, x1_neg]), np.concatenate([x2_pos, x2_neg])])
+y = np.concatenate([np.ones(n_per_class), np.zeros(n_per_class)])
+
+
+def training_history(X, y, w, b, learning_rate=0.1, max_epochs=50):
+    """Yield (epoch, sample, w, b, misclassified mask) after every sample visited."""
+    order = np.random.RandomState(0).permutation(len(X))
+    for epoch in range(1, max_epochs + 1):
+        for i in order:
+            error = y[i] - (X[i] @ w + b >= 0)
+            w, b = w + learning_rate * error * X[i], b + learning_rate * error
+            wrong = (X @ w + b >= 0) != y
+            yield epoch, i, w, b, wrong
+        if not wrong.any():
+            return
+
+
+fig, ax = plt.subplots(figsize=(6, 5.5))
+points = [ax.scatter(x1_pos, x2_pos, c=mlgreen, s=80, marker='o', label='Class 1 (Buy)',
+                     edgecolors='white', linewidths=1, zorder=5),
+          ax.scatter(x1_neg, x2_neg, c=mlorange, s=80, marker='s', label='Class 0 (Sell)',
+                     edgecolors='white', linewidths=1, zorder=5)]
+ax.set_xlim(-0.5, 3.5)
+ax.set_ylim(-0.5, 3.5)
+ax.set_xlabel('$x_1$', fontsize=10)
+ax.set_ylabel('$x_2$', fontsize=10)
+ax.set_title('Perceptron Learning: Boundary Adjusts Until Convergence',
+             fontsize=11, fontweight='bold', color=mlpurple)
+ax.grid(True, alpha=0.3)
+ax.legend(loc='upper right', fontsize=8)
+
+# Moving parts: region shading, boundary, misclassified rings, current sample, readouts.
+# The data points do not move but are redrawn over the shading, in stacking order.
+grid = np.linspace(-0.5, 3.5, 200)
+gx, gy = np.meshgrid(grid, grid)
+region_colors = np.array([plt.matplotlib.colors.to_rgba(mlorange, 0.1),
+                          plt.matplotlib.colors.to_rgba(mlgreen, 0.1)])
+regions = ax.imshow(np.zeros((200, 200, 4)), extent=(-0.5, 3.5, -0.5, 3.5), origin='lower',
+                    interpolation='nearest', aspect='auto', zorder=0)
+boundary, = ax.plot([], [], color=mlpurple, linewidth=2.5)
+rings = ax.scatter([], [], s=200, facecolors='none', edgecolors=mlred, linewidths=2, zorder=6)
+current = ax.scatter([], [], s=320, facecolors='none', edgecolors=mlblue, linewidths=2.5,
+                     linestyle='--', zorder=6)
+readout = ax.text(0.02, 0.98, '', transform=ax.transAxes, fontsize=10, va='top',
+                  fontweight='bold',
+                  bbox=dict(boxstyle='round,pad=0.3', facecolor='white', alpha=0.9))
+weights_text = ax.text(0.98, 0.02, '', transform=ax.transAxes, fontsize=9, ha='right',
+                       color=mlgray)
+
+
+def update(state):
+    epoch, i, w, b, wrong = state
+    regions.set_data(region_colors[(w[0] * gx + w[1] * gy + b >= 0).astype(int)])
+    if abs(w[1]) >= abs(w[0]):
+        boundary.set_data(grid, -(w[0] * grid + b) / w[1])
+    else:
+        boundary.set_data(-(w[1] * grid + b) / w[0], grid)
+    rings.set_offsets(X[wrong].reshape(-1, 2))
+    current.set_offsets(X[i:i + 1])
+    color = mlgreen if not wrong.any() else mlred
+    readout.set_text(f'Epoch {epoch}   Errors: {wrong.sum()}')
+    readout.set_color(color)
+    readout.get_bbox_patch().set_edgecolor(color)
+    weights_text.set_text(f'$w_1$={w[0]:.2f}, $w_2$={w[1]:.2f}, $b$={b:.2f}')
+    return [regions, boundary, *points, rings, current, readout, weights_text]
+
+
+frames, seconds = animate(fig, training_history(X, y, np.array([0.5, -0.5]), 0.5), update,
+                          output_path('perceptron_learning_animation.gif'))
+plt.close(fig)
+
+print(f"Generated: perceptron_learning_animation.gif ({frames} frames, {frames / seconds:.0f} frames/s)")
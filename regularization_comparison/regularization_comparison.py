@@ -6,6 +6,11 @@ Module 3: Training Neural Networks
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    from chartbuild.profiles import grid_points
+except ImportError:  # run standalone: final profile
+    grid_points = lambda value: value
+
 CHART_METADATA = {
     'title': 'Regularization Comparison',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/regularization_comparison'
@@ -29,7 +34,7 @@ X1_class1 = np.random.randn(n, 2) * 0.5 + np.array([1, 1])
 X1_class2 = np.random.randn(n, 2) * 0.5 + np.array([-1, -1])
 
 # Grid for decision boundary
-xx, yy = np.meshgrid(np.linspace(-3, 3, 100), np.linspace(-3, 3, 100))
+xx, yy = np.meshgrid(np.linspace(-3, 3, grid_points(100)), np.linspace(-3, 3, grid_points(100)))
 
 # ==================== LEFT: No Regularization ====================
 ax = axes[0]
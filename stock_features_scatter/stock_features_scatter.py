@@ -3,9 +3,15 @@ Stock Features Scatter Plot for Perceptron Classification
 Module 1: The Birth of Neural Computing
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.scatter import class_scatter
+
 CHART_METADATA = {
     'title': 'Stock Features Scatter',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/stock_features_scatter'
@@ -40,10 +46,10 @@ company_labels = {
 }
 
 # Plot data points
-ax.scatter(pe_buy, momentum_buy, c=mlgreen, s=100, marker='o',
-           label='Buy Stocks', edgecolors='white', linewidths=1.5, alpha=0.8, zorder=5)
-ax.scatter(pe_sell, momentum_sell, c=mlorange, s=100, marker='s',
-           label='Sell Stocks', edgecolors='white', linewidths=1.5, alpha=0.8, zorder=5)
+class_scatter(ax, pe_buy, momentum_buy, mlgreen, s=100, marker='o',
+              label='Buy Stocks', edgecolors='white', linewidths=1.5, alpha=0.8, zorder=5)
+class_scatter(ax, pe_sell, momentum_sell, mlorange, s=100, marker='s',
+              label='Sell Stocks', edgecolors='white', linewidths=1.5, alpha=0.8, zorder=5)
 
 # Add company labels to some points
 for i, label in enumerate(company_labels['buy'][:3]):
@@ -0,0 +1,13 @@
+"""
+Shared test setup: import the repository packages, draw without a display
+and keep build state out of the repository's ``.chartcache/``.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault('MPLBACKEND', 'Agg')
+os.environ.setdefault('CHARTBUILD_CACHE', tempfile.mkdtemp(prefix='chartbuild-tests-'))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
@@ -0,0 +1,57 @@
+"""
+Streamed animations decode to the frames that were drawn.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from PIL import Image, ImageSequence
+
+from chartlib.animation import animate, changed_box, frame_writer
+
+
+def _frames(path, count=12):
+    """Animate a marker along a line; return the last frame as drawn."""
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.set_xlim(0, count)
+    ax.set_ylim(0, 1)
+    point, = ax.plot([], [], 'o', color='red')
+    drawn = []
+
+    def update(step):
+        point.set_data([step], [0.5])
+        return [point]
+
+    def steps():
+        for step in range(count):
+            yield step
+            drawn.append(np.asarray(fig.canvas.buffer_rgba())[..., :3].copy())
+
+    frames, _ = animate(fig, steps(), update, path, dpi=50)
+    plt.close(fig)
+    return frames, drawn[-1]
+
+
+# GIF frames are quantised to 256 colours; APNG is lossless.
+@pytest.mark.parametrize('suffix, tolerance', [('.gif', 16), ('.png', 0)])
+def test_animation_round_trip(tmp_path, suffix, tolerance):
+    frames, last = _frames(tmp_path / f'point{suffix}')
+    with Image.open(tmp_path / f'point{suffix}') as image:
+        assert image.n_frames == frames == 12
+        decoded = [np.asarray(frame.convert('RGB')) for frame in ImageSequence.Iterator(image)]
+    assert decoded[-1].shape == last.shape
+    np.testing.assert_allclose(decoded[-1], last, atol=tolerance)
+
+
+def test_changed_box():
+    frame = np.zeros((10, 20, 4), np.uint8)
+    assert changed_box(None, frame) == (0, 0, 20, 10)
+    assert changed_box(frame, frame.copy()) is None
+    moved = frame.copy()
+    moved[3:5, 7:12] = 255
+    assert changed_box(frame, moved) == (7, 3, 12, 5)
+
+
+def test_unknown_suffix():
+    with pytest.raises(ValueError, match='Unsupported animation format'):
+        frame_writer('out.avi', (10, 10))
@@ -0,0 +1,53 @@
+"""
+The deck is streamed page range by page range and rebuilt incrementally.
+"""
+
+import matplotlib.pyplot as plt
+import pypdf
+import pytest
+from matplotlib.backends.backend_pdf import PdfPages
+
+from chartbuild import assemble
+from chartbuild.discovery import Chart
+
+
+def _render(path, *titles):
+    with PdfPages(path) as pdf:
+        for title in titles:
+            fig = plt.figure()
+            fig.text(0.5, 0.5, title)
+            pdf.savefig(fig)
+            plt.close(fig)
+
+
+@pytest.fixture
+def charts(tmp_path, monkeypatch):
+    monkeypatch.setattr(assemble, 'REPO_ROOT', tmp_path)
+    charts = []
+    for name, titles in [('01_first', ['alpha']), ('02_second', ['beta', 'gamma']),
+                         ('third', ['delta'])]:
+        directory = tmp_path / name
+        directory.mkdir()
+        _render(directory / f'{name}.pdf', *titles)
+        charts.append(Chart(name, directory, directory / f'{name}.py'))
+    return charts
+
+
+def _contents(path):
+    reader = pypdf.PdfReader(path, strict=True)
+    titles = [(item.title, reader.get_destination_page_number(item)) for item in reader.outline]
+    return [page.extract_text() for page in reader.pages], titles
+
+
+def test_full_then_incremental(charts, tmp_path):
+    deck = tmp_path / 'deck.pdf'
+    assert assemble.assemble_deck(charts, deck, report=lambda message: None) == 3
+    pages = ['alpha', 'beta', 'gamma', 'delta']
+    outline = [('01_first', 0), ('02_second', 1), ('third', 3)]
+    assert _contents(deck) == (pages, outline)
+
+    _render(charts[1].directory / '02_second.pdf', 'epsilon')
+    assert assemble.assemble_deck(charts, deck, report=lambda message: None) == 1
+    assert _contents(deck) == (['alpha', 'epsilon', 'delta'],
+                               [('01_first', 0), ('02_second', 1), ('third', 2)])
+    assert assemble.assemble_deck(charts, deck, report=lambda message: None) == 0
@@ -0,0 +1,54 @@
+"""
+QR codes and thumbnails are only regenerated when their inputs change.
+"""
+
+import matplotlib.pyplot as plt
+import pytest
+from PIL import Image
+
+from chartbuild.assets import generate_assets, thumbnail_path
+from chartbuild.discovery import Chart
+
+pytest.importorskip('qrcode')
+pytest.importorskip('pymupdf')
+
+SCRIPT = "CHART_METADATA = {{'title': 'Demo', 'url': '{url}'}}\n"
+
+
+@pytest.fixture
+def chart(tmp_path):
+    directory = tmp_path / 'demo'
+    directory.mkdir()
+    (directory / 'demo.py').write_text(SCRIPT.format(url='https://example.org/a'))
+    fig = plt.figure(figsize=(4, 3))
+    fig.text(0.5, 0.5, 'demo')
+    fig.savefig(directory / 'demo.pdf')
+    plt.close(fig)
+    return Chart('demo', directory, directory / 'demo.py', {'Output': 'demo.pdf'})
+
+
+def _generate(chart, tmp_path, **kwargs):
+    return generate_assets([chart], jobs=1, directory=tmp_path / 'thumbnails',
+                           manifest_path=tmp_path / 'assets.json', report=lambda line: None,
+                           **kwargs)
+
+
+def test_unchanged_assets_are_skipped(chart, tmp_path):
+    assert _generate(chart, tmp_path) == (2, [])
+    thumbnail = thumbnail_path(chart, tmp_path / 'thumbnails')
+    assert Image.open(thumbnail).width == 320
+    assert _generate(chart, tmp_path) == (0, [])
+
+    chart.script.write_text(SCRIPT.format(url='https://example.org/b'))
+    assert _generate(chart, tmp_path) == (1, [])
+
+    thumbnail.write_bytes(b'edited')
+    assert _generate(chart, tmp_path) == (1, [])
+    assert _generate(chart, tmp_path, force=True) == (2, [])
+
+
+def test_shipped_qr_code_is_kept(chart, tmp_path):
+    shipped = chart.directory / 'qr_code.png'
+    shipped.write_bytes(b'shipped')
+    assert _generate(chart, tmp_path) == (1, [])  # the thumbnail only
+    assert shipped.read_bytes() == b'shipped'
@@ -0,0 +1,68 @@
+"""
+Tape gradients against central differences.
+"""
+
+import numpy as np
+import pytest
+
+from chartlib.autodiff import Tape, mean, sigmoid, square, total
+
+
+def central_difference(loss, value, eps=1e-6):
+    """d loss() / d value by central differences, perturbing ``value`` in place."""
+    grad = np.zeros_like(value)
+    for index in np.ndindex(value.shape):
+        saved = value[index]
+        value[index] = saved + eps
+        upper = loss()
+        value[index] = saved - eps
+        lower = loss()
+        value[index] = saved
+        grad[index] = (upper - lower) / (2 * eps)
+    return grad
+
+
+def test_mlp_gradients_match_central_differences():
+    rng = np.random.default_rng(0)
+    tape = Tape()
+    x = tape.input(rng.normal(size=(6, 3)))
+    y = tape.input(rng.uniform(size=(6, 1)))
+    W1, b1 = tape.parameter(rng.normal(size=(3, 4))), tape.parameter(rng.normal(size=4))
+    W2, b2 = tape.parameter(rng.normal(size=(4, 1))), tape.parameter(rng.normal(size=1))
+    loss = mean(square(sigmoid(sigmoid(x @ W1 + b1) @ W2 + b2) - y))
+    tape.backward(loss)
+
+    def recompute():
+        tape.forward()
+        return loss.item()
+
+    for parameter in (W1, b1, W2, b2):
+        expected = central_difference(recompute, parameter.value)
+        np.testing.assert_allclose(parameter.grad, expected, rtol=1e-6, atol=1e-9)
+
+
+def test_broadcast_scalar_parameters():
+    # One neuron over a batch, as in the worked backprop charts.
+    rng = np.random.default_rng(1)
+    tape = Tape()
+    x, y = tape.input(rng.normal(size=50)), tape.input(rng.uniform(size=50))
+    w, b = tape.parameter(0.5), tape.parameter(0.1)
+    loss = total(square(sigmoid(w * x + b) - y) * 0.5)
+    tape.backward(loss)
+
+    def recompute():
+        tape.forward()
+        return loss.item()
+
+    for parameter in (w, b):
+        assert parameter.grad.shape == ()
+        expected = central_difference(recompute, parameter.value)
+        np.testing.assert_allclose(parameter.grad, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize('x_shape, w_shape', [((3,), (3, 2)), ((2, 3), (3,)), ((2, 3), (2, 3))])
+def test_matmul_needs_matrices(x_shape, w_shape):
+    tape = Tape()
+    x, w = tape.input(np.ones(x_shape)), tape.parameter(np.ones(w_shape))
+    with pytest.raises(ValueError, match='cannot multiply'):
+        x @ w
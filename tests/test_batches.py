@@ -0,0 +1,72 @@
+"""
+Batch loaders visit every row once per epoch and clean up their threads.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from chartlib.batches import BatchLoader, sgd_path
+
+
+def _prefetch_threads():
+    return [thread for thread in threading.enumerate() if thread.name == 'batch-prefetch']
+
+
+@pytest.mark.parametrize('prefetch', [0, 2])
+@pytest.mark.parametrize('block', [1, 8])
+def test_epoch_covers_every_row_once(prefetch, block):
+    x = np.arange(103, dtype=float)[:, None] * [1, -1]
+    y = np.arange(103)
+    loader = BatchLoader(x, y, batch_size=10, block=block, prefetch=prefetch, seed=3)
+    seen = []
+    for features, targets in loader:
+        np.testing.assert_array_equal(features[:, 0], targets)
+        seen.append(targets.copy())
+    assert len(seen) == len(loader) == 11
+    np.testing.assert_array_equal(np.sort(np.concatenate(seen)), y)
+
+
+def test_block_order_keeps_runs():
+    loader = BatchLoader(np.arange(50), block=8, seed=1)
+    order = loader.order()
+    np.testing.assert_array_equal(np.sort(order), np.arange(50))
+    starts = order[np.flatnonzero(order % 8 == 0)]
+    for start in starts:
+        position = np.flatnonzero(order == start)[0]
+        run = order[position:position + min(8, 50 - start)]
+        np.testing.assert_array_equal(run, np.arange(start, start + len(run)))
+
+
+def test_unshuffled_order_and_drop_last():
+    loader = BatchLoader(np.arange(25), batch_size=10, shuffle=False, drop_last=True)
+    assert [batch[0].tolist() for batch in loader] == [list(range(10)), list(range(10, 20))]
+
+
+def test_prefetch_thread_stops_after_early_break():
+    loader = BatchLoader(np.arange(10_000), batch_size=10, prefetch=2)
+    for _ in loader:
+        break
+    assert not _prefetch_threads()
+    assert sum(1 for _ in loader.batches(25)) == 25
+    assert not _prefetch_threads()
+
+
+def test_producer_errors_reach_the_consumer():
+    loader = BatchLoader(np.arange(20), batch_size=5, prefetch=1)
+    loader._gather = lambda slot, rows: 1 / 0
+    with pytest.raises(ZeroDivisionError):
+        list(loader)
+    assert not _prefetch_threads()
+
+
+def test_sgd_path_converges_on_least_squares():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(2000, 2))
+    y = x @ [2.0, -1.0]
+    loader = BatchLoader(x, y, batch_size=64, seed=0)
+    path = sgd_path(loader, lambda xb, yb, w: 2 * xb.T @ (xb @ w - yb) / len(xb),
+                    np.zeros(2), 200, 0.1)
+    assert path.shape == (201, 2)
+    np.testing.assert_allclose(path[-1], [2.0, -1.0], atol=1e-3)
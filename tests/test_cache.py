@@ -0,0 +1,77 @@
+"""
+Cache keys and watch mapping follow a chart's local imports transitively.
+"""
+
+import textwrap
+
+import pytest
+
+from chartbuild.cache import cache_key, source_files
+from chartbuild.discovery import discover_charts
+from chartbuild.watch import dependents
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(text), encoding='utf-8')
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A chart importing helpers.graph, which imports helpers.core relatively."""
+    _write(tmp_path / 'demo' / 'metainfo.txt', 'Name of Quantlet: demo\nOutput: demo.png\n')
+    _write(tmp_path / 'demo' / 'demo.py', """
+        from helpers.graph import plan
+
+        CHART_METADATA = {'title': 'Demo'}
+    """)
+    _write(tmp_path / 'helpers' / '__init__.py', '')
+    _write(tmp_path / 'helpers' / 'graph.py', """
+        from .core import kernel
+
+        def plan():
+            return kernel()
+    """)
+    _write(tmp_path / 'helpers' / 'core.py', """
+        def kernel():
+            return 1
+    """)
+    _write(tmp_path / 'helpers' / 'unused.py', '')
+    return tmp_path
+
+
+def test_source_files_are_transitive(tree):
+    chart, = discover_charts(tree)
+    names = [path.relative_to(tree).as_posix() for path in source_files(chart)]
+    assert names == ['demo/demo.py', 'helpers/__init__.py', 'helpers/core.py',
+                     'helpers/graph.py']
+
+
+@pytest.mark.parametrize('edited', ['helpers/core.py', 'helpers/__init__.py'])
+def test_key_changes_with_indirect_import(tree, edited):
+    chart, = discover_charts(tree)
+    before = cache_key(chart)
+    assert cache_key(chart) == before
+    path = tree / edited
+    path.write_text(path.read_text(encoding='utf-8') + '\nVERSION = 2\n', encoding='utf-8')
+    assert cache_key(chart) != before
+
+
+def test_unrelated_module_keeps_key(tree):
+    chart, = discover_charts(tree)
+    before = cache_key(chart)
+    (tree / 'helpers' / 'unused.py').write_text('VERSION = 2\n', encoding='utf-8')
+    assert cache_key(chart) == before
+
+
+def test_watch_maps_indirect_imports(tree):
+    chart, = discover_charts(tree)
+    mapping = dependents([chart])
+    assert mapping[(tree / 'helpers' / 'core.py').resolve()] == [chart]
+    assert (tree / 'helpers' / 'unused.py').resolve() not in mapping
+
+
+def test_repository_chart_depends_on_autodiff():
+    chart, = [chart for chart in discover_charts() if chart.name == 'backprop_flow_diagram']
+    names = {path.relative_to(chart.directory.parent).as_posix() for path in source_files(chart)}
+    assert {'chartlib/__init__.py', 'chartlib/graph.py', 'chartlib/autodiff.py'} <= names
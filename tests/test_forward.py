@@ -0,0 +1,28 @@
+"""
+Batched forward propagation against the per-layer formula.
+"""
+
+import numpy as np
+
+from chartlib.forward import Dense, ForwardNetwork
+
+
+def test_matches_naive_forward_across_slices():
+    rng = np.random.default_rng(0)
+    layers = [Dense(rng.normal(size=(5, 3)), rng.normal(size=5), 'tanh'),
+              Dense(rng.normal(size=(2, 5)), rng.normal(size=2), 'sigmoid')]
+    network = ForwardNetwork(layers, batch_size=16)
+    x = rng.normal(size=(50, 3))  # three full slices and a partial one
+    expected = x
+    for layer in layers:
+        z = expected @ layer.weights.T + layer.bias
+        expected = np.tanh(z) if layer.activation == 'tanh' else 1 / (1 + np.exp(-z))
+    out = np.empty((50, 2))
+    assert network.forward(x, out=out) is out
+    np.testing.assert_allclose(out, expected, rtol=1e-12)
+    np.testing.assert_allclose(network.forward(x[0]), expected[0], rtol=1e-12)
+
+
+def test_biases_are_rows():
+    network = ForwardNetwork.random((4, 64, 1), batch_size=4096)
+    assert [bias.shape for bias in network._biases] == [(1, 64), (1, 1)]
@@ -0,0 +1,62 @@
+"""
+The gallery indexes every chart and only rebuilds the cards that changed.
+"""
+
+import json
+
+import pytest
+
+from chartbuild.discovery import discover_charts
+from chartbuild.gallery import build_gallery
+
+CHARTS = {
+    'gradient_descent': ('Gradient Descent Steps', 'optimisation, learning rate'),
+    'relu_function': ('The ReLU Activation', 'activation, neuron'),
+}
+
+
+@pytest.fixture
+def charts(tmp_path):
+    for name, (title, keywords) in CHARTS.items():
+        directory = tmp_path / 'repo' / name
+        directory.mkdir(parents=True)
+        (directory / 'metainfo.txt').write_text(
+            f'Name of Quantlet: {name}\nKeywords: {keywords}\nOutput: {name}.pdf\n')
+        (directory / f'{name}.py').write_text(f"CHART_METADATA = {{'title': '{title}'}}\n")
+        (directory / f'{name}.pdf').write_bytes(b'%PDF-1.4\n')
+    return discover_charts(tmp_path / 'repo')
+
+
+def _build(charts, tmp_path):
+    lines = []
+    build_gallery(charts, tmp_path / 'gallery', thumbnails=False,
+                  manifest_path=tmp_path / 'gallery.json', report=lines.append)
+    return lines[-1]
+
+
+def _search(index, prefix):
+    return {index['charts'][chart] for word, postings in zip(index['words'], index['postings'])
+            if word.startswith(prefix) for chart in postings}
+
+
+def test_index_and_search(charts, tmp_path):
+    _build(charts, tmp_path)
+    page = (tmp_path / 'gallery' / 'index.html').read_text(encoding='utf-8')
+    for name in CHARTS:
+        assert f'id="chart-{name}"' in page
+    assert 'href="../repo/relu_function/relu_function.pdf"' in page
+    script = (tmp_path / 'gallery' / 'index.js').read_text(encoding='utf-8')
+    index = json.loads(script[len('window.GALLERY = '):].rstrip().rstrip(';'))
+    assert index['words'] == sorted(index['words'])
+    assert _search(index, 'grad') == {'gradient_descent'}
+    assert _search(index, 'activ') == {'relu_function'}
+    assert _search(index, 'r') == {'gradient_descent', 'relu_function'}
+
+
+def test_unchanged_cards_are_reused(charts, tmp_path):
+    assert '2 cards rebuilt' in _build(charts, tmp_path)
+    assert '0 cards rebuilt, no files written' in _build(charts, tmp_path)
+    metainfo = charts[1].directory / 'metainfo.txt'
+    metainfo.write_text(metainfo.read_text() + 'Keywords: relu, rectifier\n')
+    line = _build(discover_charts(tmp_path / 'repo'), tmp_path)
+    assert '1 cards rebuilt, index.html, index.js written' in line
@@ -0,0 +1,79 @@
+"""
+Executor gradients against central differences and the tape, and its plan.
+"""
+
+import numpy as np
+
+from chartlib.autodiff import Tape, mean, sigmoid, square
+from chartlib.graph import Executor, mlp
+
+from test_autodiff import central_difference
+
+
+def _feeds(sizes, rows, seed=2):
+    rng = np.random.default_rng(seed)
+    return {'x': rng.normal(size=(rows, sizes[0])), 'y': rng.uniform(size=(rows, sizes[-1]))}
+
+
+def test_mlp_gradients_match_central_differences():
+    sizes, rows = (3, 5, 4, 1), 7
+    graph, loss = mlp(sizes, rows)
+    executor = Executor(graph, loss)
+    feeds = _feeds(sizes, rows)
+    executor.run(feeds)
+    grads = {parameter.name: parameter.grad.copy() for parameter in executor.parameters}
+
+    def recompute():
+        return executor.run(feeds).item()
+
+    for parameter in executor.parameters:
+        expected = central_difference(recompute, parameter.value)
+        np.testing.assert_allclose(grads[parameter.name], expected, rtol=1e-6, atol=1e-9)
+
+
+def test_executor_matches_tape():
+    sizes, rows = (4, 8, 8, 2), 16
+    graph, loss = mlp(sizes, rows)
+    executor = Executor(graph, loss)
+    feeds = _feeds(sizes, rows)
+    executor.run(feeds)
+
+    tape = Tape()
+    a = tape.input(feeds['x'])
+    parameters = {node.name: tape.parameter(node.value) for node in executor.parameters}
+    for layer in range(1, len(sizes)):
+        a = sigmoid(a @ parameters[f'W{layer}'] + parameters[f'b{layer}'])
+    tape_loss = mean(square(a - tape.input(feeds['y'])))
+    tape.backward(tape_loss)
+
+    assert np.isclose(tape_loss.item(), executor.output.item())
+    for node in executor.parameters:
+        np.testing.assert_allclose(node.grad, parameters[node.name].grad, rtol=1e-12)
+
+
+def test_buffer_reuse_and_repeated_runs():
+    sizes, rows = (4, 16, 16, 16, 1), 32
+    graph, loss = mlp(sizes, rows)
+    executor = Executor(graph, loss)
+    assert executor.peak_bytes < executor.unshared_bytes
+    feeds = _feeds(sizes, rows)
+    first = executor.run(feeds).item()
+    grads = [parameter.grad.copy() for parameter in executor.parameters]
+    assert executor.run(feeds).item() == first
+    for parameter, grad in zip(executor.parameters, grads):
+        np.testing.assert_array_equal(parameter.grad, grad)
+
+
+def test_costs_are_static():
+    graph, loss = mlp((3, 5, 1), 10)
+    executor = Executor(graph, loss)
+    costs = executor.costs()
+    assert costs == executor.costs()
+    assert all(stat.forward == stat.backward == 0.0 for stat in costs)
+    # x (10, 3) @ W1 (3, 5): 2mkn forward; x needs no gradient, W1 does
+    first = costs[0]
+    assert first.node.op == 'matmul'
+    assert first.forward_flops == 2 * 10 * 3 * 5
+    assert first.backward_flops == 2 * 10 * 3 * 5 + 3 * 5
+    profiled = executor.profile(_feeds((3, 5, 1), 10), repeat=2)
+    assert [stat.forward_flops for stat in profiled] == [stat.forward_flops for stat in costs]
@@ -0,0 +1,79 @@
+"""
+Cached mathtext layouts draw exactly like fresh ones.
+"""
+
+import io
+
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib import mathtext
+
+from chartbuild.mathcache import MathtextCache
+
+LABEL = r'$\sigma(z) = \frac{1}{1+e^{-z}}$'
+
+
+def _render():
+    """PDF and PNG bytes of a figure with mathtext labels."""
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.set_title(LABEL)
+    ax.set_xlabel(r'$\nabla_w L$')
+    outputs = []
+    for fmt in ('pdf', 'png'):
+        buffer = io.BytesIO()
+        metadata = {'CreationDate': None} if fmt == 'pdf' else {}
+        fig.savefig(buffer, format=fmt, dpi=60, metadata=metadata)
+        outputs.append(buffer.getvalue())
+    plt.close(fig)
+    return outputs
+
+
+@pytest.fixture
+def installed(tmp_path):
+    caches = []
+
+    def install():
+        cache = MathtextCache(tmp_path)
+        cache.load()
+        assert cache.install()
+        caches.append(cache)
+        return cache
+
+    yield install
+    for cache in reversed(caches):
+        cache.uninstall()
+
+
+def test_cached_layouts_match_fresh_ones(installed):
+    fresh = _render()
+    writer = installed()
+    assert _render() == fresh
+    assert writer.stats.misses and not writer.stats.hits
+    assert writer.flush() == writer.stats.misses
+    assert writer.compact() == writer.stats.misses
+    writer.uninstall()
+
+    reader = installed()
+    assert _render() == fresh
+    assert reader.stats.hits and not reader.stats.misses
+
+
+def test_pending_layouts_are_shared_before_compaction(installed):
+    writer = installed()
+    _render()
+    writer.flush()
+    writer.uninstall()
+
+    reader = installed()
+    _render()
+    assert not reader.stats.misses
+
+
+def test_missing_parser_hook_leaves_matplotlib_alone(tmp_path, monkeypatch):
+    monkeypatch.delattr(mathtext, 'RasterParse')
+    parse = mathtext.MathTextParser._parse_cached
+    cache = MathtextCache(tmp_path)
+    assert not cache.install()
+    assert mathtext.MathTextParser._parse_cached is parse
+    _render()
+    assert not cache.stats.hits and not cache.stats.misses
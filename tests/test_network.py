@@ -0,0 +1,62 @@
+"""
+Network diagrams use a fixed number of artists whatever the network size.
+"""
+
+import time
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from chartlib.network import draw_network
+
+
+def _axes():
+    fig, ax = plt.subplots()
+    ax.set_xlim(-1, 4)
+    ax.set_ylim(0, 10)
+    return fig, ax
+
+
+def test_one_collection_per_kind():
+    fig, ax = _axes()
+    before = len(ax.collections)
+    artists = draw_network(ax, [3, 4, 2], x=[0, 1.5, 3])
+    assert len(ax.collections) - before == 2
+    assert len(artists.nodes.get_offsets()) == 9
+    assert len(artists.edges.get_segments()) == 3 * 4 + 4 * 2
+    plt.close(fig)
+
+
+def test_segments_run_between_neuron_edges():
+    fig, ax = _axes()
+    artists = draw_network(ax, [2, 3], x=[0, 2], radius=0.25)
+    segments = artists.segments[0]
+    assert segments.shape == (2, 3, 2, 2)
+    np.testing.assert_allclose(segments[..., 0, 0], 0.25)
+    np.testing.assert_allclose(segments[..., 1, 0], 1.75)
+    np.testing.assert_allclose(segments[1, 2, 0, 1], artists.positions[0][1, 1])
+    np.testing.assert_allclose(segments[1, 2, 1, 1], artists.positions[1][2, 1])
+    plt.close(fig)
+
+
+def test_dropout_masks_split_edges():
+    fig, ax = _axes()
+    masks = [None, np.array([True, False, True]), None]
+    artists = draw_network(ax, [2, 3, 1], x=[0, 1.5, 3], masks=masks)
+    assert len(artists.edges.get_segments()) == 2 * 2 + 2 * 1
+    assert len(artists.dropped_edges.get_segments()) == 2 + 1
+    assert len(artists.dropped_markers.get_offsets()) == 1
+    plt.close(fig)
+
+
+def test_large_network_is_aggregated():
+    fig, ax = _axes()
+    sizes = [784, 256, 128, 10]
+    y = [np.linspace(0.5, 9.5, size) for size in sizes]
+    start = time.perf_counter()
+    artists = draw_network(ax, sizes, x=[0, 1, 2, 3], y=y, radius=0.01)
+    fig.canvas.draw()
+    assert time.perf_counter() - start < 5
+    assert len(artists.images) == 2  # 784x256 and 256x128; 128x10 stays vector
+    assert len(artists.edges.get_segments()) == 128 * 10
+    plt.close(fig)
@@ -0,0 +1,72 @@
+"""
+Vectorised trajectories against one-point-at-a-time scalar loops.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from chartlib.optimizers import METHODS, _loop, optimize, quadratic, sweep
+
+SCALES = (1.0, 10.0)
+
+
+def scalar_path(method, start, steps, eta, beta, beta2, eps=1e-8):
+    """One trajectory stepped coordinate by coordinate in plain Python."""
+    w = list(start)
+    v, s = [0.0] * len(w), [0.0] * len(w)
+    path = [tuple(w)]
+    for t in range(1, steps + 1):
+        for i, scale in enumerate(SCALES):
+            if method == 'nesterov':
+                g = scale * (w[i] + beta * v[i])
+            else:
+                g = scale * w[i]
+            if method == 'sgd':
+                w[i] -= eta * g
+            elif method in ('momentum', 'nesterov'):
+                v[i] = beta * v[i] - eta * g
+                w[i] += v[i]
+            elif method == 'rmsprop':
+                s[i] = beta2 * s[i] + (1 - beta2) * g * g
+                w[i] -= eta * g / (math.sqrt(s[i]) + eps)
+            else:
+                v[i] = beta * v[i] + (1 - beta) * g
+                s[i] = beta2 * s[i] + (1 - beta2) * g * g
+                m_hat, s_hat = v[i] / (1 - beta ** t), s[i] / (1 - beta2 ** t)
+                w[i] -= eta * m_hat / (math.sqrt(s_hat) + eps)
+        path.append(tuple(w))
+    return np.array(path)
+
+
+@pytest.mark.parametrize('method', METHODS)
+def test_matches_scalar_loop(method):
+    rng = np.random.default_rng(0)
+    count, steps = 7, 25
+    starts = rng.uniform(-3, 3, (count, 2))
+    rates = rng.uniform(0.01, 0.09, count)
+    momenta = rng.uniform(0.5, 0.95, count)
+    history = optimize(quadratic(SCALES), starts, steps, method, rates, momenta, beta2=0.99)
+    assert history.shape == (steps + 1, count, 2)
+    for k in range(count):
+        expected = scalar_path(method, starts[k], steps, rates[k], momenta[k], 0.99)
+        np.testing.assert_allclose(history[:, k], expected, rtol=1e-10, atol=1e-12)
+
+
+def test_momentum_matches_chart_loop():
+    history = optimize(quadratic(SCALES), [-2.5, 1.2], 40, 'momentum', [0.15], 0.9)
+    path_x, path_y = _loop(SCALES, (-2.5, 1.2), 40, 0.15, 0.9)
+    np.testing.assert_allclose(history[:, 0], np.column_stack([path_x, path_y]), rtol=1e-12)
+
+
+def test_sweep_and_out():
+    starts, rates = sweep([[2.5, 2.0], [-1.0, 1.0]], learning_rate=[0.05, 0.1, 0.2])
+    assert starts.shape == (6, 2)
+    np.testing.assert_array_equal(rates['learning_rate'], [0.05, 0.1, 0.2] * 2)
+    out = np.empty((11, 6, 2))
+    assert optimize(quadratic(SCALES), starts, 10, out=out, **rates) is out
+    with pytest.raises(ValueError):
+        optimize(quadratic(SCALES), starts, 10, out=np.empty((10, 6, 2)))
+    with pytest.raises(ValueError, match='Unknown method'):
+        optimize(quadratic(SCALES), starts, 10, 'lbfgs')
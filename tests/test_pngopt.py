@@ -0,0 +1,67 @@
+"""
+PNG optimisation keeps the pixels; size budgets count static outputs only.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+from chartbuild.discovery import Chart
+from chartbuild.pngopt import optimise_png, over_budget
+from chartbuild.runner import _check_budget
+from chartbuild.settings import RenderSettings
+from chartbuild.worker import ChartResult
+
+
+def _pixels(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGBA')), image.info.get('dpi')
+
+
+def test_chart_png_is_smaller_and_identical(tmp_path):
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.plot(np.sin(np.linspace(0, 6, 100)))
+    ax.set_title('chart')
+    path = tmp_path / 'chart.png'
+    fig.savefig(path, dpi=100)
+    plt.close(fig)
+    pixels, dpi = _pixels(path)
+    before, after = optimise_png(path)
+    assert after < before
+    assert path.stat().st_size == after
+    optimised, optimised_dpi = _pixels(path)
+    np.testing.assert_array_equal(optimised, pixels)
+    assert optimised_dpi == dpi
+
+
+def test_flat_image_becomes_palette(tmp_path):
+    rgba = np.full((40, 60, 4), 255, np.uint8)
+    rgba[10:20, 5:50, :3] = [200, 30, 30]
+    rgba[25:35, :, :3] = [0, 0, 0]
+    path = tmp_path / 'flat.png'
+    Image.fromarray(rgba).save(path)
+    optimise_png(path)
+    with Image.open(path) as image:
+        assert image.mode == 'P'
+    np.testing.assert_array_equal(_pixels(path)[0], rgba)
+
+
+def test_budget_counts_pdf_and_png_only(tmp_path):
+    for name, size in [('chart.pdf', 600), ('chart.png', 500), ('chart.gif', 5000)]:
+        (tmp_path / name).write_bytes(b'x' * size)
+    names = ['chart.pdf', 'chart.png', 'chart.gif', 'missing.png']
+    assert over_budget(tmp_path, names, 1000) == 1100
+    assert over_budget(tmp_path, names, 2000) is None
+    assert over_budget(tmp_path, names, 0) is None
+
+
+def test_build_fails_charts_over_budget(tmp_path):
+    (tmp_path / 'big.png').write_bytes(b'x' * 3000)
+    (tmp_path / 'small.png').write_bytes(b'x' * 300)
+    charts = [Chart(name, tmp_path, tmp_path / f'{name}.py') for name in ('big', 'small')]
+    results = [ChartResult(name, True, 0.1, outputs=[f'{name}.png']) for name in ('big', 'small')]
+    lines = []
+    _check_budget(charts, results, RenderSettings(size_budget=1000), lines.append)
+    assert [result.ok for result in results] == [False, True]
+    assert 'size budget' in results[0].error
+    assert lines == [f'  OVER big: {results[0].error}']
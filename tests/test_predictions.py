@@ -0,0 +1,49 @@
+"""
+Prediction charts aggregate long series and keep the metrics panel tidy.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from chartlib.predictions import aggregate, prediction_panel, prediction_results
+
+
+def _series(days, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = 100 + np.cumsum(rng.normal(size=days))
+    actual = rng.integers(0, 2, days)
+    return prices, actual, rng.integers(0, 2, days), np.where(rng.random(days) < 0.7,
+                                                              actual, 1 - actual)
+
+
+def test_aggregate_keeps_short_last_bin():
+    np.testing.assert_array_equal(aggregate(np.arange(7), 3), [3, 12, 6])
+
+
+def test_long_series_is_binned_with_same_accuracy():
+    _, actual, before, _ = _series(2520)
+    fig, ax = plt.subplots()
+    accuracy = prediction_panel(ax, before, actual, budget=100)
+    up, down = ax.containers
+    assert len(up) == len(down) <= 100
+    assert accuracy == np.mean(before == actual)
+    plt.close(fig)
+
+
+def test_metrics_panel_labels_stay_inside_axes():
+    for days in (30, 2520):
+        fig = plt.figure(figsize=(14, 10))
+        prediction_results(fig, *_series(days))
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+        ax = fig.axes[-1] if days <= 100 else fig.axes[-2]
+        frame = ax.get_window_extent(renderer)
+        label = next(text for text in ax.texts if 'Improvement' in text.get_text())
+        box = label.get_bbox_patch().get_window_extent(renderer)
+        assert frame.y0 <= box.y0 and box.y1 <= frame.y1
+        legend = ax.get_legend().get_window_extent(renderer)
+        for axes in {ax, fig.axes[-1]}:
+            for text in axes.texts:
+                if text is not label:
+                    assert not legend.overlaps(text.get_window_extent(renderer))
+        plt.close(fig)
@@ -0,0 +1,37 @@
+"""
+Binned scatters behave like scatters on the axes.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from chartlib.scatter import class_scatter, histogram
+
+
+def test_density_image_extends_limits():
+    rng = np.random.default_rng(0)
+    fig, ax = plt.subplots()
+    x, y = rng.normal(50, 1, 100_000), rng.normal(-20, 1, 100_000)
+    image = class_scatter(ax, x, y, 'C0', label='points')
+    assert image.get_array().ndim == 3
+    x0, x1 = ax.get_xlim()
+    y0, y1 = ax.get_ylim()
+    assert x0 <= x.min() and x1 >= x.max()
+    assert y0 <= y.min() and y1 >= y.max()
+    plt.close(fig)
+
+
+def test_histogram_matches_numpy():
+    rng = np.random.default_rng(1)
+    x, y = rng.uniform(0, 1, 5000), rng.uniform(0, 2, 5000)
+    counts = histogram([(x[:2000], y[:2000]), (x[2000:], y[2000:])], (0, 1, 0, 2), (8, 5))
+    expected, _, _ = np.histogram2d(x, y, bins=(8, 5), range=((0, 1), (0, 2)))
+    np.testing.assert_array_equal(counts, expected.T)
+
+
+def test_explicit_alpha_is_kept():
+    rng = np.random.default_rng(2)
+    fig, ax = plt.subplots()
+    image = class_scatter(ax, rng.normal(size=50_000), rng.normal(size=50_000), 'C1', alpha=0)
+    assert not image.get_array()[..., 3].any()
+    plt.close(fig)
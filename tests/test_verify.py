@@ -0,0 +1,60 @@
+"""
+Round trips through ``verify``: stable charts pass, unstable ones are reported.
+"""
+
+import shutil
+import textwrap
+
+import pytest
+
+from chartbuild.discovery import discover_charts
+from chartbuild.profiles import PREVIEW_DIR
+from chartbuild.settings import RenderSettings
+from chartbuild.verify import verify_reproducible
+
+SCRIPT = """
+    import os
+
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    CHART_METADATA = {{'title': 'Verify'}}
+
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.plot(np.random.normal(size=20), label=r'$\\sigma(z)$')
+    ax.set_title({title})
+    ax.legend()
+    plt.savefig('{name}.pdf')
+    plt.savefig('{name}.png', dpi=72)
+    plt.close()
+"""
+
+
+def _chart(root, name, title="'fixed'"):
+    directory = root / name
+    directory.mkdir()
+    (directory / 'metainfo.txt').write_text(f'Output: {name}.pdf, {name}.png\\n', encoding='utf-8')
+    (directory / f'{name}.py').write_text(textwrap.dedent(SCRIPT.format(name=name, title=title)),
+                                          encoding='utf-8')
+
+
+@pytest.fixture
+def charts(tmp_path):
+    # verify_stable_chart is seeded by the reproducible hooks; the other one is not.
+    _chart(tmp_path, 'verify_stable_chart')
+    _chart(tmp_path, 'verify_unstable_chart', title='os.urandom(8).hex()')
+    yield {chart.name: chart for chart in discover_charts(tmp_path)}
+    for name in ('verify_stable_chart', 'verify_unstable_chart'):
+        shutil.rmtree(PREVIEW_DIR / name, ignore_errors=True)
+
+
+@pytest.mark.parametrize('profile', ['final', 'draft'])
+def test_round_trip(charts, profile):
+    lines = []
+    unstable = verify_reproducible(list(charts.values()), RenderSettings(profile=profile),
+                                   report=lines.append)
+    assert unstable == ['verify_unstable_chart']
+    assert lines[-1] == '1/2 charts render byte-identically'
+    if profile == 'draft':
+        assert (PREVIEW_DIR / 'verify_stable_chart' / 'verify_stable_chart.png').exists()
+        assert not (charts['verify_stable_chart'].directory / 'verify_stable_chart.png').exists()
@@ -6,6 +6,11 @@ Module 3: Training Neural Networks
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    from chartbuild.profiles import sample_count
+except ImportError:  # run standalone: final profile
+    sample_count = lambda value: value
+
 CHART_METADATA = {
     'title': 'Weight Initialization Effects',
     'url': 'https://github.com/QuantLet/neural-networks-introduction/tree/main/weight_initialization_effects'
@@ -28,7 +33,7 @@ ax = axes[0]
 
 # Simulate activations through layers with small init
 n_layers = 10
-n_neurons = 500
+n_neurons = sample_count(500)
 
 activations = np.random.randn(n_neurons)
 variance_history = [np.var(activations)]
@@ -3,9 +3,14 @@ XOR Solution with MLP - How Hidden Layers Solve Non-Linear Problems
 Module 2: Multi-Layer Perceptrons
 """
 
+import sys
+from pathlib import Path
+
 import matplotlib.pyplot as plt
 import numpy as np
-from matplotlib.patches import Circle, FancyBboxPatch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repository root
+from chartlib.network import draw_network
 
 CHART_METADATA = {
     'title': 'XOR Solution MLP',
@@ -88,37 +93,21 @@ ax.set_xlim(0, 10)
 ax.set_ylim(0, 8)
 ax.axis('off')
 
-# Input layer
+# Neurons and connections
 input_y = [6, 2]
-for i, y in enumerate(input_y):
-    circle = Circle((1.5, y), 0.5, fill=True, facecolor='#E6E6FA', edgecolor=mlblue, linewidth=2)
-    ax.add_patch(circle)
-    ax.text(1.5, y, f'$x_{i+1}$', ha='center', va='center', fontsize=11)
-
-# Hidden layer
 hidden_y = [6, 2]
 hidden_labels = ['OR', 'AND']
-for i, (y, label) in enumerate(zip(hidden_y, hidden_labels)):
-    circle = Circle((5, y), 0.5, fill=True, facecolor='#FFE4B5', edgecolor=mlorange, linewidth=2)
-    ax.add_patch(circle)
-    ax.text(5, y, label, ha='center', va='center', fontsize=9, fontweight='bold')
+draw_network(ax, [2, 2, 1], [1.5, 5, 8.5], [input_y, hidden_y, [4]], radius=0.5,
+             node_facecolor=['#E6E6FA', '#FFE4B5', '#E6FFE6'],
+             node_edgecolor=[mlblue, mlorange, mlgreen], node_linewidth=2,
+             edge_color=mlgray, edge_linewidth=1, edge_alpha=1, arrows=True)
 
-# Output layer
-circle = Circle((8.5, 4), 0.5, fill=True, facecolor='#E6FFE6', edgecolor=mlgreen, linewidth=2)
-ax.add_patch(circle)
+for i, y in enumerate(input_y):
+    ax.text(1.5, y, f'$x_{i+1}$', ha='center', va='center', fontsize=11)
+for y, label in zip(hidden_y, hidden_labels):
+    ax.text(5, y, label, ha='center', va='center', fontsize=9, fontweight='bold')
 ax.text(8.5, 4, 'XOR', ha='center', va='center', fontsize=9, fontweight='bold')
 
-# Connections input to hidden
-for iy in input_y:
-    for hy in hidden_y:
-        ax.annotate('', xy=(4.5, hy), xytext=(2, iy),
-                    arrowprops=dict(arrowstyle='->', color=mlgray, lw=1))
-
-# Connections hidden to output
-for hy in hidden_y:
-    ax.annotate('', xy=(8, 4), xytext=(5.5, hy),
-                arrowprops=dict(arrowstyle='->', color=mlgray, lw=1))
-
 # Labels
 ax.text(1.5, 7.5, 'Input', ha='center', fontsize=10, fontweight='bold', color=mlblue)
 ax.text(5, 7.5, 'Hidden', ha='center', fontsize=10, fontweight='bold', color=mlorange)